@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CatalogosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.catalogos'
-    verbose_name = 'Catálogos Maestros'
\ No newline at end of file
+    verbose_name = 'Catálogos Maestros'
+
+    def ready(self):
+        """Conecta la invalidación de las tablas mínimas de ``referencias``."""
+        import backend.catalogos.referencias  # noqa: F401
@@ -0,0 +1,140 @@
+"""Autocompletado por prefijo para los selectores de catálogos.
+
+``GET <catálogo>/autocomplete/?q=gran&limit=10`` responde con filas de la
+proyección mínima (``id``, ``codigo``, ``nombre``) sin tocar la base: cada
+proceso arma en memoria un índice ordenado de términos normalizados (sin
+acentos ni mayúsculas) y lo recorre con búsqueda binaria.
+
+El índice se arma con la tabla mínima de ``referencias`` la primera vez que
+se consulta y se reconstruye cuando cambia su versión (las señales del
+catálogo y la importación la invalidan). La versión se revisa como mucho
+cada ``AUTOCOMPLETE_CHECK_SECONDS`` para no consultar la caché en cada
+tecla.
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from backend.core.busqueda import normalizar
+
+from .referencias import tabla_minima, version_tabla
+
+_PALABRA = re.compile(r"\w+")
+
+
+def _rango(terminos, prefijo):
+    """Intervalo de ``terminos`` (ordenados) que empiezan con ``prefijo``."""
+
+    return bisect_left(terminos, (prefijo,)), bisect_left(terminos, (prefijo + "\U0010ffff",))
+
+
+def _cantidad(terminos, prefijo):
+    inicio, fin = _rango(terminos, prefijo)
+    return fin - inicio
+
+
+def _con_prefijo(terminos, prefijo):
+    """Posiciones de ``terminos`` (ordenados) que empiezan con ``prefijo``, en orden."""
+
+    inicio, fin = _rango(terminos, prefijo)
+    for indice in range(inicio, fin):
+        yield terminos[indice][1]
+
+
+class IndicePrefijos:
+    """Índice de una tabla mínima: códigos completos y palabras de todos sus textos."""
+
+    def __init__(self, filas, version):
+        self.filas = filas
+        self.version = version
+        self.verificado = time.monotonic()
+        codigos, palabras = [], []
+        self._palabras_por_fila = []
+        for posicion, fila in enumerate(filas):
+            codigos.append((normalizar(fila["codigo"]), posicion))
+            texto = normalizar(" ".join(str(valor) for clave, valor in fila.items() if clave != "id" and valor))
+            propias = set(_PALABRA.findall(texto))
+            palabras.extend((palabra, posicion) for palabra in propias)
+            self._palabras_por_fila.append(propias)
+        self._codigos = sorted(codigos)
+        self._palabras = sorted(palabras)
+
+    def _coincide(self, posicion, prefijos):
+        return all(
+            any(palabra.startswith(prefijo) for palabra in self._palabras_por_fila[posicion]) for prefijo in prefijos
+        )
+
+    def buscar(self, texto, limite):
+        """Hasta ``limite`` filas: primero por prefijo del código, luego por palabras.
+
+        Con varias palabras (``"gran 500"``) cada una debe ser prefijo de
+        alguna palabra de la fila.
+        """
+
+        consulta = normalizar(texto).strip()
+        prefijos = _PALABRA.findall(consulta)
+        if not prefijos:
+            return []
+        vistas, resultado = set(), []
+        # Los candidatos salen de la palabra con menos coincidencias.
+        principal = min(prefijos, key=lambda prefijo: _cantidad(self._palabras, prefijo))
+        for origen in (_con_prefijo(self._codigos, consulta), _con_prefijo(self._palabras, principal)):
+            for posicion in origen:
+                if posicion in vistas or not self._coincide(posicion, prefijos):
+                    continue
+                vistas.add(posicion)
+                resultado.append(self.filas[posicion])
+                if len(resultado) >= limite:
+                    return resultado
+        return resultado
+
+
+_indices = {}
+_candado = threading.Lock()
+
+
+def indice(modelo, campos):
+    """Índice vigente de la tabla mínima ``campos`` de ``modelo`` en este proceso."""
+
+    clave = (modelo._meta.label_lower, tuple(campos.items()))
+    actual = _indices.get(clave)
+    ahora = time.monotonic()
+    if actual is not None and ahora - actual.verificado < settings.AUTOCOMPLETE_CHECK_SECONDS:
+        return actual
+    version = version_tabla(modelo)
+    if actual is not None and actual.version == version:
+        actual.verificado = ahora
+        return actual
+    with _candado:
+        actual = _indices.get(clave)
+        if actual is None or actual.version != version:
+            actual = IndicePrefijos(tabla_minima(modelo, campos), version)
+            _indices[clave] = actual
+    return actual
+
+
+class AutocompletadoMixin:
+    """Agrega ``autocomplete/`` a un catálogo con ``ReferenciasMixin``."""
+
+    def _limite(self):
+        crudo = self.request.query_params.get("limit")
+        if crudo in (None, ""):
+            return settings.AUTOCOMPLETE_LIMIT
+        try:
+            limite = int(crudo)
+        except ValueError as exc:
+            raise ValidationError({"limit": "Debe ser un número entero"}) from exc
+        return max(1, min(limite, settings.AUTOCOMPLETE_MAX_LIMIT))
+
+    @action(detail=False, methods=["get"], url_path="autocomplete")
+    def autocomplete(self, request, *args, **kwargs):
+        limite = self._limite()
+        filas = indice(self.queryset.model, self.campos_minimos).buscar(request.query_params.get("q", ""), limite)
+        return Response(filas)
@@ -0,0 +1,544 @@
+"""Importación masiva de catálogos maestros con semántica de upsert.
+
+Lee CSV, JSON (arreglo de objetos) o JSON Lines sin cargar el archivo
+completo. Procesa las filas por lotes: convierte y valida cada fila con los
+campos del modelo, resuelve las referencias por ``codigo`` con mapas en
+memoria (una consulta por modelo referenciado), compara contra lo existente
+y escribe solo las filas nuevas o modificadas con
+``bulk_create(update_conflicts=True)``.
+
+Todo corre en una transacción: con errores de validación o en modo
+``dry_run`` se revierte y el informe de diferencias es lo único que queda.
+
+Columnas: los nombres de campo del modelo. Una FK se indica con el código
+del registro referenciado (``ubicacion``, ``producto``, ``formula``...) y
+una M2M con códigos separados por ``|`` (o una lista en JSON).
+"""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, models, transaction
+
+from backend.core.cache_respuestas import invalidar_respuestas
+
+from .models import (
+    EtapaProduccion,
+    Formula,
+    FormulaEtapa,
+    FormulaIngrediente,
+    Maquina,
+    Parametro,
+    Producto,
+    Ubicacion,
+)
+from .referencias import invalidar_tabla
+
+TAMANO_LOTE = 1000
+SEPARADOR_LISTA = "|"
+MAX_ERRORES = 200
+MAX_CAMBIOS_INFORME = 100
+VERDADEROS = {"1", "true", "t", "si", "sí", "s", "yes", "y", "x"}
+FALSOS = {"0", "false", "f", "no", "n"}
+
+
+@dataclass(frozen=True)
+class Entidad:
+    """Cómo se importa un modelo: clave de upsert, campos y referencias.
+
+    ``referencias`` y ``multiples`` mapean el nombre del campo (FK o M2M) al
+    modelo cuyo ``codigo`` se indica en el archivo.
+    """
+
+    nombre: str
+    modelo: type
+    clave: Tuple[str, ...]
+    campos: Tuple[str, ...]
+    referencias: dict = field(default_factory=dict)
+    multiples: dict = field(default_factory=dict)
+
+    def columnas(self):
+        return set(self.clave) | set(self.campos) | set(self.referencias) | set(self.multiples)
+
+
+# En orden de dependencias: al importar varios archivos juntos, cada entidad
+# ya encuentra los códigos que referencia.
+ENTIDADES = {
+    entidad.nombre: entidad
+    for entidad in (
+        Entidad("ubicaciones", Ubicacion, ("codigo",), ("nombre", "descripcion", "activa")),
+        Entidad("parametros", Parametro, ("codigo",), ("nombre", "descripcion", "unidad", "activo")),
+        Entidad(
+            "productos",
+            Producto,
+            ("codigo",),
+            ("nombre", "tipo", "presentacion", "concentracion", "descripcion", "activo"),
+        ),
+        Entidad(
+            "maquinas",
+            Maquina,
+            ("codigo",),
+            (
+                "nombre",
+                "tipo",
+                "fabricante",
+                "modelo",
+                "numero_serie",
+                "año_fabricacion",
+                "descripcion",
+                "capacidad_nominal",
+                "unidad_capacidad",
+                "activa",
+                "fecha_instalacion",
+            ),
+            referencias={"ubicacion": Ubicacion},
+        ),
+        Entidad(
+            "etapas",
+            EtapaProduccion,
+            ("codigo",),
+            ("nombre", "descripcion", "activa"),
+            multiples={"maquinas_permitidas": Maquina, "parametros": Parametro},
+        ),
+        Entidad(
+            "formulas",
+            Formula,
+            ("codigo",),
+            ("version", "descripcion", "activa"),
+            referencias={"producto": Producto},
+        ),
+        Entidad(
+            "formula_etapas",
+            FormulaEtapa,
+            ("formula", "orden"),
+            ("descripcion", "duracion_estimada_min"),
+            referencias={"formula": Formula, "etapa": EtapaProduccion},
+        ),
+        Entidad(
+            "formula_ingredientes",
+            FormulaIngrediente,
+            ("formula", "orden", "material"),
+            ("cantidad", "unidad", "notas"),
+            referencias={"formula": Formula, "material": Producto},
+        ),
+    )
+}
+
+
+class ErrorImportacion(Exception):
+    """El archivo no puede procesarse (formato o encabezados inválidos)."""
+
+
+# --- Lectura en streaming -------------------------------------------------
+
+
+def _filas_csv(texto):
+    lector = csv.DictReader(texto)
+    for fila in lector:
+        yield lector.line_num, {
+            (clave or "").strip(): (valor.strip() if isinstance(valor, str) else valor)
+            for clave, valor in fila.items()
+        }
+
+
+def _filas_json(texto, tamano_bloque=64 * 1024):
+    """Objetos de un arreglo JSON o de JSON Lines, leídos por bloques."""
+
+    decodificador = json.JSONDecoder()
+    bufer = ""
+    posicion = 0
+    numero = 0
+    fin_de_archivo = False
+    while True:
+        # Separadores entre objetos: espacios, comas y los corchetes del arreglo.
+        while posicion < len(bufer) and bufer[posicion] in " \t\r\n,[]":
+            posicion += 1
+        if posicion >= len(bufer):
+            if fin_de_archivo:
+                return
+            bufer = texto.read(tamano_bloque)
+            posicion = 0
+            fin_de_archivo = not bufer
+            continue
+        if bufer[posicion] != "{":
+            raise ErrorImportacion(f"Se esperaba un objeto JSON en la posición {numero + 1}")
+        try:
+            objeto, fin = decodificador.raw_decode(bufer, posicion)
+        except json.JSONDecodeError as exc:
+            if fin_de_archivo:
+                raise ErrorImportacion(f"JSON inválido en el objeto {numero + 1}: {exc.msg}") from exc
+            # Objeto partido entre bloques: se suma el siguiente y se reintenta.
+            siguiente = texto.read(tamano_bloque)
+            fin_de_archivo = not siguiente
+            bufer = bufer[posicion:] + siguiente
+            posicion = 0
+            continue
+        numero += 1
+        posicion = fin
+        yield numero, objeto
+
+
+def leer_filas(texto, formato):
+    """Itera ``(número de fila, dict)`` de un archivo de texto abierto."""
+
+    if formato == "csv":
+        return _filas_csv(texto)
+    if formato in ("json", "jsonl"):
+        return _filas_json(texto)
+    raise ErrorImportacion(f"Formato no soportado: {formato}")
+
+
+# --- Conversión y validación ----------------------------------------------
+
+
+def _convertir(campo, valor):
+    if isinstance(valor, str):
+        valor = valor.strip()
+    if isinstance(campo, models.BooleanField):
+        if valor in ("", None) and campo.has_default():
+            return campo.get_default()
+        if isinstance(valor, str):
+            texto = valor.lower()
+            if texto in VERDADEROS:
+                return True
+            if texto in FALSOS:
+                return False
+            raise ValidationError(f"'{valor}' no es un valor booleano")
+        return bool(valor)
+    if valor in ("", None):
+        if campo.null:
+            return None
+        if isinstance(campo, (models.CharField, models.TextField)):
+            return ""
+        if campo.has_default():
+            return campo.get_default()
+    return campo.to_python(valor)
+
+
+def _codigos(valor):
+    if isinstance(valor, (list, tuple)):
+        return [str(codigo).strip() for codigo in valor if str(codigo).strip()]
+    return [codigo.strip() for codigo in str(valor or "").split(SEPARADOR_LISTA) if codigo.strip()]
+
+
+def _formatear(valor):
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, (set, frozenset)):
+        return sorted(valor)
+    return str(valor)
+
+
+@dataclass
+class Informe:
+    entidad: str
+    filas: int = 0
+    creadas: int = 0
+    actualizadas: int = 0
+    sin_cambios: int = 0
+    errores: list = field(default_factory=list)
+    errores_omitidos: int = 0
+    cambios: list = field(default_factory=list)
+
+    def error(self, numero, detalle):
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"fila": numero, "error": detalle})
+        else:
+            self.errores_omitidos += 1
+
+    def como_dict(self):
+        datos = {
+            "entidad": self.entidad,
+            "filas": self.filas,
+            "creadas": self.creadas,
+            "actualizadas": self.actualizadas,
+            "sin_cambios": self.sin_cambios,
+            "errores": self.errores,
+            "cambios": self.cambios,
+        }
+        if self.errores_omitidos:
+            datos["errores_omitidos"] = self.errores_omitidos
+        return datos
+
+
+class Importador:
+    """Upsert de una o más entidades dentro de una misma transacción."""
+
+    def __init__(self, lote=TAMANO_LOTE):
+        self.lote = lote
+        self._mapas = {}
+        self._inversos = {}
+
+    def _mapa(self, modelo):
+        """``{codigo: id}`` de ``modelo``, cargado una sola vez."""
+
+        if modelo not in self._mapas:
+            self._mapas[modelo] = dict(modelo.objects.order_by().values_list("codigo", "id"))
+        return self._mapas[modelo]
+
+    def _codigo(self, modelo, pk):
+        if modelo not in self._inversos:
+            self._inversos[modelo] = {valor: codigo for codigo, valor in self._mapa(modelo).items()}
+        return self._inversos[modelo].get(pk, pk)
+
+    def _legible(self, entidad, nombre, valor):
+        """Valor para el informe: las referencias se muestran por código."""
+
+        campo = entidad.modelo._meta.get_field(nombre)
+        if campo.name in entidad.multiples:
+            return sorted(self._codigo(entidad.multiples[campo.name], pk) for pk in valor)
+        if campo.name in entidad.referencias and valor is not None:
+            return self._codigo(entidad.referencias[campo.name], valor)
+        return _formatear(valor)
+
+    # Cada fila queda como ``(numero, clave, valores, multiples)``; ``valores``
+    # usa ``attname`` (``ubicacion_id``) para no instanciar las FKs.
+    def _preparar(self, entidad, columnas, numero, fila, informe):
+        opciones = entidad.modelo._meta
+        valores = {}
+        multiples = {}
+        errores = {}
+        for nombre in columnas:
+            valor = fila.get(nombre)
+            if nombre in entidad.referencias:
+                codigo = str(valor or "").strip()
+                if not codigo:
+                    campo = opciones.get_field(nombre)
+                    if campo.null:
+                        valores[campo.attname] = None
+                    else:
+                        errores[nombre] = "Es obligatorio"
+                    continue
+                referencia = self._mapa(entidad.referencias[nombre]).get(codigo)
+                if referencia is None:
+                    errores[nombre] = f"No existe {entidad.referencias[nombre]._meta.verbose_name} con código '{codigo}'"
+                    continue
+                valores[opciones.get_field(nombre).attname] = referencia
+            elif nombre in entidad.multiples:
+                mapa = self._mapa(entidad.multiples[nombre])
+                codigos = _codigos(valor)
+                faltantes = [codigo for codigo in codigos if codigo not in mapa]
+                if faltantes:
+                    errores[nombre] = f"Códigos inexistentes: {', '.join(faltantes[:10])}"
+                    continue
+                multiples[nombre] = frozenset(mapa[codigo] for codigo in codigos)
+            else:
+                try:
+                    valores[nombre] = _convertir(opciones.get_field(nombre), valor)
+                except ValidationError as exc:
+                    errores[nombre] = "; ".join(exc.messages)
+
+        # Solo se validan los campos presentes que ya pudieron convertirse.
+        excluidos = [
+            campo.name
+            for campo in opciones.concrete_fields
+            if campo.attname not in valores or campo.is_relation
+        ]
+        try:
+            entidad.modelo(**valores).clean_fields(exclude=excluidos)
+        except ValidationError as exc:
+            errores.update({nombre: "; ".join(mensajes) for nombre, mensajes in exc.message_dict.items()})
+
+        if errores:
+            informe.error(numero, errores)
+            return None
+        clave = tuple(valores[opciones.get_field(nombre).attname] for nombre in entidad.clave)
+        return numero, clave, valores, multiples
+
+    def _existentes(self, entidad, claves, atributos):
+        opciones = entidad.modelo._meta
+        atributos_clave = [opciones.get_field(nombre).attname for nombre in entidad.clave]
+        primera = atributos_clave[0]
+        consulta = entidad.modelo.objects.order_by().filter(**{f"{primera}__in": {clave[0] for clave in claves}})
+        existentes = {}
+        for fila in consulta.values("pk", *dict.fromkeys([*atributos_clave, *atributos])):
+            clave = tuple(fila[atributo] for atributo in atributos_clave)
+            if clave in claves:
+                existentes[clave] = fila
+        return existentes
+
+    def _multiples_existentes(self, entidad, nombre, pks):
+        relacion = entidad.modelo._meta.get_field(nombre)
+        intermedia = relacion.remote_field.through
+        origen = relacion.m2m_column_name()
+        destino = relacion.m2m_reverse_name()
+        actuales = {pk: set() for pk in pks}
+        for pk, destino_id in intermedia.objects.filter(**{f"{origen}__in": pks}).values_list(origen, destino):
+            actuales[pk].add(destino_id)
+        return {pk: frozenset(ids) for pk, ids in actuales.items()}
+
+    def _procesar_lote(self, entidad, lote, atributos, informe):
+        # Una clave repetida en el lote: prevalece la última fila.
+        por_clave = {}
+        for preparada in lote:
+            por_clave[preparada[1]] = preparada
+        existentes = self._existentes(entidad, set(por_clave), atributos)
+        nombres_multiples = sorted({nombre for _, _, _, multiples in lote for nombre in multiples})
+        pks_existentes = [fila["pk"] for fila in existentes.values()]
+        multiples_actuales = {
+            nombre: self._multiples_existentes(entidad, nombre, pks_existentes) for nombre in nombres_multiples
+        }
+
+        escribir = []
+        multiples_a_escribir = []
+        for numero, clave, valores, multiples in por_clave.values():
+            previo = existentes.get(clave)
+            cambios = {}
+            if previo is not None:
+                for atributo in atributos:
+                    if previo[atributo] != valores[atributo]:
+                        nombre = entidad.modelo._meta.get_field(atributo).name
+                        cambios[nombre] = [
+                            self._legible(entidad, nombre, previo[atributo]),
+                            self._legible(entidad, nombre, valores[atributo]),
+                        ]
+                for nombre, ids in multiples.items():
+                    antes = multiples_actuales[nombre].get(previo["pk"], frozenset())
+                    if antes != ids:
+                        cambios[nombre] = [self._legible(entidad, nombre, antes), self._legible(entidad, nombre, ids)]
+                if not cambios:
+                    informe.sin_cambios += 1
+                    continue
+                informe.actualizadas += 1
+            else:
+                informe.creadas += 1
+            if len(informe.cambios) < MAX_CAMBIOS_INFORME:
+                informe.cambios.append(
+                    {
+                        "fila": numero,
+                        "clave": [self._legible(entidad, nombre, parte) for nombre, parte in zip(entidad.clave, clave)],
+                        "accion": "actualizar" if previo is not None else "crear",
+                        "cambios": cambios,
+                    }
+                )
+            escribir.append(entidad.modelo(**valores))
+            if multiples:
+                multiples_a_escribir.append((clave, multiples))
+
+        if not escribir:
+            return
+        campos_clave = list(entidad.clave)
+        actualizables = [
+            entidad.modelo._meta.get_field(atributo).name
+            for atributo in atributos
+            if entidad.modelo._meta.get_field(atributo).name not in campos_clave
+        ]
+        try:
+            with transaction.atomic():
+                if actualizables:
+                    entidad.modelo.objects.bulk_create(
+                        escribir,
+                        batch_size=self.lote,
+                        update_conflicts=True,
+                        unique_fields=campos_clave,
+                        update_fields=actualizables,
+                    )
+                else:
+                    entidad.modelo.objects.bulk_create(escribir, batch_size=self.lote, ignore_conflicts=True)
+                self._posterior(entidad, por_clave, multiples_a_escribir)
+        except DatabaseError as exc:
+            informe.error(lote[0][0], {"lote": f"{exc.__class__.__name__}: {exc}"})
+
+    def _posterior(self, entidad, por_clave, multiples_a_escribir):
+        """Actualiza el mapa de códigos y reemplaza las relaciones M2M."""
+
+        # Un mapa que todavía no se cargó se leerá completo cuando haga falta.
+        if entidad.modelo not in self._mapas and not multiples_a_escribir:
+            return
+        codigos = [clave[0] for clave in por_clave]
+        ids = dict(entidad.modelo.objects.order_by().filter(codigo__in=codigos).values_list("codigo", "id"))
+        if entidad.modelo in self._mapas:
+            self._mapas[entidad.modelo].update(ids)
+            self._inversos.pop(entidad.modelo, None)
+
+        for nombre in sorted({nombre for _, multiples in multiples_a_escribir for nombre in multiples}):
+            relacion = entidad.modelo._meta.get_field(nombre)
+            intermedia = relacion.remote_field.through
+            origen = relacion.m2m_column_name()
+            destino = relacion.m2m_reverse_name()
+            afectados = [(ids[clave[0]], multiples[nombre]) for clave, multiples in multiples_a_escribir if nombre in multiples]
+            intermedia.objects.filter(**{f"{origen}__in": [pk for pk, _ in afectados]}).delete()
+            intermedia.objects.bulk_create(
+                [intermedia(**{origen: pk, destino: destino_id}) for pk, destinos in afectados for destino_id in destinos],
+                batch_size=self.lote,
+            )
+
+    def importar(self, entidad, filas):
+        """Procesa las ``filas`` de ``entidad`` y devuelve su ``Informe``."""
+
+        informe = Informe(entidad.nombre)
+        columnas = None
+        atributos = None
+        lote = []
+        for numero, fila in filas:
+            if columnas is None:
+                columnas = [nombre for nombre in fila if nombre]
+                desconocidas = sorted(set(columnas) - entidad.columnas())
+                faltantes = [nombre for nombre in entidad.clave if nombre not in columnas]
+                if desconocidas or faltantes:
+                    raise ErrorImportacion(
+                        f"{entidad.nombre}: columnas desconocidas {desconocidas or '-'}, "
+                        f"faltan columnas clave {faltantes or '-'}. "
+                        f"Admitidas: {', '.join(sorted(entidad.columnas()))}"
+                    )
+                opciones = entidad.modelo._meta
+                atributos = [
+                    opciones.get_field(nombre).attname
+                    for nombre in columnas
+                    if nombre not in entidad.multiples
+                ]
+            informe.filas += 1
+            faltan = [nombre for nombre in columnas if nombre not in fila]
+            if faltan:
+                informe.error(numero, {nombre: "Falta la columna" for nombre in faltan})
+                continue
+            preparada = self._preparar(entidad, columnas, numero, fila, informe)
+            if preparada is not None:
+                lote.append(preparada)
+            if len(lote) >= self.lote:
+                self._procesar_lote(entidad, lote, atributos, informe)
+                lote = []
+        if lote:
+            self._procesar_lote(entidad, lote, atributos, informe)
+        return informe
+
+
+def entidad_para(nombre):
+    entidad = ENTIDADES.get(nombre)
+    if entidad is None:
+        raise ErrorImportacion(f"Entidad desconocida '{nombre}'. Opciones: {', '.join(ENTIDADES)}")
+    return entidad
+
+
+def importar(fuentes, dry_run=False, lote=TAMANO_LOTE):
+    """Importa ``fuentes`` (pares ``(nombre de entidad, filas)``) en orden de dependencias.
+
+    Devuelve ``{"dry_run", "aplicado", "entidades": [...]}``. No aplica nada
+    si hay errores o si ``dry_run`` es verdadero.
+    """
+
+    orden = list(ENTIDADES)
+    fuentes = sorted(fuentes, key=lambda fuente: orden.index(entidad_para(fuente[0]).nombre))
+    importador = Importador(lote=lote)
+    informes = []
+    with transaction.atomic():
+        for nombre, filas in fuentes:
+            informes.append(importador.importar(entidad_para(nombre), filas))
+        con_errores = any(informe.errores for informe in informes)
+        if dry_run or con_errores:
+            transaction.set_rollback(True)
+        else:
+            # ``bulk_create`` no emite señales: las tablas mínimas y las
+            # respuestas cacheadas se invalidan aquí.
+            for nombre, _ in fuentes:
+                transaction.on_commit(partial(invalidar_tabla, entidad_para(nombre).modelo))
+                transaction.on_commit(partial(invalidar_respuestas, entidad_para(nombre).modelo))
+    return {
+        "dry_run": dry_run,
+        "aplicado": not dry_run and not con_errores,
+        "entidades": [informe.como_dict() for informe in informes],
+    }
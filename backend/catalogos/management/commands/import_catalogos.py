@@ -0,0 +1,53 @@
+"""Importación masiva de catálogos desde archivos CSV o JSON."""
+
+import json
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.catalogos.importacion import (
+    ENTIDADES,
+    TAMANO_LOTE,
+    ErrorImportacion,
+    importar,
+    leer_filas,
+)
+
+
+class Command(BaseCommand):
+    """Upsert por ``codigo`` de uno o más archivos de catálogos.
+
+    La entidad se toma del nombre del archivo (``maquinas.csv``) salvo que se
+    indique ``--entity``; los archivos se procesan en orden de dependencias
+    dentro de una misma transacción.
+    """
+
+    help = "Importa catálogos (CSV, JSON o JSON Lines) creando o actualizando por código"
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivos", nargs="+", help="Archivos a importar")
+        parser.add_argument("--entity", choices=list(ENTIDADES), help="Entidad de todos los archivos")
+        parser.add_argument("--format", choices=["csv", "json", "jsonl"], help="Formato (por defecto, la extensión)")
+        parser.add_argument("--dry-run", action="store_true", help="Solo informa las diferencias, no guarda")
+        parser.add_argument("--batch-size", type=int, default=TAMANO_LOTE, help="Filas por lote")
+
+    def handle(self, *args, **options):
+        with ExitStack() as pila:
+            try:
+                fuentes = []
+                for ruta in map(Path, options["archivos"]):
+                    if not ruta.is_file():
+                        raise CommandError(f"No existe el archivo {ruta}")
+                    formato = options["format"] or ruta.suffix.lstrip(".").lower()
+                    texto = pila.enter_context(ruta.open(encoding="utf-8-sig", newline=""))
+                    fuentes.append((options["entity"] or ruta.stem, leer_filas(texto, formato)))
+                resultado = importar(fuentes, dry_run=options["dry_run"], lote=options["batch_size"])
+            except ErrorImportacion as exc:
+                raise CommandError(str(exc)) from exc
+
+        self.stdout.write(json.dumps(resultado, ensure_ascii=False, indent=2, default=str))
+        if any(informe["errores"] for informe in resultado["entidades"]):
+            raise CommandError("La importación tiene errores: no se aplicó ningún cambio")
+        if resultado["aplicado"]:
+            self.stdout.write(self.style.SUCCESS("Importación aplicada"))
@@ -0,0 +1,138 @@
+"""Catálogos en memoria para resolver FKs al validar escrituras.
+
+Un alta de producción valida ``producto``, ``formula``, ``maquina`` y
+``turno`` con ``PrimaryKeyRelatedField``: una consulta por campo. Con
+``CatalogoRelatedField`` (o ``serializer_related_field`` del serializer) las
+FKs a catálogos se resuelven contra una copia en memoria de la tabla,
+cargada con una consulta la primera vez que se usa.
+
+* Los filtros del campo (``filtros={"activa": True}``) se aplican al
+  queryset y se verifican sobre la fila en memoria.
+* Cada resolución devuelve una instancia nueva (``Model.from_db``): los
+  serializers pueden modificarla sin afectar a otras peticiones.
+* La tabla se descarta al guardar o borrar un registro en este proceso y
+  se recarga cuando cambia la versión compartida de ``referencias`` (que
+  incrementan las señales al confirmar y la importación de catálogos), de
+  modo que los demás workers también la renuevan. La versión se revisa como
+  mucho cada ``CATALOG_MEMORY_CHECK_SECONDS``.
+* Un id que no está en la tabla se busca en la base (lectura directa): la
+  memoria nunca rechaza un registro recién creado.
+* Sin caché compartida (``CACHE_BACKEND=locmem``) los demás workers no ven
+  la versión y servirían filas viejas: el campo consulta la base como
+  ``PrimaryKeyRelatedField``.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from rest_framework import serializers
+
+from backend.core.cache import cache_compartida
+
+from .models import EtapaProduccion, Formula, Funcion, Maquina, Parametro, Producto, Turno, Ubicacion
+from .referencias import version_tabla
+
+MODELOS = (EtapaProduccion, Formula, Funcion, Maquina, Parametro, Producto, Turno, Ubicacion)
+
+
+class _Tabla:
+    __slots__ = ("version", "verificado", "columnas", "filas")
+
+    def __init__(self, modelo, version):
+        self.version = version
+        self.verificado = time.monotonic()
+        self.columnas = [campo.attname for campo in modelo._meta.concrete_fields]
+        filas = modelo._default_manager.order_by().values_list(*self.columnas)
+        posicion_pk = self.columnas.index(modelo._meta.pk.attname)
+        self.filas = {fila[posicion_pk]: fila for fila in filas}
+
+
+_tablas = {}
+_candado = threading.Lock()
+
+
+def _tabla(modelo):
+    clave = modelo._meta.label_lower
+    actual = _tablas.get(clave)
+    ahora = time.monotonic()
+    if actual is not None and ahora - actual.verificado < settings.CATALOG_MEMORY_CHECK_SECONDS:
+        return actual
+    version = version_tabla(modelo)
+    if actual is not None and actual.version == version:
+        actual.verificado = ahora
+        return actual
+    with _candado:
+        actual = _tablas.get(clave)
+        if actual is None or actual.version != version:
+            actual = _Tabla(modelo, version)
+            _tablas[clave] = actual
+    return actual
+
+
+def admite(modelo):
+    return modelo in MODELOS
+
+
+def obtener(modelo, pk):
+    """Instancia de ``modelo`` con ``pk`` desde la memoria, o ``None`` si no está."""
+
+    tabla = _tabla(modelo)
+    fila = tabla.filas.get(pk)
+    if fila is None:
+        return None
+    return modelo.from_db(DEFAULT_DB_ALIAS, tabla.columnas, fila)
+
+
+def descartar(modelo):
+    _tablas.pop(modelo._meta.label_lower, None)
+
+
+class CatalogoRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` que resuelve los catálogos desde la memoria.
+
+    ``filtros`` restringe los registros válidos (``{"activo": True}``) tanto
+    en el queryset como en la verificación en memoria. Para otros modelos, o
+    si el queryset ya trae filtros propios, se comporta como el de DRF.
+    """
+
+    def __init__(self, filtros=None, **kwargs):
+        self.filtros = filtros or {}
+        if self.filtros and kwargs.get("queryset") is not None:
+            kwargs["queryset"] = kwargs["queryset"].filter(**self.filtros)
+        super().__init__(**kwargs)
+
+    def _en_memoria(self, queryset):
+        if not cache_compartida():
+            return False
+        return admite(queryset.model) and (self.filtros or not queryset.query.where)
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        if self.pk_field is not None or not self._en_memoria(queryset):
+            return super().to_internal_value(data)
+        # Mismos errores que ``PrimaryKeyRelatedField.to_internal_value``.
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = queryset.model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instancia = obtener(queryset.model, pk)
+        if instancia is None:
+            return super().to_internal_value(data)
+        if any(getattr(instancia, campo) != valor for campo, valor in self.filtros.items()):
+            self.fail("does_not_exist", pk_value=data)
+        return instancia
+
+
+def _al_cambiar(sender, **kwargs):
+    descartar(sender)
+
+
+for _modelo in MODELOS:
+    post_save.connect(_al_cambiar, sender=_modelo, dispatch_uid=f"memoria_{_modelo.__name__}")
+    post_delete.connect(_al_cambiar, sender=_modelo, dispatch_uid=f"memoria_borrado_{_modelo.__name__}")
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from backend.core.busqueda import FUNCION, SQL_FUNCION, borrar_indices, crear_indices
+
+# Columnas de ``search_fields`` de los ViewSets de catálogos.
+CAMPOS = {
+    "Ubicacion": ("codigo", "nombre"),
+    "Funcion": ("codigo", "nombre"),
+    "Parametro": ("codigo", "nombre", "unidad"),
+    "Maquina": ("codigo", "nombre", "fabricante", "modelo"),
+    "Producto": ("codigo", "nombre", "descripcion"),
+    "Formula": ("codigo", "version"),
+    "EtapaProduccion": ("codigo", "nombre"),
+}
+
+
+def crear(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(SQL_FUNCION)
+    for modelo, campos in CAMPOS.items():
+        crear_indices(schema_editor, apps.get_model("catalogos", modelo), campos)
+
+
+def borrar(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for modelo, campos in CAMPOS.items():
+        borrar_indices(schema_editor, apps.get_model("catalogos", modelo), campos)
+    # Las extensiones quedan: otras bases o funciones pueden usarlas.
+    schema_editor.execute(f"DROP FUNCTION IF EXISTS {FUNCION}(text)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalogos", "0004_formulaetapa_duracion_estimada_min_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear, borrar),
+    ]
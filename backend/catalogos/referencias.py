@@ -0,0 +1,116 @@
+"""Resolución de ids de catálogos sin descargar los catálogos completos.
+
+El frontend necesita traducir ids a código y nombre (máquina, producto,
+turno, fórmula). ``ReferenciasMixin`` agrega a los listados de catálogos:
+
+* ``?ids=1,2,3``: solo esos registros, con una consulta ``IN`` y sin
+  paginar (hasta ``CATALOG_IDS_MAX`` ids).
+* ``?view=minimal``: la proyección ``id``/``codigo``/``nombre`` del catálogo
+  completo, sin paginar, leída de una tabla en el alias ``catalog`` de la
+  caché. Se combina con ``ids``.
+
+La tabla de cada modelo se invalida al guardar o borrar un registro (y al
+importar catálogos, que escribe con ``bulk_create`` sin señales).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from backend.core.cache import invalidar, obtener_o_calcular, version_actual
+
+from .models import EtapaProduccion, Formula, Funcion, Maquina, Parametro, Producto, Turno, Ubicacion
+
+ALIAS = "catalog"
+VISTA_MINIMA = "minimal"
+# Parámetros que no filtran: con ``view=minimal`` y solo estos se usa la caché.
+_SIN_FILTRO = {"ids", "view", "format", "page", "page_size"}
+# Las tablas mínimas que leen campos de otro modelo (fórmula -> producto).
+_DEPENDIENTES = {Producto: (Formula,)}
+
+
+def _espacio(modelo):
+    return f"catalogo_minimo:{modelo._meta.label_lower}"
+
+
+def version_tabla(modelo):
+    """Versión vigente de la tabla mínima de ``modelo`` (cambia al invalidarla)."""
+
+    return version_actual(_espacio(modelo), alias=ALIAS)
+
+
+def invalidar_tabla(modelo):
+    """Descarta la tabla mínima de ``modelo`` y de las que dependen de él."""
+
+    for afectado in (modelo, *_DEPENDIENTES.get(modelo, ())):
+        invalidar(_espacio(afectado), alias=ALIAS)
+
+
+def _proyectar(queryset, campos):
+    claves = list(campos)
+    filas = queryset.values_list(*campos.values())
+    return [dict(zip(claves, fila)) for fila in filas]
+
+
+def tabla_minima(modelo, campos):
+    """Proyección ``campos`` (``{clave: ruta}``) de todo el catálogo, cacheada."""
+
+    return obtener_o_calcular(
+        _espacio(modelo),
+        *campos.values(),
+        calcular=lambda: _proyectar(modelo._default_manager.order_by("codigo", "pk"), campos),
+        alias=ALIAS,
+    )
+
+
+def parsear_ids(valor):
+    """``"1, 2,3"`` -> ``[1, 2, 3]``; 400 si hay valores no numéricos o demasiados."""
+
+    try:
+        ids = list(dict.fromkeys(int(parte) for parte in valor.split(",") if parte.strip()))
+    except ValueError as exc:
+        raise ValidationError({"ids": "Envíe ids numéricos separados por coma"}) from exc
+    if len(ids) > settings.CATALOG_IDS_MAX:
+        raise ValidationError({"ids": f"Como máximo {settings.CATALOG_IDS_MAX} ids por petición"})
+    return ids
+
+
+class ReferenciasMixin:
+    """Agrega ``?ids=`` y ``?view=minimal`` al listado de un catálogo."""
+
+    campos_minimos = {"id": "id", "codigo": "codigo", "nombre": "nombre"}
+
+    def _filtra(self):
+        return any(clave not in _SIN_FILTRO for clave in self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        crudo = request.query_params.get("ids")
+        minima = request.query_params.get("view") == VISTA_MINIMA
+        if crudo is None and not minima:
+            return super().list(request, *args, **kwargs)
+        ids = parsear_ids(crudo) if crudo is not None else None
+
+        if minima and not self._filtra():
+            filas = tabla_minima(self.get_queryset().model, self.campos_minimos)
+            if ids is not None:
+                buscados = set(ids)
+                filas = [fila for fila in filas if fila["id"] in buscados]
+            return Response(filas)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        if minima:
+            return Response(_proyectar(queryset.select_related(None).prefetch_related(None), self.campos_minimos))
+        return Response(self.get_serializer(queryset, many=True).data)
+
+
+def _al_cambiar(sender, **kwargs):
+    transaction.on_commit(lambda: invalidar_tabla(sender))
+
+
+for _modelo in (EtapaProduccion, Formula, Funcion, Maquina, Parametro, Producto, Turno, Ubicacion):
+    post_save.connect(_al_cambiar, sender=_modelo, dispatch_uid=f"tabla_minima_{_modelo.__name__}")
+    post_delete.connect(_al_cambiar, sender=_modelo, dispatch_uid=f"tabla_minima_borrado_{_modelo.__name__}")
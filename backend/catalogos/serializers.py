@@ -4,6 +4,8 @@ from django.apps import apps
 from django.db import transaction
 from rest_framework import serializers
 
+from backend.core.expansion import ExpansionSerializerMixin
+
 Funcion = apps.get_model("catalogos", "Funcion")
 Ubicacion = apps.get_model("catalogos", "Ubicacion")
 Parametro = apps.get_model("catalogos", "Parametro")
@@ -131,7 +133,7 @@ class ProductoSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "tipo_display", "presentacion_display"]
 
 
-class FormulaIngredienteSerializer(serializers.ModelSerializer):
+class FormulaIngredienteSerializer(ExpansionSerializerMixin, serializers.ModelSerializer):
     """Serializer explícito para los ingredientes de una fórmula."""
 
     material_nombre = serializers.CharField(source="material.nombre", read_only=True)
@@ -148,6 +150,7 @@ class FormulaIngredienteSerializer(serializers.ModelSerializer):
             "notas",
         ]
         read_only_fields = ["id", "material_nombre"]
+        expandable_fields = {"material": ProductoSerializer}
 
 
 class FormulaEtapaSerializer(serializers.ModelSerializer):
@@ -168,7 +171,7 @@ class FormulaEtapaSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "etapa_nombre"]
 
 
-class FormulaSerializer(serializers.ModelSerializer):
+class FormulaSerializer(ExpansionSerializerMixin, serializers.ModelSerializer):
     """Fórmulas con detalle de ingredientes y etapas persistidas."""
 
     producto_nombre = serializers.CharField(source="producto.nombre", read_only=True)
@@ -193,6 +196,7 @@ class FormulaSerializer(serializers.ModelSerializer):
             "etapas",
         ]
         read_only_fields = ["id", "producto_nombre"]
+        expandable_fields = {"producto": ProductoSerializer}
 
     def validate(self, attrs):
         producto = attrs.get("producto") or getattr(self.instance, "producto", None)
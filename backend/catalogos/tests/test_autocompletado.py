@@ -0,0 +1,85 @@
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.autocompletado import IndicePrefijos, normalizar
+from backend.catalogos.models import Maquina, Producto, Ubicacion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class IndicePrefijosTests(TestCase):
+    def setUp(self):
+        filas = [
+            {"id": 1, "codigo": "GRA-01", "nombre": "Granuladora de lecho"},
+            {"id": 2, "codigo": "COM-01", "nombre": "Compresora rotativa"},
+            {"id": 3, "codigo": "MEZ-01", "nombre": "Mezcladora para granulación"},
+        ]
+        self.indice = IndicePrefijos(filas, version=1)
+
+    def _ids(self, texto, limite=10):
+        return [fila["id"] for fila in self.indice.buscar(texto, limite)]
+
+    def test_normalizar(self):
+        self.assertEqual(normalizar("Compresión ÑANDÚ"), "compresion nandu")
+
+    def test_codigo_primero_luego_palabras_sin_acentos(self):
+        self.assertEqual(self._ids("gra"), [1, 3])
+        self.assertEqual(self._ids("GRANULACIÓN"), [3])
+        self.assertEqual(self._ids("com-0"), [2])
+
+    def test_varias_palabras_y_limite(self):
+        self.assertEqual(self._ids("mezcla gran"), [3])
+        self.assertEqual(self._ids("01", limite=2), [1, 2])
+        self.assertEqual(self._ids("  "), [])
+
+    def test_rapido(self):
+        filas = [{"id": i, "codigo": f"P-{i:05d}", "nombre": f"Producto número {i}"} for i in range(20000)]
+        indice = IndicePrefijos(filas, version=1)
+        inicio = time.perf_counter()
+        for _ in range(100):
+            indice.buscar("producto 1999", 10)
+        self.assertLess((time.perf_counter() - inicio) / 100, 0.001)
+
+
+@override_settings(AUTOCOMPLETE_CHECK_SECONDS=0)
+class AutocompletadoApiTests(TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("operario", password="pass1234"))
+        ubicacion = Ubicacion.objects.create(codigo="PLT", nombre="Planta")
+        self.maquina = Maquina.objects.create(
+            codigo="COMP-01", nombre="Compresión rotativa", tipo="COMPRESION", ubicacion=ubicacion
+        )
+        Maquina.objects.create(codigo="MEZ-01", nombre="Mezcladora", tipo="MEZCLADO", ubicacion=ubicacion)
+
+    def test_busca_sin_consultar_la_base(self):
+        url = reverse("maquina-autocomplete")
+        self.client.get(url, {"q": "x"})
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(url, {"q": "compresion"})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), [{"id": self.maquina.pk, "codigo": "COMP-01", "nombre": "Compresión rotativa"}])
+
+    def test_se_actualiza_con_las_senales(self):
+        url = reverse("producto-autocomplete")
+        self.assertEqual(self.client.get(url, {"q": "tab"}).json(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Producto.objects.create(
+                codigo="TAB-001",
+                nombre="Tabletas",
+                tipo="COMPRIMIDO",
+                presentacion="BLISTER",
+                concentracion="500mg",
+            )
+        self.assertEqual([fila["codigo"] for fila in self.client.get(url, {"q": "tab"}).json()], ["TAB-001"])
+
+    def test_limite_invalido(self):
+        respuesta = self.client.get(reverse("maquina-autocomplete"), {"q": "m", "limit": "x"})
+        self.assertEqual(respuesta.status_code, 400)
@@ -0,0 +1,145 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.importacion import importar, leer_filas
+from backend.catalogos.models import EtapaProduccion, Formula, FormulaEtapa, Maquina, Ubicacion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+UBICACIONES_CSV = "codigo,nombre,activa\nPL1,Planta 1,si\nPL2,Planta 2,\n"
+MAQUINAS_CSV = (
+    "codigo,nombre,tipo,ubicacion,capacidad_nominal\n"
+    "CMP-01,Compresora 1,COMPRESION,PL1,1500.50\n"
+    "MEZ-01,Mezcladora,MEZCLADO,PL2,\n"
+)
+
+
+def _fuente(nombre, contenido, formato="csv"):
+    return nombre, leer_filas(io.StringIO(contenido), formato)
+
+
+class ImportacionTests(TestCase):
+    def test_upsert_crea_y_luego_actualiza_solo_lo_distinto(self):
+        resultado = importar([_fuente("maquinas", MAQUINAS_CSV), _fuente("ubicaciones", UBICACIONES_CSV)])
+        self.assertTrue(resultado["aplicado"])
+        self.assertEqual([informe["entidad"] for informe in resultado["entidades"]], ["ubicaciones", "maquinas"])
+        self.assertEqual(Maquina.objects.get(codigo="CMP-01").ubicacion.codigo, "PL1")
+        self.assertTrue(Ubicacion.objects.get(codigo="PL2").activa)
+
+        cambios = MAQUINAS_CSV.replace("Mezcladora", "Mezcladora V").replace("MEZCLADO,PL2", "MEZCLADO,PL1")
+        with self.assertNumQueries(7):
+            resultado = importar([_fuente("maquinas", cambios)])
+        informe = resultado["entidades"][0]
+        self.assertEqual((informe["creadas"], informe["actualizadas"], informe["sin_cambios"]), (0, 1, 1))
+        self.assertEqual(
+            informe["cambios"][0]["cambios"],
+            {"nombre": ["Mezcladora", "Mezcladora V"], "ubicacion": ["PL2", "PL1"]},
+        )
+        self.assertEqual(Maquina.objects.get(codigo="MEZ-01").ubicacion.codigo, "PL1")
+        self.assertEqual(Maquina.objects.count(), 2)
+
+    def test_json_arreglo_y_json_lines(self):
+        importar([_fuente("ubicaciones", UBICACIONES_CSV)])
+        arreglo = json.dumps([{"codigo": "E1", "nombre": "Mezcla", "maquinas_permitidas": []}])
+        lineas = '{"codigo": "PL3", "nombre": "Planta 3"}\n{"codigo": "PL4", "nombre": "Planta 4"}\n'
+        resultado = importar([_fuente("etapas", arreglo, "json"), _fuente("ubicaciones", lineas, "jsonl")])
+        self.assertTrue(resultado["aplicado"])
+        self.assertTrue(EtapaProduccion.objects.filter(codigo="E1").exists())
+        self.assertEqual(Ubicacion.objects.count(), 4)
+
+    def test_relaciones_multiples_por_codigo(self):
+        importar([_fuente("ubicaciones", UBICACIONES_CSV), _fuente("maquinas", MAQUINAS_CSV)])
+        etapas = "codigo,nombre,maquinas_permitidas\nGRA,Granulado,CMP-01|MEZ-01\n"
+        importar([_fuente("etapas", etapas)])
+        etapa = EtapaProduccion.objects.get(codigo="GRA")
+        self.assertEqual(set(etapa.maquinas_permitidas.values_list("codigo", flat=True)), {"CMP-01", "MEZ-01"})
+
+        resultado = importar([_fuente("etapas", etapas.replace("CMP-01|", ""))])
+        self.assertEqual(
+            resultado["entidades"][0]["cambios"][0]["cambios"],
+            {"maquinas_permitidas": [["CMP-01", "MEZ-01"], ["MEZ-01"]]},
+        )
+        self.assertEqual(list(etapa.maquinas_permitidas.values_list("codigo", flat=True)), ["MEZ-01"])
+
+    def test_clave_compuesta_de_etapas_de_formula(self):
+        importar([_fuente("productos", "codigo,nombre,tipo,presentacion,concentracion\nP1,Prod,JARABE,FRASCO,5mg\n")])
+        importar([_fuente("etapas", "codigo,nombre\nE1,Mezcla\nE2,Envase\n")])
+        formulas = "codigo,version,producto\nF1,1.0.0,P1\n"
+        etapas = "formula,orden,etapa\nF1,1,E1\nF1,2,E2\n"
+        importar([_fuente("formula_etapas", etapas), _fuente("formulas", formulas)])
+        resultado = importar([_fuente("formula_etapas", etapas.replace("F1,2,E2", "F1,2,E1"))])
+        self.assertEqual(resultado["entidades"][0]["cambios"][0]["clave"], ["F1", 2])
+        self.assertEqual(FormulaEtapa.objects.filter(formula=Formula.objects.get(codigo="F1"), etapa__codigo="E1").count(), 2)
+
+    def test_dry_run_informa_sin_guardar(self):
+        resultado = importar([_fuente("ubicaciones", UBICACIONES_CSV)], dry_run=True)
+        self.assertFalse(resultado["aplicado"])
+        self.assertEqual(resultado["entidades"][0]["creadas"], 2)
+        self.assertEqual(resultado["entidades"][0]["cambios"][0]["accion"], "crear")
+        self.assertFalse(Ubicacion.objects.exists())
+
+    def test_errores_de_validacion_revierten_todo(self):
+        maquinas = MAQUINAS_CSV + "X-01,Sin planta,COMPRESION,NOPE,\nX-02,Tipo malo,TORNO,PL1,abc\n"
+        resultado = importar([_fuente("ubicaciones", UBICACIONES_CSV), _fuente("maquinas", maquinas)])
+        self.assertFalse(resultado["aplicado"])
+        errores = resultado["entidades"][1]["errores"]
+        self.assertEqual([error["fila"] for error in errores], [4, 5])
+        self.assertIn("ubicacion", errores[0]["error"])
+        self.assertEqual(set(errores[1]["error"]), {"tipo", "capacidad_nominal"})
+        self.assertFalse(Ubicacion.objects.exists())
+
+
+class ImportCatalogosCommandTests(TestCase):
+    def test_toma_la_entidad_del_nombre_del_archivo(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = Path(directorio) / "ubicaciones.csv"
+            ruta.write_text("﻿" + UBICACIONES_CSV, encoding="utf-8")
+            salida = io.StringIO()
+            call_command("import_catalogos", str(ruta), "--dry-run", stdout=salida)
+            self.assertFalse(Ubicacion.objects.exists())
+            call_command("import_catalogos", str(ruta), "--batch-size", "1", stdout=salida)
+        self.assertEqual(Ubicacion.objects.count(), 2)
+
+    def test_columnas_desconocidas_fallan(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = Path(directorio) / "datos.csv"
+            ruta.write_text("codigo,color\nA,rojo\n", encoding="utf-8")
+            with self.assertRaisesMessage(CommandError, "color"):
+                call_command("import_catalogos", str(ruta), "--entity", "ubicaciones", stdout=io.StringIO())
+
+
+class ImportacionApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("importar_catalogos")
+
+    def _archivo(self):
+        return SimpleUploadedFile("ubicaciones.csv", UBICACIONES_CSV.encode(), content_type="text/csv")
+
+    def test_solo_administradores(self):
+        self.client.force_authenticate(UserModel.objects.create_user("operario", password="pass1234"))
+        respuesta = self.client.post(self.url, {"archivo": self._archivo()}, format="multipart")
+        self.assertEqual(respuesta.status_code, 403)
+
+    def test_importa_y_devuelve_el_informe(self):
+        self.client.force_authenticate(UserModel.objects.create_superuser("admin", "a@a.com", "pass1234"))
+        respuesta = self.client.post(self.url, {"archivo": self._archivo(), "dry_run": "1"}, format="multipart")
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertFalse(respuesta.json()["aplicado"])
+        respuesta = self.client.post(self.url, {"archivo": self._archivo()}, format="multipart")
+        self.assertEqual(respuesta.json()["entidades"][0]["creadas"], 2)
+        self.assertEqual(Ubicacion.objects.count(), 2)
+
+        errores = SimpleUploadedFile("ubicaciones.csv", b"codigo,nombre\n,Sin codigo\n")
+        respuesta = self.client.post(self.url, {"archivo": errores}, format="multipart")
+        self.assertEqual(respuesta.status_code, 400)
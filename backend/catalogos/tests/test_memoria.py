@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from backend.catalogos import memoria
+from backend.catalogos.memoria import CatalogoRelatedField
+from backend.catalogos.models import Formula, Funcion, Maquina, Producto, Turno, Ubicacion
+from backend.catalogos.referencias import invalidar_tabla
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+@override_settings(CACHE_BACKEND="redis")
+class CatalogoEnMemoriaTests(TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.producto = Producto.objects.create(
+            codigo="PRD-1", nombre="Producto", tipo="COMPRIMIDO", presentacion="BLISTER", concentracion="500mg"
+        )
+        self.formula = Formula.objects.create(codigo="FOR-1", version="1.0.0", producto=self.producto)
+        ubicacion = Ubicacion.objects.create(codigo="PLT", nombre="Planta")
+        self.maquina = Maquina.objects.create(codigo="M-1", nombre="Mezcladora", tipo="MEZCLADO", ubicacion=ubicacion)
+        self.turno = Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("operario", password="pass1234"))
+
+    def _alta(self):
+        inicio = timezone.now()
+        return self.client.post(
+            reverse("registro-produccion-list"),
+            {
+                "producto": self.producto.pk,
+                "formula": self.formula.pk,
+                "maquina": self.maquina.pk,
+                "turno": self.turno.pk,
+                "hora_inicio": inicio.isoformat(),
+                "hora_fin": (inicio + timedelta(hours=1)).isoformat(),
+                "cantidad_producida": "10.00",
+                "unidad_medida": "kg",
+            },
+            format="json",
+        )
+
+    def test_alta_sin_consultas_a_catalogos(self):
+        self.assertEqual(self._alta().status_code, 201)
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self._alta()
+        self.assertEqual(respuesta.status_code, 201, respuesta.content)
+        lecturas = [consulta["sql"] for consulta in consultas if 'FROM "catalogos_' in consulta["sql"]]
+        self.assertEqual(lecturas, [])
+
+    def test_instancias_independientes(self):
+        primera = memoria.obtener(Producto, self.producto.pk)
+        primera.nombre = "Modificado"
+        self.assertEqual(memoria.obtener(Producto, self.producto.pk).nombre, "Producto")
+
+    def test_respeta_filtros_y_version_compartida(self):
+        funcion = Funcion.objects.create(codigo="OPE", nombre="Operario")
+        campo = CatalogoRelatedField(queryset=Funcion.objects.all(), filtros={"activa": True})
+        self.assertEqual(campo.to_internal_value(funcion.pk).pk, funcion.pk)
+
+        # Otro worker desactiva la función: sin señales en este proceso, solo cambia la versión.
+        Funcion.objects.filter(pk=funcion.pk).update(activa=False)
+        invalidar_tabla(Funcion)
+        with self.assertRaises(ValidationError):
+            campo.to_internal_value(funcion.pk)
+
+    def test_registro_ausente_se_lee_de_la_base(self):
+        campo = CatalogoRelatedField(queryset=Producto.objects.all())
+        campo.to_internal_value(self.producto.pk)
+        nuevo = Producto.objects.bulk_create(
+            [Producto(codigo="PRD-2", nombre="Nuevo", tipo="COMPRIMIDO", presentacion="BLISTER", concentracion="1mg")]
+        )[0]
+        with self.assertNumQueries(1):
+            self.assertEqual(campo.to_internal_value(nuevo.pk).codigo, "PRD-2")
+        with self.assertRaises(ValidationError):
+            campo.to_internal_value(999999)
+
+    @override_settings(CACHE_BACKEND="locmem")
+    def test_sin_cache_compartida_consulta_la_base(self):
+        # Los demás workers no verían la versión: cada validación lee la fila.
+        campo = CatalogoRelatedField(queryset=Producto.objects.all())
+        campo.to_internal_value(self.producto.pk)
+        Producto.objects.filter(pk=self.producto.pk).update(nombre="Renombrado")
+        with self.assertNumQueries(1):
+            self.assertEqual(campo.to_internal_value(self.producto.pk).nombre, "Renombrado")
@@ -0,0 +1,77 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.importacion import importar
+from backend.catalogos.models import Formula, Producto
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class ReferenciasTests(TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("supervisor", password="pass1234"))
+        self.productos = [
+            Producto.objects.create(
+                codigo=f"P-{indice:03d}",
+                nombre=f"Producto {indice}",
+                tipo="COMPRIMIDO",
+                presentacion="BLISTER",
+                concentracion="500mg",
+            )
+            for indice in range(260)
+        ]
+        self.url = reverse("producto-list")
+
+    def test_ids_sin_paginar_en_una_consulta(self):
+        buscados = [producto.pk for producto in self.productos[:3]] + [self.productos[-1].pk]
+        with self.assertNumQueries(1):
+            respuesta = self.client.get(self.url, {"ids": ",".join(map(str, buscados))})
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(sorted(fila["id"] for fila in respuesta.json()), sorted(buscados))
+        self.assertIn("tipo_display", respuesta.json()[0])
+
+    @override_settings(CATALOG_IDS_MAX=2)
+    def test_ids_invalidos_o_excesivos(self):
+        self.assertEqual(self.client.get(self.url, {"ids": "1,a"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"ids": "1,2,3"}).status_code, 400)
+
+    def test_vista_minima_cacheada(self):
+        respuesta = self.client.get(self.url, {"view": "minimal"})
+        self.assertEqual(len(respuesta.json()), 260)
+        self.assertEqual(respuesta.json()[0], {"id": self.productos[0].pk, "codigo": "P-000", "nombre": "Producto 0"})
+
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(self.url, {"view": "minimal", "ids": str(self.productos[5].pk)})
+        self.assertEqual([fila["codigo"] for fila in respuesta.json()], ["P-005"])
+
+    def test_vista_minima_se_invalida_al_guardar(self):
+        self.client.get(self.url, {"view": "minimal"})
+        producto = self.productos[0]
+        producto.nombre = "Renombrado"
+        with self.captureOnCommitCallbacks(execute=True):
+            producto.save()
+
+        respuesta = self.client.get(self.url, {"view": "minimal", "ids": str(producto.pk)})
+        self.assertEqual(respuesta.json()[0]["nombre"], "Renombrado")
+
+    def test_vista_minima_con_filtros_no_usa_la_cache(self):
+        respuesta = self.client.get(self.url, {"view": "minimal", "search": "P-25"})
+        self.assertEqual([fila["codigo"] for fila in respuesta.json()], [f"P-25{indice}" for indice in range(10)])
+
+    def test_formula_muestra_el_producto_y_se_invalida_con_la_importacion(self):
+        formula = Formula.objects.create(codigo="F-001", version="1.0.0", producto=self.productos[0])
+        url = reverse("formula-list")
+        fila = self.client.get(url, {"view": "minimal"}).json()[0]
+        self.assertEqual(fila, {"id": formula.pk, "codigo": "F-001", "version": "1.0.0", "nombre": "Producto 0"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultado = importar([("productos", [(1, {"codigo": "P-000", "nombre": "Importado"})])])
+        self.assertTrue(resultado["aplicado"], resultado)
+        self.assertEqual(self.client.get(url, {"view": "minimal"}).json()[0]["nombre"], "Importado")
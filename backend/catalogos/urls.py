@@ -13,6 +13,7 @@ from .views import (
     TurnoViewSet,
     FuncionViewSet,
     ParametroViewSet,
+    ImportacionCatalogosView,
 )
 
 router = DefaultRouter()
@@ -27,5 +28,6 @@ router.register('funciones', FuncionViewSet)
 router.register('parametros', ParametroViewSet)
 
 urlpatterns = [
+    path('importar/', ImportacionCatalogosView.as_view(), name='importar_catalogos'),
     path('', include(router.urls)),
 ]
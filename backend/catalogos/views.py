@@ -1,9 +1,19 @@
 """ViewSets de catálogos maestros."""
 
+import io
+from pathlib import Path
+
 from django.db.models import Count
-from rest_framework import filters, permissions, viewsets
+from rest_framework import filters, permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from backend.core.busqueda import BusquedaFilter
+from backend.core.cache_respuestas import CacheRespuestasMixin
+from backend.core.columnar import ColumnarMixin
+from backend.core.expansion import ExpansionViewSetMixin
 from backend.core.permissions import (
     IsAdmin,
     IsAdminOrSupervisor,
@@ -11,17 +21,22 @@ from backend.core.permissions import (
     IsSuperuserOrSupervisor,
 )
 
+from .autocompletado import AutocompletadoMixin
+from .importacion import ErrorImportacion, importar, leer_filas
 from .models import (
     Ubicacion,
     Maquina,
     MaquinaAttachment,
     Producto,
     Formula,
+    FormulaEtapa,
+    FormulaIngrediente,
     EtapaProduccion,
     Turno,
     Funcion,
     Parametro,
 )
+from .referencias import ReferenciasMixin
 from .serializers import (
     UbicacionSerializer,
     MaquinaSerializer,
@@ -35,11 +50,18 @@ from .serializers import (
 )
 
 
-class ParametroViewSet(viewsets.ModelViewSet):
+class ParametroViewSet(
+    CacheRespuestasMixin,
+    AutocompletadoMixin,
+    ReferenciasMixin,
+    ColumnarMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Parametro.objects.all()
     serializer_class = ParametroSerializer
+    cache_models = (Parametro,)
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ["codigo", "nombre", "unidad"]
     ordering_fields = ["nombre", "codigo", "unidad"]
 
@@ -49,14 +71,15 @@ class ParametroViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
-class UbicacionViewSet(viewsets.ModelViewSet):
+class UbicacionViewSet(CacheRespuestasMixin, ReferenciasMixin, ColumnarMixin, viewsets.ModelViewSet):
     """Gestión de ubicaciones con estadísticas de máquinas."""
 
     queryset = Ubicacion.objects.annotate(
         maquinas_count=Count('maquinas', distinct=True),
     ).order_by('codigo')
     serializer_class = UbicacionSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_models = (Ubicacion, Maquina)
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ['codigo', 'nombre']
     ordering_fields = ['codigo', 'nombre']
 
@@ -68,12 +91,21 @@ class UbicacionViewSet(viewsets.ModelViewSet):
         return [perm() for perm in perm_classes]
 
 
-class MaquinaViewSet(viewsets.ModelViewSet):
+class MaquinaViewSet(
+    CacheRespuestasMixin,
+    AutocompletadoMixin,
+    ReferenciasMixin,
+    ColumnarMixin,
+    viewsets.ModelViewSet,
+):
     """Gestión de máquinas con filtros avanzados."""
 
     queryset = Maquina.objects.select_related('ubicacion').all().order_by('codigo')
     serializer_class = MaquinaSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_models = (Maquina, Ubicacion)
+    # Evita que la ruta de detalle capture ``maquinas/adjuntos/``.
+    lookup_value_regex = r'\d+'
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ['codigo', 'nombre', 'fabricante', 'modelo']
     ordering_fields = ['codigo', 'nombre', 'tipo']
 
@@ -113,12 +145,19 @@ class MaquinaAttachmentViewSet(viewsets.ModelViewSet):
         serializer.save(subido_por=user, content_type=content_type, tamano_bytes=size)
 
 
-class ProductoViewSet(viewsets.ModelViewSet):
+class ProductoViewSet(
+    CacheRespuestasMixin,
+    AutocompletadoMixin,
+    ReferenciasMixin,
+    ColumnarMixin,
+    viewsets.ModelViewSet,
+):
     """Gestión de productos con filtros por tipo, presentación y estado."""
 
     queryset = Producto.objects.all().order_by('codigo')
     serializer_class = ProductoSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_models = (Producto,)
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ['codigo', 'nombre', 'descripcion']
     ordering_fields = ['codigo', 'nombre', 'tipo', 'presentacion']
 
@@ -147,7 +186,14 @@ class ProductoViewSet(viewsets.ModelViewSet):
         return [perm() for perm in perm_classes]
 
 
-class FormulaViewSet(viewsets.ModelViewSet):
+class FormulaViewSet(
+    CacheRespuestasMixin,
+    AutocompletadoMixin,
+    ReferenciasMixin,
+    ColumnarMixin,
+    ExpansionViewSetMixin,
+    viewsets.ModelViewSet,
+):
     """Gestión de fórmulas por producto y vigencia."""
 
     queryset = (
@@ -156,7 +202,9 @@ class FormulaViewSet(viewsets.ModelViewSet):
         .all()
     )
     serializer_class = FormulaSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_models = (Formula, FormulaIngrediente, FormulaEtapa, Producto, EtapaProduccion)
+    campos_minimos = {"id": "id", "codigo": "codigo", "version": "version", "nombre": "producto__nombre"}
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ['producto__nombre', 'codigo', 'version']
     ordering_fields = ['codigo', 'version', 'activa']
 
@@ -181,7 +229,13 @@ class FormulaViewSet(viewsets.ModelViewSet):
         return [perm() for perm in perm_classes]
 
 
-class EtapaProduccionViewSet(viewsets.ModelViewSet):
+class EtapaProduccionViewSet(
+    CacheRespuestasMixin,
+    AutocompletadoMixin,
+    ReferenciasMixin,
+    ColumnarMixin,
+    viewsets.ModelViewSet,
+):
     """Gestión de etapas de producción."""
 
     queryset = (
@@ -190,7 +244,8 @@ class EtapaProduccionViewSet(viewsets.ModelViewSet):
         .order_by('codigo')
     )
     serializer_class = EtapaProduccionSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    cache_models = (EtapaProduccion, Maquina, Parametro)
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ['codigo', 'nombre']
     ordering_fields = ['codigo', 'nombre']
 
@@ -202,11 +257,12 @@ class EtapaProduccionViewSet(viewsets.ModelViewSet):
         return [perm() for perm in perm_classes]
 
 
-class TurnoViewSet(viewsets.ModelViewSet):
+class TurnoViewSet(CacheRespuestasMixin, ReferenciasMixin, ColumnarMixin, viewsets.ModelViewSet):
     """Gestión de turnos."""
 
     queryset = Turno.objects.all().order_by('codigo')
     serializer_class = TurnoSerializer
+    cache_models = (Turno,)
 
     def get_permissions(self):
         if self.request.method in permissions.SAFE_METHODS:
@@ -216,15 +272,48 @@ class TurnoViewSet(viewsets.ModelViewSet):
         return [perm() for perm in perm_classes]
 
 
-class FuncionViewSet(viewsets.ModelViewSet):
+class FuncionViewSet(CacheRespuestasMixin, ReferenciasMixin, ColumnarMixin, viewsets.ModelViewSet):
     queryset = Funcion.objects.all()
     serializer_class = FuncionSerializer
+    cache_models = (Funcion,)
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = ["codigo", "nombre"]
     ordering_fields = ["nombre", "codigo"]
 
     def get_permissions(self):
         if self.action in {"create", "update", "partial_update", "destroy"}:
             return [IsAdmin()]
-        return super().get_permissions()
\ No newline at end of file
+        return super().get_permissions()
+
+
+class ImportacionCatalogosView(APIView):
+    """Importa catálogos desde archivos con la misma lógica que ``import_catalogos``.
+
+    ``archivo`` admite varios archivos; la entidad de cada uno es ``entidad``
+    o, si no se envía, el nombre del archivo (``maquinas.csv``). Con
+    ``dry_run=1`` solo devuelve el informe de diferencias.
+    """
+
+    permission_classes = [IsAdmin]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        archivos = request.FILES.getlist("archivo")
+        if not archivos:
+            raise ValidationError({"archivo": "Adjunte al menos un archivo"})
+        entidad = request.data.get("entidad")
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "si")
+
+        try:
+            fuentes = []
+            for archivo in archivos:
+                ruta = Path(archivo.name)
+                texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+                fuentes.append((entidad or ruta.stem, leer_filas(texto, ruta.suffix.lstrip(".").lower())))
+            resultado = importar(fuentes, dry_run=dry_run)
+        except (ErrorImportacion, UnicodeDecodeError) as exc:
+            raise ValidationError({"archivo": str(exc)}) from exc
+
+        con_errores = any(informe["errores"] for informe in resultado["entidades"])
+        return Response(resultado, status=status.HTTP_400_BAD_REQUEST if con_errores else status.HTTP_200_OK)
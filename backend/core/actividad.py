@@ -0,0 +1,98 @@
+"""Buffer de actividad de login con escritura diferida de ``last_login``.
+
+Cada login exitoso guardaba ``last_login`` con un ``UPDATE`` propio y, vía
+``post_save``, volvía a guardar el perfil. En el cambio de turno eso es una
+ráfaga de escrituras sobre las mismas filas. Aquí el login solo anota el
+momento en la caché ``sessions``; ``vaciar`` lo vuelca con un único
+``bulk_update`` que no dispara señales.
+
+El vaciado ocurre como mucho una vez por ``LOGIN_ACTIVITY_FLUSH_SECONDS``:
+lo dispara el primer login de cada intervalo y la tarea periódica
+``core.vaciar_actividad_login`` recoge los logins posteriores. Las
+anotaciones viven ``LOGIN_ACTIVITY_RETENTION_SECONDS``, más que el
+intervalo. Con intervalo ``0`` o sin caché compartida (``locmem``: la tarea
+corre en otro proceso y no vería el buffer) se escribe directamente.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from backend.core.cache import cache_compartida
+
+_ALIAS = "sessions"
+_PREFIJO = "actividad:login"
+_CLAVE_SECUENCIA = f"{_PREFIJO}:secuencia"
+_CLAVE_VACIADO = f"{_PREFIJO}:vaciado"
+_CLAVE_INTERVALO = f"{_PREFIJO}:intervalo"
+TAMANO_LOTE = 500
+
+
+def _clave_usuario(user_id):
+    return f"{_PREFIJO}:usuario:{user_id}"
+
+
+def _clave_posicion(numero):
+    return f"{_PREFIJO}:pendiente:{numero}"
+
+
+def _siguiente_posicion(cache):
+    if cache.add(_CLAVE_SECUENCIA, 1, timeout=None):
+        return 1
+    try:
+        return cache.incr(_CLAVE_SECUENCIA)
+    except ValueError:
+        cache.set(_CLAVE_SECUENCIA, 1, timeout=None)
+        return 1
+
+
+def registrar_login(user, momento=None):
+    """Anota el login de ``user`` y actualiza ``last_login`` en la instancia."""
+
+    momento = momento or timezone.now()
+    user.last_login = momento
+    intervalo = settings.LOGIN_ACTIVITY_FLUSH_SECONDS
+    if intervalo <= 0 or not cache_compartida():
+        type(user)._default_manager.filter(pk=user.pk).update(last_login=momento)
+        return
+
+    cache = caches[_ALIAS]
+    retencion = settings.LOGIN_ACTIVITY_RETENTION_SECONDS
+    cache.set(_clave_usuario(user.pk), momento, timeout=retencion)
+    cache.set(_clave_posicion(_siguiente_posicion(cache)), user.pk, timeout=retencion)
+
+    # ``add`` solo tiene éxito una vez por intervalo entre todos los workers.
+    if cache.add(_CLAVE_INTERVALO, 1, timeout=intervalo):
+        vaciar()
+
+
+def vaciar():
+    """Vuelca los ``last_login`` pendientes en lotes y devuelve cuántos escribió."""
+
+    cache = caches[_ALIAS]
+    hasta = cache.get(_CLAVE_SECUENCIA) or 0
+    desde = cache.get(_CLAVE_VACIADO) or 0
+    if desde > hasta:
+        # La secuencia se reinició (expulsión o reinicio de la caché).
+        desde = 0
+    if desde == hasta:
+        return 0
+
+    posiciones = [_clave_posicion(numero) for numero in range(desde + 1, hasta + 1)]
+    ids = set(cache.get_many(posiciones).values())
+    momentos = cache.get_many([_clave_usuario(user_id) for user_id in ids])
+
+    UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+    usuarios = [
+        UserModel(pk=user_id, last_login=momentos[_clave_usuario(user_id)])
+        for user_id in sorted(ids)
+        if _clave_usuario(user_id) in momentos
+    ]
+    if usuarios:
+        UserModel._default_manager.bulk_update(usuarios, ["last_login"], batch_size=TAMANO_LOTE)
+
+    cache.set(_CLAVE_VACIADO, hasta, timeout=None)
+    # Los momentos por usuario no se borran: un login posterior pudo pisarlos.
+    cache.delete_many(posiciones)
+    return len(usuarios)
@@ -6,5 +6,7 @@ class CoreConfig(AppConfig):
     name = 'backend.core'
 
     def ready(self):
-        """Importa las señales cuando la app esté lista."""
+        """Importa las señales y los chequeos cuando la app esté lista."""
+        import backend.core.busqueda  # noqa: F401
+        import backend.core.checks  # noqa: F401
         import backend.core.signals  # noqa: F401
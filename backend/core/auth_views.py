@@ -5,14 +5,16 @@ from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.core.actividad import registrar_login
+from backend.core.idempotencia import idempotencia_exenta
+from backend.core.tokens import RoleRefreshToken, renovar_claims
 
 from backend.core.throttles import LoginRateThrottle, RegisterRateThrottle
 from backend.core.user_serializers import BasicUserSerializer as UserSerializer
@@ -21,6 +23,7 @@ from backend.core.user_serializers import BasicUserSerializer as UserSerializer
 UserModel = apps.get_model(settings.AUTH_USER_MODEL)
 
 
+@idempotencia_exenta
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -69,12 +72,11 @@ def login_view(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Actualizar last_login
-    user.last_login = timezone.now()
-    user.save(update_fields=['last_login'])
+    # Anotar last_login (se escribe en lote, ver backend.core.actividad)
+    registrar_login(user)
     
-    # Generar tokens JWT
-    refresh = RefreshToken.for_user(user)
+    # Generar tokens JWT con los roles embebidos
+    refresh = RoleRefreshToken.for_user(user)
     
     # Serializar usuario
     user_data = UserSerializer(user).data
@@ -87,6 +89,7 @@ def login_view(request):
     })
 
 
+@idempotencia_exenta
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout_view(request):
@@ -99,7 +102,7 @@ def logout_view(request):
 
     if refresh_token:
         try:
-            token = RefreshToken(refresh_token)
+            token = RoleRefreshToken(refresh_token)
             token.blacklist()
         except TokenError:
             return Response(
@@ -149,6 +152,7 @@ def me_view(request):
     return Response(user_data)
 
 
+@idempotencia_exenta
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def refresh_token_view(request):
@@ -166,7 +170,8 @@ def refresh_token_view(request):
         )
     
     try:
-        refresh = RefreshToken(refresh_token)
+        refresh = RoleRefreshToken(refresh_token)
+        renovar_claims(refresh)
         return Response({
             'access': str(refresh.access_token),
         })
@@ -177,6 +182,7 @@ def refresh_token_view(request):
         )
 
 
+@idempotencia_exenta
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -234,12 +240,11 @@ def register_view(request):
         last_name=last_name
     )
     
-    # Actualizar last_login
-    user.last_login = timezone.now()
-    user.save(update_fields=['last_login'])
+    # Anotar last_login
+    registrar_login(user)
     
     # Generar tokens
-    refresh = RefreshToken.for_user(user)
+    refresh = RoleRefreshToken.for_user(user)
     user_data = UserSerializer(user).data
     
     return Response({
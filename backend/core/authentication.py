@@ -0,0 +1,80 @@
+"""Autenticación JWT con modo sin estado opcional.
+
+Con ``JWT_STATELESS_AUTH`` activo, el usuario se arma a partir de los claims
+del access token (ver ``backend.core.tokens``) sin consultar la base. Las
+desactivaciones y los cambios de rol se propagan con una marca de
+revocación por usuario en la caché compartida: los tokens emitidos antes de
+la marca se rechazan. La marca vive lo mismo que un access token, porque
+pasado ese plazo ningún token anterior sigue vigente.
+
+Requiere un ``CACHE_BACKEND`` compartido entre workers; con ``locmem`` cada
+proceso vería sus propias revocaciones.
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from backend.core.models import UsuarioToken
+from backend.core.tokens import CLAIM_GRUPOS
+
+ALIAS_REVOCACION = "sessions"
+
+
+def _clave_revocacion(user_id):
+    return f"jwt:revocado:{user_id}"
+
+
+def revocar_tokens(user_id):
+    """Invalida los access tokens ya emitidos para ``user_id``."""
+
+    # Redondeo hacia arriba: ``iat`` tiene resolución de segundos y un token
+    # emitido en el mismo segundo que la revocación también debe caer.
+    caches[ALIAS_REVOCACION].set(
+        _clave_revocacion(user_id),
+        math.ceil(time.time()),
+        timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def esta_revocado(user_id, emitido_en):
+    revocado_desde = caches[ALIAS_REVOCACION].get(_clave_revocacion(user_id))
+    return revocado_desde is not None and emitido_en < revocado_desde
+
+
+def usuario_desde_claims(token):
+    """Instancia ``UsuarioToken`` con solo los campos presentes en el token."""
+
+    pk = UsuarioToken._meta.pk.attname
+    claims = {
+        pk: token[api_settings.USER_ID_CLAIM],
+        "username": token["username"],
+        "is_staff": token["is_staff"],
+        "is_superuser": token["is_superuser"],
+        "is_active": True,
+    }
+    # ``from_db`` espera los valores en el orden de los campos del modelo.
+    campos = [campo.attname for campo in UsuarioToken._meta.concrete_fields if campo.attname in claims]
+    usuario = UsuarioToken.from_db("default", campos, [claims[campo] for campo in campos])
+    # ``UsuarioToken.save`` relee de la base los que sigan con el valor del token.
+    usuario._valores_token = {campo: valor for campo, valor in claims.items() if campo != pk}
+    usuario.grupos_token = frozenset(token[CLAIM_GRUPOS])
+    return usuario
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` que evita leer el usuario cuando el token trae sus roles."""
+
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_AUTH or CLAIM_GRUPOS not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if esta_revocado(user_id, validated_token["iat"]):
+            raise AuthenticationFailed("El token fue revocado", code="token_revoked")
+        return usuario_desde_claims(validated_token)
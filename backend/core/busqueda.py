@@ -0,0 +1,143 @@
+"""Búsqueda sin acentos ni mayúsculas para ``?search=``.
+
+``BusquedaFilter`` reemplaza a ``SearchFilter`` con los mismos
+``search_fields`` y el mismo parámetro. Cada campo se compara normalizado
+con ``sin_acentos(lower(campo))``: ``granulacion`` encuentra
+``Granulación``.
+
+* En Postgres ``sin_acentos`` envuelve a ``unaccent`` como función
+  ``IMMUTABLE`` y cada columna buscada tiene un índice GIN ``gin_trgm_ops``
+  sobre esa misma expresión (migraciones ``busqueda_trigramas``), que
+  atiende el ``LIKE '%...%'``. Además se aceptan palabras con errores de
+  tipeo (``word_similarity`` de ``pg_trgm``) y los resultados se ordenan
+  por relevancia salvo que se pida ``?ordering=``.
+* En SQLite ``sin_acentos`` se registra como función de Python en cada
+  conexión. No hay índice ni tolerancia a errores: se mantiene el orden
+  del listado.
+
+Los campos con prefijo de ``SearchFilter`` (``^``, ``=``, ``@``, ``$``)
+conservan el comportamiento original.
+"""
+
+import operator
+import unicodedata
+from functools import reduce
+
+from django.db import connections, models
+from django.db.backends.signals import connection_created
+from django.db.models.functions import Greatest, Lower
+from rest_framework import filters
+
+FUNCION = "sin_acentos"
+
+
+def normalizar(texto):
+    """Minúsculas y sin marcas diacríticas: ``"Compresión"`` -> ``"compresion"``."""
+
+    descompuesto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(caracter for caracter in descompuesto if not unicodedata.combining(caracter)).lower()
+
+
+class SinAcentos(models.Func):
+    """``sin_acentos(lower(expresión))``; la forma exacta de los índices de Postgres."""
+
+    function = FUNCION
+    output_field = models.TextField()
+
+    def __init__(self, expresion, **extra):
+        super().__init__(Lower(expresion), **extra)
+
+
+def _sin_acentos_sqlite(valor):
+    return None if valor is None else normalizar(valor)
+
+
+def registrar_funcion_sqlite(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        connection.connection.create_function(FUNCION, 1, _sin_acentos_sqlite, deterministic=True)
+
+
+connection_created.connect(registrar_funcion_sqlite, dispatch_uid="busqueda_sin_acentos_sqlite")
+
+
+class BusquedaFilter(filters.SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        campos = [str(campo) for campo in self.get_search_fields(view, request) or ()]
+        terminos = [normalizar(termino) for termino in self.get_search_terms(request)]
+        terminos = [termino for termino in terminos if termino]
+        if not campos or not terminos or any(campo[0] in self.lookup_prefixes for campo in campos):
+            return super().filter_queryset(request, queryset, view)
+
+        base = queryset
+        postgres = connections[queryset.db].vendor == "postgresql"
+        alias = {f"_busqueda_{indice}": SinAcentos(models.F(campo)) for indice, campo in enumerate(campos)}
+        queryset = queryset.alias(**alias)
+        condiciones = []
+        for termino in terminos:
+            opciones = [models.Q(**{f"{nombre}__contains": termino}) for nombre in alias]
+            if postgres:
+                from django.contrib.postgres.lookups import TrigramWordSimilar
+
+                opciones += [models.Q(TrigramWordSimilar(models.F(nombre), models.Value(termino))) for nombre in alias]
+            condiciones.append(reduce(operator.or_, opciones))
+        queryset = queryset.filter(reduce(operator.and_, condiciones))
+
+        if self.must_call_distinct(queryset, campos):
+            # Igual que ``SearchFilter``: sin duplicados por relaciones múltiples.
+            # La relevancia se calcula sobre los alias también en la consulta externa.
+            base = base.alias(**alias)
+            queryset = base.filter(models.Exists(queryset.filter(pk=models.OuterRef("pk"))))
+        if postgres:
+            queryset = self._por_relevancia(queryset, " ".join(terminos), list(alias))
+        return queryset
+
+    @staticmethod
+    def _por_relevancia(queryset, consulta, nombres):
+        similitudes = [
+            models.Func(
+                models.Value(consulta), models.F(nombre), function="word_similarity", output_field=models.FloatField()
+            )
+            for nombre in nombres
+        ]
+        relevancia = similitudes[0] if len(similitudes) == 1 else Greatest(*similitudes)
+        orden = queryset.query.order_by or queryset.model._meta.ordering
+        return queryset.annotate(_relevancia=relevancia).order_by("-_relevancia", *orden)
+
+
+# --- Migraciones (solo Postgres) --------------------------------------------
+
+SQL_FUNCION = f"""
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE OR REPLACE FUNCTION {FUNCION}(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$;
+"""
+
+
+def _nombre_indice(tabla, columna):
+    return f"{tabla}_{columna}_trgm"[:63]
+
+
+def crear_indices(schema_editor, modelo, campos):
+    """Índices GIN de trigramas sobre ``sin_acentos(lower(columna))`` de ``campos``."""
+
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    tabla = modelo._meta.db_table
+    for campo in campos:
+        columna = modelo._meta.get_field(campo).column
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(_nombre_indice(tabla, columna))} "
+            f"ON {schema_editor.quote_name(tabla)} "
+            f"USING gin ({FUNCION}(lower({schema_editor.quote_name(columna)})) gin_trgm_ops)"
+        )
+
+
+def borrar_indices(schema_editor, modelo, campos):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    tabla = modelo._meta.db_table
+    for campo in campos:
+        columna = modelo._meta.get_field(campo).column
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(_nombre_indice(tabla, columna))}")
@@ -0,0 +1,101 @@
+"""Acceso uniforme a los alias de caché y claves versionadas.
+
+Los alias se configuran en ``settings.CACHES`` (``default``, ``sessions``,
+``throttle``, ``catalog``, ``reports``). Para invalidar un conjunto de
+claves sin recorrerlas, cada espacio de nombres tiene un número de versión
+que forma parte de la clave: ``invalidar`` lo incrementa y las entradas
+anteriores quedan huérfanas hasta que expiran o son expulsadas.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+# Proxies perezosos: resuelven la instancia del hilo actual en cada uso.
+throttle_cache = ConnectionProxy(caches, "throttle")
+catalog_cache = ConnectionProxy(caches, "catalog")
+reports_cache = ConnectionProxy(caches, "reports")
+
+_SIN_VALOR = object()
+
+
+def cache_compartida():
+    """Si los alias de caché se comparten entre workers (todo backend salvo ``locmem``).
+
+    Las funciones que coordinan procesos con la caché (versiones, buffers,
+    revocaciones) deben degradar a la base cuando esto es falso.
+    """
+
+    return settings.CACHE_BACKEND != "locmem"
+
+
+def _clave_version(espacio):
+    return f"version:{espacio}"
+
+
+def _version_inicial():
+    # Basada en el reloj: si la versión se pierde (expulsión, reinicio), la
+    # nueva es mayor que cualquiera anterior y no revive entradas viejas.
+    return int(time.time() * 1000)
+
+
+def version_actual(espacio, alias="default"):
+    """Versión vigente de ``espacio``; la inicializa si no existe."""
+
+    cache = caches[alias]
+    clave = _clave_version(espacio)
+    version = cache.get(clave)
+    if version is None:
+        # ``add`` no pisa una versión creada en paralelo por otro worker.
+        cache.add(clave, _version_inicial(), timeout=None)
+        version = cache.get(clave)
+    return version
+
+
+def versiones(espacios, alias="default"):
+    """Versiones vigentes de varios ``espacios`` con una sola lectura de caché."""
+
+    claves = {espacio: _clave_version(espacio) for espacio in espacios}
+    leidas = caches[alias].get_many(list(claves.values()))
+    return [
+        leidas[clave] if clave in leidas else version_actual(espacio, alias) for espacio, clave in claves.items()
+    ]
+
+
+def invalidar(espacio, alias="default"):
+    """Incrementa la versión de ``espacio`` y devuelve la nueva."""
+
+    cache = caches[alias]
+    clave = _clave_version(espacio)
+    try:
+        return cache.incr(clave)
+    except ValueError:
+        cache.add(clave, _version_inicial(), timeout=None)
+        return cache.get(clave)
+
+
+def clave_versionada(espacio, *partes, alias="default"):
+    """Clave ``espacio:v<N>:parte1:parte2`` ligada a la versión vigente."""
+
+    sufijo = ":".join(str(parte) for parte in partes)
+    return f"{espacio}:v{version_actual(espacio, alias)}:{sufijo}"
+
+
+def obtener_o_calcular(espacio, *partes, calcular, alias="default", timeout=_SIN_VALOR):
+    """Devuelve el valor cacheado bajo la clave versionada o lo calcula y guarda.
+
+    Sin ``timeout`` se usa el TTL configurado para el alias.
+    """
+
+    cache = caches[alias]
+    clave = clave_versionada(espacio, *partes, alias=alias)
+    valor = cache.get(clave, _SIN_VALOR)
+    if valor is _SIN_VALOR:
+        valor = calcular()
+        if timeout is _SIN_VALOR:
+            cache.set(clave, valor)
+        else:
+            cache.set(clave, valor, timeout)
+    return valor
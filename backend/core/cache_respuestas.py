@@ -0,0 +1,181 @@
+"""Caché de respuestas completas para listados y detalles.
+
+``CacheRespuestasMixin`` guarda el cuerpo ya renderizado de ``list`` y
+``retrieve``, junto con sus variantes gzip y brotli, en el alias
+``catalog``. Un acierto responde sin consultar la base ni serializar. En
+``FormulaViewSet`` evita los prefetch anidados y en ``UbicacionViewSet`` el
+``Count`` de máquinas. El cuerpo comprimido sale con ``Content-Encoding``
+y ``CompressionMiddleware`` no lo vuelve a comprimir.
+
+La clave combina:
+
+* la vista, el esquema, el host y la ruta (la paginación arma enlaces
+  absolutos);
+* los parámetros de la query normalizados (claves y valores ordenados);
+* el formato negociado y el idioma activo;
+* el perfil de permisos: las clases de permiso de la acción y las marcas
+  de superusuario y staff del usuario;
+* la versión de datos de cada modelo de ``cache_models``.
+
+Las señales ``post_save``, ``post_delete`` y ``m2m_changed`` de esos
+modelos incrementan su versión al escribir y otra vez al confirmar. Así una
+escritura solo descarta las respuestas de las vistas que leen ese modelo.
+La primera invalidación evita que la propia transacción lea datos viejos.
+La segunda descarta lo que otro worker haya cacheado con el estado
+anterior mientras la transacción seguía abierta. Las escrituras que no
+emiten señales (``bulk_create``, ``QuerySet.update``) deben llamar a
+``invalidar_respuestas``, como hace la importación de catálogos.
+
+Los permisos se siguen verificando en cada petición: un acierto solo se
+sirve a quien ya pasó ``check_permissions``. Una vista cuyo contenido
+dependa de algo más del usuario (grupos, objetos propios) debe sumarlo en
+``get_cache_perfil``. La API navegable no se cachea porque incluye datos del
+usuario.
+"""
+
+import hashlib
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from backend.core.cache import invalidar, versiones
+from backend.core.middleware import codificaciones_disponibles, comprimible, comprimir, elegir_codificacion
+
+ALIAS = "catalog"
+_SIN_CODIFICAR = "identity"
+
+# Tabla intermedia de una M2M -> modelo que declara el campo.
+_duenos_m2m = {}
+
+
+def _espacio(modelo):
+    return f"respuestas:{modelo._meta.label_lower}"
+
+
+def invalidar_respuestas(modelo):
+    """Descarta las respuestas cacheadas de las vistas que leen ``modelo``."""
+
+    invalidar(_espacio(modelo), alias=ALIAS)
+
+
+def _invalidar_ahora_y_al_confirmar(modelo):
+    invalidar_respuestas(modelo)
+    transaction.on_commit(partial(invalidar_respuestas, modelo))
+
+
+def _al_cambiar(sender, **kwargs):
+    _invalidar_ahora_y_al_confirmar(sender)
+
+
+def _al_cambiar_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidar_ahora_y_al_confirmar(_duenos_m2m[sender])
+
+
+def registrar_modelo(modelo):
+    """Conecta las señales que invalidan las respuestas que leen ``modelo``."""
+
+    etiqueta = modelo._meta.label_lower
+    post_save.connect(_al_cambiar, sender=modelo, dispatch_uid=f"respuestas_{etiqueta}")
+    post_delete.connect(_al_cambiar, sender=modelo, dispatch_uid=f"respuestas_borrado_{etiqueta}")
+    for campo in modelo._meta.many_to_many:
+        intermedia = campo.remote_field.through
+        _duenos_m2m[intermedia] = modelo
+        m2m_changed.connect(
+            _al_cambiar_m2m, sender=intermedia, dispatch_uid=f"respuestas_m2m_{intermedia._meta.label_lower}"
+        )
+
+
+def _empaquetar(response):
+    cuerpos = {_SIN_CODIFICAR: response.content}
+    if comprimible(response):
+        for codificacion in codificaciones_disponibles():
+            comprimido = comprimir(response.content, codificacion)
+            if len(comprimido) < len(response.content):
+                cuerpos[codificacion] = comprimido
+    return {"estado": response.status_code, "cabeceras": list(response.items()), "cuerpos": cuerpos}
+
+
+def _desempaquetar(paquete, request):
+    cuerpos = paquete["cuerpos"]
+    codificacion = None
+    if len(cuerpos) > 1:
+        codificacion = elegir_codificacion(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    response = HttpResponse(cuerpos.get(codificacion, cuerpos[_SIN_CODIFICAR]), status=paquete["estado"])
+    for nombre, valor in paquete["cabeceras"]:
+        response[nombre] = valor
+    if len(cuerpos) > 1:
+        patch_vary_headers(response, ("Accept-Encoding",))
+    if codificacion in cuerpos:
+        response["Content-Encoding"] = codificacion
+    return response
+
+
+class CacheRespuestasMixin:
+    """Cachea ``list`` y ``retrieve`` con la versión de datos de ``cache_models``.
+
+    ``cache_models`` debe incluir cada modelo cuyos datos aparecen en la
+    respuesta: el principal, los anotados y los de relaciones serializadas.
+    """
+
+    cache_models = ()
+    _clave_pendiente = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for modelo in cls.cache_models:
+            registrar_modelo(modelo)
+
+    def get_cache_perfil(self, request):
+        """Parte de la clave que distingue a los usuarios (sin consultar la base)."""
+
+        clases = ",".join(sorted(type(permiso).__name__ for permiso in self.get_permissions()))
+        user = request.user
+        return f"{clases};su={int(user.is_superuser)};staff={int(user.is_staff)}"
+
+    def _clave_respuesta(self, request):
+        parametros = sorted((clave, sorted(valores)) for clave, valores in request.query_params.lists())
+        partes = (
+            request.scheme,
+            request.get_host(),
+            request.path,
+            parametros,
+            request.accepted_media_type,
+            translation.get_language(),
+            self.get_cache_perfil(request),
+        )
+        resumen = hashlib.sha256(repr(partes).encode()).hexdigest()
+        vigentes = versiones([_espacio(modelo) for modelo in self.cache_models], alias=ALIAS)
+        return f"respuestas:{type(self).__name__}:{'.'.join(map(str, vigentes))}:{resumen}"
+
+    def _con_cache(self, accion, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE_ENABLED or isinstance(request.accepted_renderer, BrowsableAPIRenderer):
+            return accion(request, *args, **kwargs)
+        # La clave se arma antes de leer la base: si una escritura confirma
+        # mientras se calcula la respuesta, esta queda bajo la versión vieja.
+        clave = self._clave_respuesta(request)
+        paquete = caches[ALIAS].get(clave)
+        if paquete is not None:
+            return _desempaquetar(paquete, request)
+        self._clave_pendiente = clave
+        return accion(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self._con_cache(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._con_cache(super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._clave_pendiente is not None and isinstance(response, Response) and response.status_code == 200:
+            caches[ALIAS].set(self._clave_pendiente, _empaquetar(response.render()))
+        return response
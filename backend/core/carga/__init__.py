@@ -0,0 +1,6 @@
+"""Generador de carga por escenarios contra un servidor local en ejecución.
+
+Los escenarios se declaran en JSON (``escenarios/*.json``): usuarios
+virtuales, rampa de llegada y una secuencia de pasos HTTP con variables.
+Se ejecutan con ``python manage.py loadtest <escenario>``.
+"""
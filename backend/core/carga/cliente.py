@@ -0,0 +1,155 @@
+"""Cliente HTTP/1.1 asíncrono mínimo sobre ``asyncio`` con keep-alive.
+
+Cada usuario virtual mantiene su propia conexión, como lo haría un
+navegador. Solo se admiten destinos en loopback o redes privadas.
+"""
+
+import asyncio
+import ipaddress
+import json
+import socket
+import ssl
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class DestinoNoPermitido(ValueError):
+    """El destino de la carga no es una dirección local."""
+
+
+@dataclass
+class Respuesta:
+    estado: int
+    cabeceras: Dict[str, str]
+    cuerpo: bytes
+
+    def json(self):
+        try:
+            return json.loads(self.cuerpo or b"null")
+        except ValueError:
+            return None
+
+
+@dataclass(frozen=True)
+class Destino:
+    esquema: str
+    host: str
+    puerto: int
+
+    @property
+    def tls(self):
+        return self.esquema == "https"
+
+    @property
+    def cabecera_host(self):
+        por_defecto = 443 if self.tls else 80
+        return self.host if self.puerto == por_defecto else f"{self.host}:{self.puerto}"
+
+
+def validar_destino(url_base) -> Destino:
+    """Interpreta ``url_base`` y exige que resuelva solo a direcciones locales."""
+
+    partes = urlsplit(url_base)
+    if partes.scheme not in ("http", "https") or not partes.hostname:
+        raise DestinoNoPermitido(f"URL inválida: {url_base!r}")
+    puerto = partes.port or (443 if partes.scheme == "https" else 80)
+    try:
+        direcciones = {info[4][0] for info in socket.getaddrinfo(partes.hostname, puerto)}
+    except socket.gaierror as exc:
+        raise DestinoNoPermitido(f"No se pudo resolver {partes.hostname}: {exc}") from exc
+    for direccion in direcciones:
+        ip = ipaddress.ip_address(direccion.split("%")[0])
+        if not (ip.is_loopback or ip.is_private):
+            raise DestinoNoPermitido(
+                f"{partes.hostname} resuelve a {ip}, que no es loopback ni red privada"
+            )
+    return Destino(partes.scheme, partes.hostname, puerto)
+
+
+class ConexionHTTP:
+    """Conexión persistente a ``destino``; se reabre si el servidor la cierra."""
+
+    def __init__(self, destino: Destino, timeout=30.0):
+        self.destino = destino
+        self.timeout = timeout
+        self._lector: Optional[asyncio.StreamReader] = None
+        self._escritor: Optional[asyncio.StreamWriter] = None
+
+    async def _abrir(self):
+        contexto = ssl.create_default_context() if self.destino.tls else None
+        self._lector, self._escritor = await asyncio.wait_for(
+            asyncio.open_connection(self.destino.host, self.destino.puerto, ssl=contexto),
+            self.timeout,
+        )
+
+    async def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            try:
+                await self._escritor.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._lector = self._escritor = None
+
+    async def solicitar(self, metodo, ruta, cabeceras=None, cuerpo=None) -> Respuesta:
+        datos = b""
+        cabeceras = dict(cabeceras or {})
+        if cuerpo is not None:
+            datos = json.dumps(cuerpo).encode()
+            cabeceras.setdefault("Content-Type", "application/json")
+        cabeceras.setdefault("Host", self.destino.cabecera_host)
+        cabeceras.setdefault("Accept", "application/json")
+        cabeceras["Content-Length"] = str(len(datos))
+
+        solicitud = f"{metodo} {ruta} HTTP/1.1\r\n"
+        solicitud += "".join(f"{nombre}: {valor}\r\n" for nombre, valor in cabeceras.items())
+        paquete = solicitud.encode("latin-1") + b"\r\n" + datos
+
+        # Una conexión reutilizada puede haber sido cerrada por el servidor.
+        for intento in range(2):
+            reutilizada = self._escritor is not None
+            if not reutilizada:
+                await self._abrir()
+            try:
+                self._escritor.write(paquete)
+                await self._escritor.drain()
+                return await asyncio.wait_for(self._leer_respuesta(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.cerrar()
+                if not reutilizada or intento:
+                    raise
+        raise ConnectionError("No se pudo completar la petición")
+
+    async def _leer_respuesta(self) -> Respuesta:
+        linea = await self._lector.readuntil(b"\r\n")
+        estado = int(linea.split(b" ", 2)[1])
+        cabeceras = {}
+        while True:
+            linea = await self._lector.readuntil(b"\r\n")
+            if linea == b"\r\n":
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+        if cabeceras.get("transfer-encoding", "").lower() == "chunked":
+            partes = []
+            while True:
+                tamano = int((await self._lector.readuntil(b"\r\n")).split(b";")[0], 16)
+                if tamano == 0:
+                    await self._lector.readuntil(b"\r\n")
+                    break
+                partes.append(await self._lector.readexactly(tamano))
+                await self._lector.readexactly(2)
+            cuerpo = b"".join(partes)
+        elif "content-length" in cabeceras:
+            cuerpo = await self._lector.readexactly(int(cabeceras["content-length"]))
+        elif estado in (204, 304) or estado < 200:
+            cuerpo = b""
+        else:
+            cuerpo = await self._lector.read()
+            cabeceras["connection"] = "close"
+
+        if cabeceras.get("connection", "").lower() == "close":
+            await self.cerrar()
+        return Respuesta(estado, cabeceras, cuerpo)
@@ -0,0 +1,235 @@
+"""Ejecución concurrente de un escenario y armado del reporte."""
+
+import asyncio
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from backend.core.carga.cliente import ConexionHTTP, Destino
+from backend.core.carga.escenarios import Escenario, Paso, Variables, extraer, resolver
+from backend.core.services.benchmark import percentil
+
+_DB_TIMING = re.compile(r"db;dur=([\d.]+)")
+# Mensajes de error de la base que delatan espera o conflicto por bloqueos.
+_BLOQUEOS = re.compile(
+    rb"database is locked|deadlock detected|could not obtain lock|lock timeout|"
+    rb"could not serialize access|canceling statement due to lock timeout",
+    re.IGNORECASE,
+)
+# Un p95 de base varias veces mayor a la mediana en escrituras suele ser espera por bloqueos.
+RELACION_COLA_DB = 4.0
+MINIMO_P95_DB_MS = 50.0
+
+
+@dataclass
+class EstadisticaPaso:
+    nombre: str
+    metodo: str
+    ruta: str
+    escritura: bool
+    latencias: List[float] = field(default_factory=list)
+    db_ms: List[float] = field(default_factory=list)
+    estados: Counter = field(default_factory=Counter)
+    exitosas: int = 0
+    bytes: int = 0
+    errores_red: int = 0
+    errores_bloqueo: int = 0
+    reintentar_tras: List[float] = field(default_factory=list)
+
+    def resumen(self, duracion):
+        peticiones = len(self.latencias) + self.errores_red
+        milisegundos = [valor * 1000 for valor in self.latencias]
+        datos = {
+            "nombre": self.nombre,
+            "metodo": self.metodo,
+            "ruta": self.ruta,
+            "peticiones": peticiones,
+            "exitosas": self.exitosas,
+            "estados": {str(estado): cantidad for estado, cantidad in sorted(self.estados.items())},
+            "throughput_rps": round(peticiones / duracion, 2) if duracion else None,
+            "latencia_ms": None,
+            "db_ms": None,
+            "bytes": self.bytes,
+            "limitadas_429": self.estados.get(429, 0),
+            "retry_after_max_s": max(self.reintentar_tras) if self.reintentar_tras else None,
+            "errores_red": self.errores_red,
+            "errores_bloqueo": self.errores_bloqueo,
+        }
+        if milisegundos:
+            datos["latencia_ms"] = {
+                "p50": round(percentil(milisegundos, 50), 2),
+                "p95": round(percentil(milisegundos, 95), 2),
+                "p99": round(percentil(milisegundos, 99), 2),
+                "max": round(max(milisegundos), 2),
+            }
+        if self.db_ms:
+            datos["db_ms"] = {
+                "p50": round(percentil(self.db_ms, 50), 2),
+                "p95": round(percentil(self.db_ms, 95), 2),
+            }
+        return datos
+
+
+class Ejecucion:
+    """Corre ``escenario`` contra ``destino`` con usuarios virtuales concurrentes.
+
+    Con ``ips_simuladas`` cada usuario envía su propio ``X-Forwarded-For``,
+    como ocurre detrás del proxy de planta; sin él, todos comparten la IP
+    de la máquina que genera la carga y el throttle de login los agrupa.
+    """
+
+    def __init__(self, escenario: Escenario, destino: Destino, ips_simuladas=False, semilla=0, timeout=30.0):
+        self.escenario = escenario
+        self.destino = destino
+        self.ips_simuladas = ips_simuladas
+        self.timeout = timeout
+        self.rnd = random.Random(semilla)
+        self.estadisticas: Dict[str, EstadisticaPaso] = {}
+        self.completos = 0
+        self.abortados = Counter()
+
+    def ejecutar(self):
+        return asyncio.run(self._ejecutar())
+
+    async def _ejecutar(self):
+        semaforo = asyncio.Semaphore(max(1, self.escenario.concurrencia))
+        inicio = time.perf_counter()
+        usuarios = self.escenario.usuarios
+        intervalo = self.escenario.rampa_segundos / usuarios if usuarios else 0
+        await asyncio.gather(
+            *(self._usuario(indice, indice * intervalo, semaforo) for indice in range(usuarios))
+        )
+        return self._reporte(time.perf_counter() - inicio)
+
+    async def _usuario(self, indice, demora, semaforo):
+        await asyncio.sleep(demora)
+        async with semaforo:
+            variables = Variables(self.escenario.variables)
+            variables["n"] = indice
+            variables.update(
+                {clave: resolver(valor, variables) for clave, valor in self.escenario.credenciales.items()}
+            )
+            cabeceras = {}
+            if self.ips_simuladas:
+                cabeceras["X-Forwarded-For"] = f"10.{(indice >> 16) & 255}.{(indice >> 8) & 255}.{indice & 255}"
+            conexion = ConexionHTTP(self.destino, timeout=self.timeout)
+            try:
+                for paso in self.escenario.pasos:
+                    for _ in range(paso.repetir):
+                        if not await self._paso(paso, conexion, variables, cabeceras):
+                            self.abortados[paso.nombre] += 1
+                            return
+                        if paso.pausa[1]:
+                            await asyncio.sleep(self.rnd.uniform(*paso.pausa))
+                self.completos += 1
+            finally:
+                await conexion.cerrar()
+
+    async def _paso(self, paso: Paso, conexion, variables, cabeceras_base):
+        """Ejecuta un paso; devuelve ``False`` si el usuario no puede continuar."""
+
+        estadistica = self.estadisticas.setdefault(
+            paso.nombre, EstadisticaPaso(paso.nombre, paso.metodo, paso.ruta, paso.escritura)
+        )
+        try:
+            ruta = resolver(paso.ruta, variables)
+            cuerpo = resolver(paso.cuerpo, variables)
+        except KeyError:
+            return False
+
+        cabeceras = dict(cabeceras_base)
+        if paso.autenticado and "token" in variables:
+            cabeceras["Authorization"] = f"Bearer {variables['token']}"
+
+        inicio = time.perf_counter()
+        try:
+            respuesta = await conexion.solicitar(paso.metodo, ruta, cabeceras, cuerpo)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            estadistica.errores_red += 1
+            return False
+        estadistica.latencias.append(time.perf_counter() - inicio)
+        estadistica.estados[respuesta.estado] += 1
+        estadistica.bytes += len(respuesta.cuerpo)
+
+        timing = _DB_TIMING.search(respuesta.cabeceras.get("server-timing", ""))
+        if timing:
+            estadistica.db_ms.append(float(timing.group(1)))
+        if respuesta.estado == 429 and respuesta.cabeceras.get("retry-after", "").isdigit():
+            estadistica.reintentar_tras.append(float(respuesta.cabeceras["retry-after"]))
+        if respuesta.estado >= 500 and _BLOQUEOS.search(respuesta.cuerpo):
+            estadistica.errores_bloqueo += 1
+
+        if not paso.es_exitoso(respuesta.estado):
+            # Sin lo que el paso debía guardar, los siguientes no tienen sentido.
+            return not (paso.guardar or paso.elegir)
+        estadistica.exitosas += 1
+
+        datos = respuesta.json()
+        try:
+            for variable, ruta_dato in paso.guardar.items():
+                variables[variable] = extraer(datos, ruta_dato)
+            if paso.elegir:
+                opciones = extraer(datos, paso.elegir["desde"])
+                if not opciones:
+                    return False
+                elegido = self.rnd.choice(opciones)
+                for variable, ruta_dato in paso.elegir["guardar"].items():
+                    variables[variable] = extraer(elegido, ruta_dato)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return False
+        return True
+
+    def _reporte(self, duracion):
+        pasos = [estadistica.resumen(duracion) for estadistica in self.estadisticas.values()]
+        total = sum(paso["peticiones"] for paso in pasos)
+        return {
+            "escenario": self.escenario.nombre,
+            "destino": f"{self.destino.esquema}://{self.destino.cabecera_host}",
+            "usuarios": self.escenario.usuarios,
+            "concurrencia": self.escenario.concurrencia,
+            "rampa_segundos": self.escenario.rampa_segundos,
+            "ips_simuladas": self.ips_simuladas,
+            "duracion_s": round(duracion, 3),
+            "peticiones": total,
+            "throughput_rps": round(total / duracion, 2) if duracion else None,
+            "usuarios_completos": self.completos,
+            "usuarios_abortados": dict(self.abortados),
+            "pasos": pasos,
+            "alertas": self._alertas(),
+        }
+
+    def _alertas(self):
+        alertas = []
+        for estadistica in self.estadisticas.values():
+            limitadas = estadistica.estados.get(429, 0)
+            if limitadas:
+                detalle = f"{limitadas} respuestas 429"
+                if "/auth/login" in estadistica.ruta:
+                    detalle += " de LoginRateThrottle (scope 'login')"
+                    if not self.ips_simuladas:
+                        detalle += "; todos los usuarios comparten IP, pruebe --simulate-ips"
+                alertas.append({"tipo": "throttling", "paso": estadistica.nombre, "detalle": detalle})
+
+            if estadistica.errores_bloqueo:
+                alertas.append(
+                    {
+                        "tipo": "contencion",
+                        "paso": estadistica.nombre,
+                        "detalle": f"{estadistica.errores_bloqueo} errores 5xx por bloqueos en la base",
+                    }
+                )
+            elif estadistica.escritura and len(estadistica.db_ms) >= 5:
+                p50 = percentil(estadistica.db_ms, 50)
+                p95 = percentil(estadistica.db_ms, 95)
+                if p95 >= MINIMO_P95_DB_MS and p95 >= RELACION_COLA_DB * max(p50, 0.1):
+                    alertas.append(
+                        {
+                            "tipo": "contencion",
+                            "paso": estadistica.nombre,
+                            "detalle": f"tiempo de base p95 {p95:.0f} ms vs p50 {p50:.0f} ms en escrituras",
+                        }
+                    )
+        return alertas
@@ -0,0 +1,196 @@
+"""Definición declarativa de escenarios de carga.
+
+Un escenario es un JSON con esta forma::
+
+    {
+      "nombre": "cambio_de_turno",
+      "usuarios": 200,            # usuarios virtuales
+      "concurrencia": 200,        # usuarios activos simultáneos como máximo
+      "rampa_segundos": 180,      # las llegadas se reparten en esta ventana
+      "credenciales": {"usuario": "bench-op-{n:04d}", "password": "bench-operario"},
+      "pasos": [
+        {"nombre": "login", "metodo": "POST", "ruta": "/api/auth/login/",
+         "autenticado": false,
+         "cuerpo": {"username": "{usuario}", "password": "{password}"},
+         "guardar": {"token": "access"}},
+        {"nombre": "maquinas", "metodo": "GET", "ruta": "/api/catalogos/maquinas/",
+         "elegir": {"desde": "results", "guardar": {"maquina": "id"}}},
+        ...
+      ]
+    }
+
+Las cadenas admiten ``{variable}`` con el formato de ``str.format``. Además
+de lo guardado por pasos previos están ``n`` (índice del usuario),
+``usuario``, ``password``, ``ahora`` y ``hace_<N><s|m|h>`` (marcas ISO en
+el pasado). Una cadena que es solo ``{variable}`` conserva el tipo original.
+"""
+
+import json
+import re
+import string
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.utils import timezone
+
+DIRECTORIO_ESCENARIOS = Path(__file__).resolve().parent / "escenarios"
+METODOS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+_SOLO_VARIABLE = re.compile(r"^\{(\w+)\}$")
+_HACE = re.compile(r"^hace_(\d+)([smh])$")
+_UNIDADES = {"s": "seconds", "m": "minutes", "h": "hours"}
+
+
+class EscenarioInvalido(ValueError):
+    """El JSON del escenario no cumple el formato esperado."""
+
+
+@dataclass
+class Paso:
+    nombre: str
+    metodo: str
+    ruta: str
+    cuerpo: Any = None
+    autenticado: bool = True
+    guardar: Dict[str, str] = field(default_factory=dict)
+    elegir: Optional[Dict[str, Any]] = None
+    repetir: int = 1
+    pausa: Tuple[float, float] = (0.0, 0.0)
+    esperado: List[int] = field(default_factory=list)
+
+    @property
+    def escritura(self):
+        return self.metodo != "GET"
+
+    def es_exitoso(self, estado):
+        return estado in self.esperado if self.esperado else 200 <= estado < 300
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    descripcion: str
+    usuarios: int
+    concurrencia: int
+    rampa_segundos: float
+    credenciales: Dict[str, str]
+    pasos: List[Paso]
+    variables: Dict[str, Any] = field(default_factory=dict)
+
+    def nombres_de_usuario(self):
+        """``credenciales["usuario"]`` resuelto para cada usuario virtual."""
+
+        plantilla = self.credenciales.get("usuario")
+        if plantilla is None:
+            return []
+        return [resolver(plantilla, Variables({**self.variables, "n": indice})) for indice in range(self.usuarios)]
+
+
+def disponibles():
+    return sorted(ruta.stem for ruta in DIRECTORIO_ESCENARIOS.glob("*.json"))
+
+
+def cargar(nombre_o_ruta) -> Escenario:
+    """Carga un escenario por nombre (de ``escenarios/``) o por ruta de archivo."""
+
+    ruta = Path(nombre_o_ruta)
+    if not ruta.suffix:
+        ruta = DIRECTORIO_ESCENARIOS / f"{nombre_o_ruta}.json"
+    if not ruta.exists():
+        raise EscenarioInvalido(
+            f"No existe el escenario {nombre_o_ruta!r}. Disponibles: {', '.join(disponibles())}"
+        )
+    try:
+        datos = json.loads(ruta.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise EscenarioInvalido(f"{ruta.name}: JSON inválido ({exc})") from exc
+    return desde_dict(datos)
+
+
+def desde_dict(datos) -> Escenario:
+    pasos = []
+    for indice, paso in enumerate(datos.get("pasos") or []):
+        metodo = str(paso.get("metodo", "GET")).upper()
+        if metodo not in METODOS:
+            raise EscenarioInvalido(f"Paso {indice}: método no soportado {metodo!r}")
+        if not paso.get("ruta", "").startswith("/"):
+            raise EscenarioInvalido(f"Paso {indice}: la ruta debe comenzar con '/'")
+        elegir = paso.get("elegir")
+        if elegir is not None and not {"desde", "guardar"} <= set(elegir):
+            raise EscenarioInvalido(f"Paso {indice}: 'elegir' requiere 'desde' y 'guardar'")
+        pausa = paso.get("pausa_segundos", 0)
+        pausa = tuple(pausa) if isinstance(pausa, (list, tuple)) else (pausa, pausa)
+        pasos.append(
+            Paso(
+                nombre=paso.get("nombre") or f"paso_{indice}",
+                metodo=metodo,
+                ruta=paso["ruta"],
+                cuerpo=paso.get("cuerpo"),
+                autenticado=paso.get("autenticado", True),
+                guardar=paso.get("guardar") or {},
+                elegir=elegir,
+                repetir=int(paso.get("repetir", 1)),
+                pausa=(float(pausa[0]), float(pausa[-1])),
+                esperado=list(paso.get("esperado") or []),
+            )
+        )
+    if not pasos:
+        raise EscenarioInvalido("El escenario no define pasos")
+
+    usuarios = int(datos.get("usuarios", 1))
+    return Escenario(
+        nombre=datos.get("nombre", "escenario"),
+        descripcion=datos.get("descripcion", ""),
+        usuarios=usuarios,
+        concurrencia=int(datos.get("concurrencia", usuarios)),
+        rampa_segundos=float(datos.get("rampa_segundos", 0)),
+        credenciales=datos.get("credenciales") or {},
+        pasos=pasos,
+        variables=datos.get("variables") or {},
+    )
+
+
+class Variables(dict):
+    """Variables de un usuario virtual, con marcas de tiempo calculadas al vuelo."""
+
+    def __missing__(self, clave):
+        if clave == "ahora":
+            return timezone.now().isoformat()
+        coincidencia = _HACE.match(clave)
+        if coincidencia:
+            cantidad, unidad = coincidencia.groups()
+            return (timezone.now() - timedelta(**{_UNIDADES[unidad]: int(cantidad)})).isoformat()
+        raise KeyError(clave)
+
+
+_formateador = string.Formatter()
+
+
+def resolver(valor, variables: Variables):
+    """Sustituye variables en cadenas, listas y diccionarios anidados."""
+
+    if isinstance(valor, str):
+        solo = _SOLO_VARIABLE.match(valor)
+        if solo:
+            return variables[solo.group(1)]
+        return _formateador.vformat(valor, (), variables)
+    if isinstance(valor, list):
+        return [resolver(item, variables) for item in valor]
+    if isinstance(valor, dict):
+        return {clave: resolver(item, variables) for clave, item in valor.items()}
+    return valor
+
+
+def extraer(datos, ruta):
+    """Navega ``datos`` con una ruta de puntos (``results.0.id``)."""
+
+    actual = datos
+    for parte in str(ruta).split("."):
+        if isinstance(actual, list):
+            actual = actual[int(parte)]
+        elif isinstance(actual, dict):
+            actual = actual[parte]
+        else:
+            raise KeyError(ruta)
+    return actual
@@ -0,0 +1,101 @@
+"""Chequeos de configuración (``manage.py check`` y arranque del servidor)."""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+from backend.core.cache import cache_compartida
+
+_SUGERENCIA = "Configure CACHE_BACKEND=redis, file o db."
+# Lo que con una caché por proceso solo se coordina dentro de cada worker.
+_DEGRADADAS = (
+    "los límites de tasa",
+    "los reintentos con Idempotency-Key",
+    "la lista negra de tokens (se consulta la base en cada refresco)",
+    "el buffer de logins (last_login se escribe en cada login)",
+    "las FKs a catálogos en memoria (se consulta la base en cada validación)",
+    "la caché de respuestas de catálogos (desactivada)",
+)
+
+
+@register(Tags.caches)
+def buffer_de_logins(app_configs, **kwargs):
+    """El buffer de ``last_login`` necesita caché compartida y retención mayor al intervalo."""
+
+    intervalo = settings.LOGIN_ACTIVITY_FLUSH_SECONDS
+    if intervalo <= 0:
+        return []
+    problemas = []
+    if not cache_compartida():
+        problemas.append(
+            Error(
+                "LOGIN_ACTIVITY_FLUSH_SECONDS requiere una caché compartida entre workers.",
+                hint=(
+                    "La tarea de vaciado corre en otro proceso y no vería los logins anotados. "
+                    f"Use LOGIN_ACTIVITY_FLUSH_SECONDS=0 o {_SUGERENCIA}"
+                ),
+                obj="settings.LOGIN_ACTIVITY_FLUSH_SECONDS",
+                id="core.E002",
+            )
+        )
+    if settings.LOGIN_ACTIVITY_RETENTION_SECONDS <= intervalo:
+        problemas.append(
+            Error(
+                "LOGIN_ACTIVITY_RETENTION_SECONDS debe superar a LOGIN_ACTIVITY_FLUSH_SECONDS.",
+                hint="Los logins anotados expirarían antes del vaciado periódico y se perderían.",
+                obj="settings.LOGIN_ACTIVITY_RETENTION_SECONDS",
+                id="core.E003",
+            )
+        )
+    return problemas
+
+
+@register(Tags.caches)
+def cache_de_respuestas(app_configs, **kwargs):
+    """La caché de respuestas solo se invalida en todos los workers con caché compartida."""
+
+    if not settings.RESPONSE_CACHE_ENABLED or cache_compartida():
+        return []
+    return [
+        Error(
+            "RESPONSE_CACHE_ENABLED requiere una caché compartida entre workers.",
+            hint=(
+                "Cada worker seguiría sirviendo las respuestas que cacheó antes de una escritura en otro. "
+                f"Use RESPONSE_CACHE_ENABLED=false o {_SUGERENCIA}"
+            ),
+            obj="settings.RESPONSE_CACHE_ENABLED",
+            id="core.E004",
+        )
+    ]
+
+
+@register(Tags.security, Tags.caches)
+def cache_compartida_requerida(app_configs, **kwargs):
+    """Funciones que necesitan que la caché llegue a todos los workers.
+
+    Con ``CACHE_BACKEND=locmem`` cada proceso tiene su propia caché: lo que
+    se activa explícitamente y depende de ella es un error; el resto degrada
+    solo y se advierte fuera de ``DEBUG``.
+    """
+
+    if cache_compartida():
+        return []
+    problemas = []
+    if settings.JWT_STATELESS_AUTH:
+        problemas.append(
+            Error(
+                "JWT_STATELESS_AUTH requiere una caché compartida entre workers.",
+                hint=f"Las revocaciones de tokens no llegarían a los demás workers. {_SUGERENCIA}",
+                obj="settings.JWT_STATELESS_AUTH",
+                id="core.E001",
+            )
+        )
+    if not settings.DEBUG:
+        problemas.append(
+            Warning(
+                "CACHE_BACKEND=locmem fuera de DEBUG: cada worker tiene su propia caché.",
+                hint=f"Afecta a {'; '.join(_DEGRADADAS)}. {_SUGERENCIA}",
+                obj="settings.CACHE_BACKEND",
+                id="core.W001",
+            )
+        )
+    return problemas
@@ -0,0 +1,205 @@
+"""Formato columnar compacto para listados grandes.
+
+Con ``?format=columnar`` (o ``Accept: application/vnd.siprosa.columnar+json``)
+los listados devuelven::
+
+    {"count": ..., "next": ..., "previous": ...,
+     "results": {"columns": ["id", "estado", ...],
+                 "rows": [[1, 0, ...], ...],
+                 "dictionaries": {"estado": ["EN_PROCESO", "FINALIZADO"]}}}
+
+Las claves no se repiten por fila y las columnas de texto con valores
+repetidos se codifican como índices sobre ``dictionaries``. Las filas salen
+de ``values_list``: no se instancian modelos ni serializers.
+"""
+
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend.pagination import ColumnarPageNumberPagination
+
+FORMATO = "columnar"
+
+
+def _fecha_hora(valor):
+    if valor is None:
+        return None
+    if timezone.is_aware(valor):
+        valor = timezone.localtime(valor)
+    texto = valor.isoformat()
+    return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+
+
+def _iso(valor):
+    return None if valor is None else valor.isoformat()
+
+
+def _decimal(valor):
+    return None if valor is None else str(valor)
+
+
+def _conversor(campo):
+    """Representación igual a la del serializer para los tipos que difieren de JSON."""
+
+    if isinstance(campo, models.DateTimeField):
+        return _fecha_hora
+    if isinstance(campo, (models.DateField, models.TimeField)):
+        return _iso
+    if isinstance(campo, models.DecimalField):
+        return _decimal
+    if isinstance(campo, models.FileField):
+        return lambda valor: campo.storage.url(valor) if valor else None
+    return None
+
+
+def _ruta_columna(modelo, partes):
+    """Ruta de ``values_list`` para ``source`` si cada tramo es una columna o FK."""
+
+    for indice, parte in enumerate(partes):
+        try:
+            campo = modelo._meta.get_field(parte)
+        except FieldDoesNotExist:
+            return None
+        if not campo.concrete or campo.many_to_many:
+            return None
+        if indice < len(partes) - 1:
+            if not campo.is_relation:
+                return None
+            modelo = campo.related_model
+    return "__".join(partes)
+
+
+def codificar(columnas, filas):
+    """Arma ``{"columns", "rows", "dictionaries"}`` con las filas ya convertidas.
+
+    Una columna de texto se codifica como diccionario cuando tiene valores
+    repetidos: cada celda pasa a ser el índice del valor en la lista.
+    """
+
+    filas = [list(fila) for fila in filas]
+    diccionarios = {}
+    for posicion, columna in enumerate(columnas):
+        valores = [fila[posicion] for fila in filas if fila[posicion] is not None]
+        if not valores or not all(isinstance(valor, str) for valor in valores):
+            continue
+        distintos = list(dict.fromkeys(valores))
+        if len(distintos) == len(valores):
+            continue
+        indices = {valor: indice for indice, valor in enumerate(distintos)}
+        for fila in filas:
+            if fila[posicion] is not None:
+                fila[posicion] = indices[fila[posicion]]
+        diccionarios[columna] = distintos
+    return {"columns": list(columnas), "rows": filas, "dictionaries": diccionarios}
+
+
+def codificar_dicts(datos):
+    """Versión columnar de una lista de ``dict`` ya serializados."""
+
+    columnas = list(dict.fromkeys(clave for fila in datos for clave in fila))
+    return codificar(columnas, ([fila.get(columna) for columna in columnas] for fila in datos))
+
+
+class ColumnarRenderer(BaseRenderer):
+    """Renderer de ``ColumnarMixin``; a otras vistas les compacta las listas de objetos."""
+
+    media_type = "application/vnd.siprosa.columnar+json"
+    format = FORMATO
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {**data, "results": codificar_dicts(data["results"])}
+        elif isinstance(data, list) and all(isinstance(fila, dict) for fila in data):
+            data = codificar_dicts(data)
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class ColumnarMixin:
+    """Agrega el formato columnar al listado de un ViewSet.
+
+    ``columnar_fields`` es una lista de ``(columna, ruta values_list)``; por
+    defecto se toman los campos del serializer cuyo ``source`` es una columna
+    (también a través de FKs, como ``ubicacion.nombre``) o una anotación del
+    queryset. Las FKs salen como id, igual que en el serializer; los campos
+    calculados (``get_*_display``, métodos) no se incluyen.
+    """
+
+    columnar_fields = None
+
+    def get_renderers(self):
+        return [*super().get_renderers(), ColumnarRenderer()]
+
+    def es_columnar(self):
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return isinstance(renderer, ColumnarRenderer)
+
+    @property
+    def paginator(self):
+        if self.es_columnar() and self.pagination_class is not None:
+            if not isinstance(getattr(self, "_paginator", None), ColumnarPageNumberPagination):
+                self._paginator = ColumnarPageNumberPagination()
+            return self._paginator
+        return super().paginator
+
+    def get_columnar_fields(self, queryset):
+        if self.columnar_fields is not None:
+            return list(self.columnar_fields)
+        anotaciones = queryset.query.annotations
+        columnas = []
+        for nombre, campo in self.get_serializer().fields.items():
+            if campo.write_only or campo.source == "*":
+                continue
+            if campo.source in anotaciones:
+                columnas.append((nombre, campo.source))
+                continue
+            ruta = _ruta_columna(queryset.model, campo.source.split("."))
+            if ruta is not None:
+                columnas.append((nombre, ruta))
+        return columnas
+
+    def _conversores(self, queryset, rutas):
+        conversores = []
+        for ruta in rutas:
+            modelo = queryset.model
+            campo = None
+            for parte in ruta.split("__"):
+                try:
+                    campo = modelo._meta.get_field(parte)
+                except FieldDoesNotExist:
+                    campo = None
+                    break
+                modelo = campo.related_model or modelo
+            # Una FK al final de la ruta se lee como id: no necesita conversión.
+            conversores.append(_conversor(campo) if campo is not None and not campo.is_relation else None)
+        return conversores
+
+    def list(self, request, *args, **kwargs):
+        if not self.es_columnar():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columnas = self.get_columnar_fields(queryset)
+        rutas = [ruta for _, ruta in columnas]
+        # Las proyecciones no usan los ``select_related``/``prefetch_related`` del listado.
+        filas = queryset.select_related(None).prefetch_related(None).values_list(*rutas)
+        pagina = self.paginate_queryset(filas)
+        conversores = self._conversores(queryset, rutas)
+        convertidas = (
+            [conversor(valor) if conversor else valor for conversor, valor in zip(conversores, fila)]
+            for fila in (pagina if pagina is not None else filas)
+        )
+        datos = codificar([nombre for nombre, _ in columnas], convertidas)
+        if pagina is not None:
+            respuesta = self.get_paginated_response([])
+            respuesta.data["results"] = datos
+            return respuesta
+        return Response(datos)
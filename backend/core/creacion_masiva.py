@@ -0,0 +1,127 @@
+"""Alta masiva de registros en una sola petición.
+
+Las tablets de planta acumulan registros sin conexión y al reconectar los
+envían todos juntos a ``POST <listado>/bulk/``. Cada elemento se valida con
+el mismo serializer del alta individual, pero las FKs se resuelven con un
+``in_bulk`` por relación en vez de una consulta por elemento, y los válidos
+se insertan con ``bulk_create`` en una única transacción.
+
+Los elementos inválidos no frenan al resto: la respuesta trae un resultado
+por índice para que el cliente descarte de su cola solo lo confirmado.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import as_serializer_error
+
+
+def _desde_mapa(campo, mapa, dato):
+    # Mismos errores que ``PrimaryKeyRelatedField.to_internal_value``.
+    if isinstance(dato, bool):
+        campo.fail("incorrect_type", data_type=type(dato).__name__)
+    try:
+        pk = campo.get_queryset().model._meta.pk.to_python(dato)
+    except (DjangoValidationError, TypeError):
+        campo.fail("incorrect_type", data_type=type(dato).__name__)
+    objeto = mapa.get(pk)
+    if objeto is None:
+        campo.fail("does_not_exist", pk_value=dato)
+    return objeto
+
+
+def precargar_relaciones(serializer, elementos):
+    """Resuelve de una vez las FKs por pk que traen ``elementos``.
+
+    Reemplaza la búsqueda de cada ``PrimaryKeyRelatedField`` escribible de
+    ``serializer`` por un mapa obtenido con un único ``in_bulk``.
+    """
+
+    for nombre, campo in serializer.fields.items():
+        if campo.read_only or not isinstance(campo, PrimaryKeyRelatedField):
+            continue
+        pks = set()
+        for elemento in elementos:
+            valor = elemento.get(nombre) if isinstance(elemento, dict) else None
+            if valor in (None, "") or isinstance(valor, bool):
+                continue
+            try:
+                pks.add(campo.get_queryset().model._meta.pk.to_python(valor))
+            except (DjangoValidationError, TypeError):
+                continue
+        mapa = campo.get_queryset().in_bulk(pks) if pks else {}
+        campo.to_internal_value = partial(_desde_mapa, campo, mapa)
+
+
+class CreacionMasivaMixin:
+    """Agrega ``POST <listado>/bulk/`` con una lista de elementos.
+
+    ``get_bulk_create_kwargs`` devuelve los valores que el alta individual
+    completa en ``perform_create`` o en el serializer (por ejemplo, el
+    usuario que registra). Antes de insertar se ejecuta ``clean()`` del
+    modelo, que ``bulk_create`` no llama.
+    """
+
+    def get_bulk_create_kwargs(self):
+        return {}
+
+    def _validar_elemento(self, serializer, elemento, extras):
+        if not isinstance(elemento, dict):
+            raise ValidationError({"non_field_errors": ["Se esperaba un objeto"]})
+        validados = serializer.run_validation(elemento)
+        instancia = serializer.Meta.model(**validados, **extras)
+        try:
+            instancia.clean()
+        except DjangoValidationError as exc:
+            raise ValidationError(as_serializer_error(exc)) from exc
+        return instancia
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        elementos = request.data
+        if not isinstance(elementos, list) or not elementos:
+            raise ValidationError({"non_field_errors": ["Envíe una lista con al menos un elemento"]})
+        if len(elementos) > settings.BULK_CREATE_MAX_ITEMS:
+            raise ValidationError(
+                {"non_field_errors": [f"Como máximo {settings.BULK_CREATE_MAX_ITEMS} elementos por petición"]}
+            )
+
+        serializer = self.get_serializer()
+        precargar_relaciones(serializer, elementos)
+        extras = self.get_bulk_create_kwargs()
+        resultados = [None] * len(elementos)
+        validos = []
+        for indice, elemento in enumerate(elementos):
+            try:
+                validos.append((indice, self._validar_elemento(serializer, elemento, extras)))
+            except ValidationError as exc:
+                resultados[indice] = {"indice": indice, "status": 400, "errores": exc.detail}
+
+        if validos:
+            with transaction.atomic():
+                serializer.Meta.model.objects.bulk_create([instancia for _, instancia in validos])
+            for indice, instancia in validos:
+                resultados[indice] = {
+                    "indice": indice,
+                    "status": 201,
+                    "id": instancia.pk,
+                    "datos": self.get_serializer(instancia).data,
+                }
+
+        if not validos:
+            codigo = status.HTTP_400_BAD_REQUEST
+        elif len(validos) < len(elementos):
+            codigo = status.HTTP_207_MULTI_STATUS
+        else:
+            codigo = status.HTTP_201_CREATED
+        return Response(
+            {"creados": len(validos), "errores": len(elementos) - len(validos), "resultados": resultados},
+            status=codigo,
+        )
@@ -0,0 +1,49 @@
+"""Estado de las conexiones a la base de datos.
+
+Resume cómo se administran las conexiones de cada alias (persistentes o con
+el pool de psycopg 3) para exponerlo en el endpoint de salud.
+"""
+
+from django.db import connections
+
+
+def usa_pool(alias="default"):
+    """Si ``alias`` toma sus conexiones del pool de psycopg 3."""
+
+    conexion = connections[alias]
+    return conexion.vendor == "postgresql" and bool(conexion.settings_dict.get("OPTIONS", {}).get("pool"))
+
+
+def pool_stats(alias="default"):
+    """Configuración de conexión de ``alias`` y, si hay pool, su ocupación.
+
+    ``saturacion`` es la fracción de ``maximo`` en uso; con valores cercanos
+    a 1 las peticiones empiezan a esperar una conexión libre.
+    """
+
+    conexion = connections[alias]
+    ajustes = conexion.settings_dict
+    datos = {
+        "motor": conexion.vendor,
+        "conn_max_age": ajustes.get("CONN_MAX_AGE", 0),
+        "health_checks": ajustes.get("CONN_HEALTH_CHECKS", False),
+        "pool": None,
+    }
+    if not usa_pool(alias):
+        return datos
+
+    estadisticas = conexion.pool.get_stats()
+    maximo = estadisticas.get("pool_max") or 1
+    abiertas = estadisticas.get("pool_size", 0)
+    disponibles = estadisticas.get("pool_available", 0)
+    datos["pool"] = {
+        "minimo": estadisticas.get("pool_min"),
+        "maximo": maximo,
+        "abiertas": abiertas,
+        "disponibles": disponibles,
+        "en_espera": estadisticas.get("requests_waiting", 0),
+        "saturacion": round((abiertas - disponibles) / maximo, 3),
+        "errores": estadisticas.get("connections_errors", 0),
+        "agotamientos": estadisticas.get("requests_errors", 0),
+    }
+    return datos
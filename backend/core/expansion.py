@@ -0,0 +1,171 @@
+"""Expansión de relaciones con ``?expand=producto,formula.ingredientes``.
+
+Un ``ModelSerializer`` con ``ExpansionSerializerMixin`` declara en
+``Meta.expandable_fields`` qué relaciones pueden reemplazarse por un
+serializer anidado (``{"campo": "ruta.al.Serializer"}``). El segmento
+siguiente al punto expande dentro de ese serializer; también puede nombrar
+un serializer anidado ya declarado (``formula.ingredientes.material``).
+
+``ExpansionViewSetMixin`` lee el parámetro, lo valida y arma el queryset a
+partir de los campos que el serializer va a leer: ``select_related`` para
+las FKs fuera de listas y ``prefetch_related`` para las relaciones múltiples
+y todo lo que cuelga de ellas. El número de consultas queda acotado por la
+forma de la expansión, no por la cantidad de filas.
+"""
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import ManyRelatedField
+
+PARAMETRO = "expand"
+
+
+def parsear(valor):
+    """``"a,b.c"`` -> ``{"a": {}, "b": {"c": {}}}``."""
+
+    arbol = {}
+    for ruta in (valor or "").split(","):
+        nodo = arbol
+        for parte in ruta.strip().split("."):
+            if parte:
+                nodo = nodo.setdefault(parte.strip(), {})
+    return arbol
+
+
+def _profundidad(arbol):
+    return 1 + max(map(_profundidad, arbol.values()), default=0) if arbol else 0
+
+
+def _hijo(campo):
+    return campo.child if isinstance(campo, serializers.ListSerializer) else campo
+
+
+def _expandibles(clase):
+    return getattr(getattr(clase, "Meta", None), "expandable_fields", {})
+
+
+def _serializer_expandido(clase, nombre):
+    ruta = _expandibles(clase)[nombre]
+    return import_string(ruta) if isinstance(ruta, str) else ruta
+
+
+def validar(clase, arbol, prefijo=""):
+    """Rechaza nombres que no son expandibles ni serializers anidados de ``clase``."""
+
+    for nombre, subarbol in arbol.items():
+        if nombre in _expandibles(clase):
+            destino = _serializer_expandido(clase, nombre)
+        else:
+            declarado = getattr(clase, "_declared_fields", {}).get(nombre)
+            if not isinstance(declarado, serializers.BaseSerializer):
+                opciones = sorted(_expandibles(clase))
+                raise ValidationError(
+                    {PARAMETRO: f"'{prefijo}{nombre}' no se puede expandir. Opciones: {', '.join(opciones) or '-'}"}
+                )
+            destino = type(_hijo(declarado))
+        validar(destino, subarbol, f"{prefijo}{nombre}.")
+
+
+class ExpansionSerializerMixin:
+    """Reemplaza por serializers anidados las relaciones pedidas en ``expand``."""
+
+    def __init__(self, *args, **kwargs):
+        self._expand = kwargs.pop("expand", None) or {}
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        campos = super().get_fields()
+        for nombre, subarbol in self._expand.items():
+            if nombre in _expandibles(type(self)):
+                clase = _serializer_expandido(type(self), nombre)
+                fuente = campos[nombre].source
+                argumentos = {"source": fuente} if fuente and fuente != nombre else {}
+                if issubclass(clase, ExpansionSerializerMixin):
+                    argumentos["expand"] = subarbol
+                relacion = self.Meta.model._meta.get_field(fuente or nombre)
+                campos[nombre] = clase(
+                    many=relacion.many_to_many or relacion.one_to_many,
+                    read_only=True,
+                    **argumentos,
+                )
+            elif nombre in campos:
+                hijo = _hijo(campos[nombre])
+                if isinstance(hijo, ExpansionSerializerMixin):
+                    hijo._expand = subarbol
+        return campos
+
+
+def _relaciones(serializer, modelo, prefijo, en_lista, select, prefetch):
+    """Recorre los campos que se van a leer y anota las relaciones a cargar."""
+
+    for campo in serializer.fields.values():
+        if campo.write_only or campo.source == "*":
+            continue
+        anidado = _hijo(campo) if isinstance(campo, serializers.BaseSerializer) else None
+        partes = campo.source.split(".")
+        modelo_actual = modelo
+        ruta = prefijo
+        lista = en_lista
+        for indice, parte in enumerate(partes):
+            try:
+                relacion = modelo_actual._meta.get_field(parte)
+            except FieldDoesNotExist:
+                break
+            if not relacion.is_relation:
+                break
+            es_ultima = indice == len(partes) - 1
+            # Un PK de FK se lee de ``<campo>_id`` sin cargar la relación.
+            if es_ultima and anidado is None and not isinstance(campo, ManyRelatedField):
+                if relacion.many_to_one or relacion.one_to_one:
+                    break
+            ruta = f"{ruta}__{parte}" if ruta else parte
+            lista = lista or relacion.many_to_many or relacion.one_to_many
+            (prefetch if lista else select).add(ruta)
+            modelo_actual = relacion.related_model
+        else:
+            if anidado is not None and hasattr(anidado, "fields"):
+                _relaciones(anidado, modelo_actual, ruta, lista, select, prefetch)
+
+
+def optimizar(queryset, serializer):
+    """Agrega al ``queryset`` las relaciones que ``serializer`` va a leer."""
+
+    select, prefetch = set(), set()
+    _relaciones(serializer, queryset.model, "", False, select, prefetch)
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*sorted(prefetch))
+    return queryset
+
+
+class ExpansionViewSetMixin:
+    """Habilita ``?expand=`` en un ViewSet cuyo serializer usa ``ExpansionSerializerMixin``."""
+
+    def get_expand(self):
+        # Solo en lecturas: en las escrituras el serializer valida las FKs como ids.
+        if not hasattr(self, "_arbol_expand"):
+            request = getattr(self, "request", None)
+            arbol = {}
+            if request is not None and request.method in SAFE_METHODS:
+                arbol = parsear(request.query_params.get(PARAMETRO))
+            if _profundidad(arbol) > settings.EXPAND_MAX_DEPTH:
+                raise ValidationError({PARAMETRO: f"Como máximo {settings.EXPAND_MAX_DEPTH} niveles"})
+            validar(self.get_serializer_class(), arbol)
+            self._arbol_expand = arbol
+        return self._arbol_expand
+
+    def get_serializer(self, *args, **kwargs):
+        if self.get_expand():
+            kwargs.setdefault("expand", self.get_expand())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_expand():
+            queryset = optimizar(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,248 @@
+"""Exportación en streaming de registros a CSV y XLSX.
+
+Las filas se leen con ``values_list(...).iterator(chunk_size=...)`` y se
+escriben a medida que llegan: ni el queryset ni el archivo completo quedan
+en memoria. El XLSX se arma como un ZIP escrito sobre un flujo no
+posicionable (``zipfile`` usa descriptores de datos), con celdas en línea y
+sin dependencias externas.
+
+Las vistas incorporan el endpoint ``export/`` con ``ExportacionMixin``.
+"""
+
+import csv
+import re
+import zipfile
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# Filas escritas entre cada entrega de bytes del XLSX.
+FILAS_POR_ENTREGA = 500
+
+
+def _texto(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor).isoformat() if timezone.is_aware(valor) else valor.isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, bool):
+        return "si" if valor else "no"
+    return str(valor)
+
+
+class _Eco:
+    """Pseudo archivo para ``csv.writer``: devuelve la línea en vez de guardarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def _texto_csv(valor):
+    # Texto libre que empieza como fórmula se neutraliza para las planillas.
+    if isinstance(valor, str) and valor[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + valor
+    return _texto(valor)
+
+
+def filas_csv(encabezados, filas):
+    escritor = csv.writer(_Eco())
+    # BOM para que Excel reconozca UTF-8 al abrir el archivo.
+    yield "\ufeff" + escritor.writerow(encabezados)
+    for fila in filas:
+        yield escritor.writerow([_texto_csv(valor) for valor in fila])
+
+
+class _Tubo:
+    """Destino de escritura sin ``seek``: acumula bytes hasta que se retiran."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+# Caracteres de control que XML 1.0 no admite.
+_INVALIDOS_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_PARTES_FIJAS_XLSX = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Datos" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+def _celda(valor):
+    if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+        return f"<c><v>{valor}</v></c>"
+    texto = escape(_INVALIDOS_XML.sub("", _texto(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _fila_xlsx(fila):
+    return ("<row>" + "".join(_celda(valor) for valor in fila) + "</row>").encode()
+
+
+def filas_xlsx(encabezados, filas):
+    tubo = _Tubo()
+    with zipfile.ZipFile(tubo, "w", compression=zipfile.ZIP_DEFLATED) as libro:
+        for nombre, contenido in _PARTES_FIJAS_XLSX.items():
+            libro.writestr(nombre, contenido)
+        # ``force_zip64``: el tamaño de la hoja no se conoce de antemano.
+        with libro.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as hoja:
+            hoja.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            hoja.write(_fila_xlsx(encabezados))
+            for numero, fila in enumerate(filas, start=1):
+                hoja.write(_fila_xlsx(fila))
+                if numero % FILAS_POR_ENTREGA == 0:
+                    datos = tubo.retirar()
+                    if datos:
+                        yield datos
+            hoja.write(b"</sheetData></worksheet>")
+    yield tubo.retirar()
+
+
+def comprimir_gzip(partes):
+    """Comprime al vuelo un iterable de ``str``/``bytes`` en formato gzip."""
+
+    compresor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for parte in partes:
+        datos = compresor.compress(parte.encode() if isinstance(parte, str) else parte)
+        if datos:
+            yield datos
+    yield compresor.flush()
+
+
+def respuesta_exportacion(queryset, columnas, nombre, formato="csv", gzip=False):
+    """``StreamingHttpResponse`` con las ``columnas`` ``(encabezado, ruta)`` del queryset."""
+
+    if formato not in FORMATOS:
+        raise ValidationError({"formato": f"Formato no soportado. Opciones: {', '.join(FORMATOS)}"})
+
+    encabezados = [encabezado for encabezado, _ in columnas]
+    filas = queryset.values_list(*[ruta for _, ruta in columnas]).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+    contenido = (filas_csv if formato == "csv" else filas_xlsx)(encabezados, filas)
+    archivo = f"{nombre}-{timezone.localdate():%Y%m%d}.{formato}"
+    content_type = FORMATOS[formato]
+    # El XLSX ya es un ZIP: volver a comprimirlo no reduce nada.
+    if gzip and formato == "csv":
+        contenido = comprimir_gzip(contenido)
+        archivo += ".gz"
+        content_type = "application/gzip"
+
+    respuesta = StreamingHttpResponse(contenido, content_type=content_type)
+    respuesta["Content-Disposition"] = f'attachment; filename="{archivo}"'
+    respuesta["Cache-Control"] = "no-store"
+    return respuesta
+
+
+def _limite(valor, parametro, fin_del_dia=False):
+    try:
+        momento = parse_datetime(valor)
+        dia = parse_date(valor) if momento is None else None
+    except ValueError:
+        momento = dia = None
+    if momento is None:
+        if dia is None:
+            raise ValidationError({parametro: "Use una fecha (AAAA-MM-DD) o fecha y hora ISO 8601."})
+        momento = datetime.combine(dia, datetime.max.time() if fin_del_dia else datetime.min.time())
+    if timezone.is_naive(momento):
+        momento = timezone.make_aware(momento)
+    return momento
+
+
+class ExportacionMixin:
+    """Agrega ``GET <listado>/export/?formato=csv|xlsx&gzip=1&desde=&hasta=``.
+
+    Parte del mismo ``filter_queryset`` que el listado. ``export_columns`` es
+    una lista de ``(encabezado, ruta values_list)``; ``export_date_field``
+    es el campo sobre el que se aplican ``desde`` y ``hasta``.
+    """
+
+    export_columns = ()
+    export_date_field = None
+    export_filename = "exportacion"
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        parametros = self.request.query_params
+        if self.export_date_field:
+            if parametros.get("desde"):
+                queryset = queryset.filter(
+                    **{f"{self.export_date_field}__gte": _limite(parametros["desde"], "desde")}
+                )
+            if parametros.get("hasta"):
+                queryset = queryset.filter(
+                    **{f"{self.export_date_field}__lte": _limite(parametros["hasta"], "hasta", fin_del_dia=True)}
+                )
+        # Las columnas son proyecciones: los ``select_related`` del listado sobran.
+        return queryset.select_related(None)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        return respuesta_exportacion(
+            self.get_export_queryset(),
+            self.export_columns,
+            self.export_filename,
+            formato=request.query_params.get("formato", "csv"),
+            gzip=request.query_params.get("gzip", "").lower() in ("1", "true"),
+        )
@@ -0,0 +1,185 @@
+"""Altas idempotentes con la cabecera ``Idempotency-Key``.
+
+Las tablets reintentan los POST cuando se corta el Wi-Fi. Si el cliente
+envía ``Idempotency-Key``, la primera petición se ejecuta y su respuesta se
+guarda en caché durante ``IDEMPOTENCY_TTL_SECONDS``; los reintentos con la
+misma clave reciben esa respuesta sin volver a ejecutar la vista.
+
+La clave se aísla por usuario y se guarda junto a la huella de la petición
+(método, ruta y cuerpo): reutilizarla con otro contenido es un error del
+cliente (422). Dos peticiones simultáneas con la misma clave se serializan
+con un ``cache.add`` sobre la clave, no con bloqueos de tablas: la segunda
+espera hasta ``IDEMPOTENCY_WAIT_SECONDS`` a que termine la primera y, si no
+terminó, recibe 409.
+
+Requiere un ``CACHE_BACKEND`` compartido entre workers; con ``locmem`` cada
+proceso solo reconoce sus propios reintentos.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.http.request import RawPostDataException
+from rest_framework import exceptions
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+CABECERA = "Idempotency-Key"
+CABECERA_REPETIDA = "Idempotent-Replayed"
+LARGO_MAXIMO = 255
+EN_CURSO = "en_curso"
+# Respuestas que no se guardan: el reintento debe volver a ejecutarse.
+NO_REUTILIZABLES = {401, 403, 408, 409, 425, 429}
+_CABECERAS_GUARDADAS = ("Content-Type", "Location")
+_PAUSA = 0.05
+
+
+def _cache():
+    return caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+
+
+def usuario_de(request):
+    """Id del usuario de la petición sin consultar la base, o ``None``.
+
+    Corre antes que la autenticación de DRF: toma la sesión si existe o el
+    claim del access token. Un token inválido se ignora; la vista lo rechaza.
+    """
+
+    usuario = getattr(request, "user", None)
+    if usuario is not None and usuario.is_authenticated:
+        return usuario.pk
+    tipo, _, crudo = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    if tipo not in api_settings.AUTH_HEADER_TYPES or not crudo:
+        return None
+    try:
+        return AccessToken(crudo.strip())[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+
+
+def huella(request):
+    resumen = hashlib.sha256(f"{request.method} {request.get_full_path()}\n".encode())
+    largo = int(request.META.get("CONTENT_LENGTH") or 0)
+    try:
+        if largo > settings.IDEMPOTENCY_MAX_BODY_BYTES:
+            raise RawPostDataException
+        resumen.update(request.body)
+    except RawPostDataException:
+        # Cuerpos grandes (adjuntos) o ya consumidos: basta con el tamaño.
+        resumen.update(f"{largo}".encode())
+    return resumen.hexdigest()
+
+
+def clave_cache(usuario_id, clave):
+    return "idempotencia:" + hashlib.sha256(f"{usuario_id}:{clave}".encode()).hexdigest()
+
+
+def _respuesta_guardada(registro):
+    respuesta = HttpResponse(registro["contenido"], status=registro["status"])
+    for nombre, valor in registro["cabeceras"].items():
+        respuesta[nombre] = valor
+    respuesta[CABECERA_REPETIDA] = "true"
+    return respuesta
+
+
+def _error(status, detalle, **cabeceras):
+    respuesta = JsonResponse({"detail": detalle}, status=status)
+    for nombre, valor in cabeceras.items():
+        respuesta[nombre] = valor
+    return respuesta
+
+
+def iniciar(request):
+    """Reserva la clave de la petición o devuelve la respuesta a entregar.
+
+    Devuelve ``((clave de caché, huella), None)`` cuando la vista debe
+    ejecutarse y ``(None, respuesta)`` para un reintento o un conflicto.
+    """
+
+    clave = request.headers.get(CABECERA, "").strip()
+    if len(clave) > LARGO_MAXIMO:
+        return None, _error(400, f"{CABECERA} admite hasta {LARGO_MAXIMO} caracteres")
+    usuario_id = usuario_de(request)
+    if usuario_id is None:
+        return None, None
+
+    cache = _cache()
+    llave = clave_cache(usuario_id, clave)
+    marca = huella(request)
+    limite = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        if cache.add(llave, {"estado": EN_CURSO, "huella": marca}, timeout=settings.IDEMPOTENCY_LOCK_SECONDS):
+            return (llave, marca), None
+        registro = cache.get(llave)
+        # ``None``: expiró o se liberó entre ``add`` y ``get``; se vuelve a
+        # intentar tras la pausa, con el mismo límite de espera.
+        if registro is not None:
+            if registro["huella"] != marca:
+                return None, _error(422, f"{CABECERA} ya se usó con otra petición")
+            if registro["estado"] != EN_CURSO:
+                return None, _respuesta_guardada(registro)
+        if time.monotonic() >= limite:
+            return None, _error(409, "Hay una petición en curso con la misma clave", **{"Retry-After": "1"})
+        time.sleep(_PAUSA)
+
+
+def finalizar(reserva, respuesta):
+    """Guarda ``respuesta`` para los reintentos o libera la clave."""
+
+    llave, marca = reserva
+    cache = _cache()
+    if respuesta.status_code >= 500 or respuesta.status_code in NO_REUTILIZABLES or respuesta.streaming:
+        cache.delete(llave)
+        return
+    cache.set(
+        llave,
+        {
+            "estado": "completa",
+            "huella": marca,
+            "status": respuesta.status_code,
+            "contenido": respuesta.content,
+            "cabeceras": {nombre: respuesta[nombre] for nombre in _CABECERAS_GUARDADAS if nombre in respuesta},
+        },
+        timeout=settings.IDEMPOTENCY_TTL_SECONDS,
+    )
+
+
+def idempotencia_exenta(vista):
+    """Excluye una vista del middleware, como ``csrf_exempt``.
+
+    Para endpoints cuya respuesta no debe quedar en caché (login, tokens).
+    """
+
+    vista.idempotency_exempt = True
+    return vista
+
+
+def es_exenta(vista):
+    return getattr(vista, "idempotency_exempt", False) or getattr(
+        getattr(vista, "cls", None), "idempotency_exempt", False
+    )
+
+
+class IdempotenciaMixin:
+    """Configura ``Idempotency-Key`` en un ViewSet.
+
+    ``IdempotencyMiddleware`` aplica la clave a cualquier POST; con
+    ``idempotency_required`` (por defecto ``IDEMPOTENCY_REQUIRED``) el ViewSet
+    además rechaza las altas sin ella. ``idempotency_exempt`` excluye la
+    vista del middleware.
+    """
+
+    idempotency_required = None
+    idempotency_exempt = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        requerida = self.idempotency_required
+        if requerida is None:
+            requerida = settings.IDEMPOTENCY_REQUIRED
+        if requerida and request.method == "POST" and not request.headers.get(CABECERA, "").strip():
+            raise exceptions.ValidationError({CABECERA: "La cabecera es obligatoria para esta operación"})
@@ -0,0 +1,159 @@
+"""Consulta rápida y compactación de la lista negra de refresh tokens.
+
+Con ``ROTATE_REFRESH_TOKENS`` y ``BLACKLIST_AFTER_ROTATION`` cada refresco
+agrega filas a ``OutstandingToken`` y ``BlacklistedToken`` que nadie borra.
+``purgar_expirados`` las elimina por lotes; un token expirado ya no valida,
+así que sus filas no aportan nada.
+
+``contiene`` evita la consulta por token: cada proceso mantiene el conjunto
+de ``jti`` revocados y lo pone al día con una consulta por rango de ``id``
+solo cuando cambia la versión ``lista_negra`` de la caché compartida, que
+se incrementa al confirmar cada alta. Con ``CACHE_BACKEND=locmem`` la
+versión no se comparte entre workers y se consulta la base en cada caso.
+
+Las altas concurrentes pueden confirmarse fuera de orden de ``id``: los
+``id`` salteados por una lectura quedan como huecos y se vuelven a buscar en
+cada puesta al día hasta que aparecen o pasan ``ESPERA_HUECOS`` segundos
+(altas revertidas). Un salto mayor a ``MAX_HUECOS`` no se sigue id por id:
+la próxima puesta al día relee la tabla completa.
+"""
+
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from backend.core.cache import cache_compartida, invalidar, version_actual
+
+_ALIAS = "sessions"
+_ESPACIO = "lista_negra"
+ESPERA_HUECOS = 10 * 60
+MAX_HUECOS = 1000
+INTERVALO_PODA = 60 * 60
+TAMANO_LOTE = 5000
+
+
+class ConjuntoRevocados:
+    """``jti`` revocados y vigentes conocidos por este proceso."""
+
+    def __init__(self):
+        self._vencimientos = {}
+        self._ultimo_id = 0
+        # ``id`` salteado -> momento en que se detectó el hueco.
+        self._huecos = {}
+        self._releer_todo = False
+        self._version = None
+        self._ultima_poda = time.monotonic()
+        self._bloqueo = threading.Lock()
+
+    def contiene(self, jti):
+        if not cache_compartida():
+            return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+        version = version_actual(_ESPACIO, alias=_ALIAS)
+        if version != self._version:
+            self._poner_al_dia(version)
+        return jti in self._vencimientos
+
+    def _poner_al_dia(self, version):
+        with self._bloqueo:
+            if version == self._version:
+                return
+            # La versión se lee antes que las filas: un alta posterior la
+            # cambia de nuevo y fuerza otra puesta al día.
+            ahora = time.monotonic()
+            self._huecos = {hueco: visto for hueco, visto in self._huecos.items() if ahora - visto < ESPERA_HUECOS}
+            completa = self._releer_todo or not self._ultimo_id
+            filtro = Q()
+            if not completa:
+                filtro = Q(id__gt=self._ultimo_id)
+                if self._huecos:
+                    filtro |= Q(id__in=list(self._huecos))
+            self._releer_todo = False
+            filas = (
+                BlacklistedToken.objects.filter(filtro)
+                .order_by("id")
+                .values_list("id", "token__jti", "token__expires_at")
+            )
+            for fila_id, jti, vence in filas:
+                self._vencimientos[jti] = vence
+                self._huecos.pop(fila_id, None)
+                salto = fila_id - self._ultimo_id - 1
+                if salto > MAX_HUECOS and not completa:
+                    self._releer_todo = True
+                elif salto > 0 and not completa:
+                    self._huecos.update(dict.fromkeys(range(self._ultimo_id + 1, fila_id), ahora))
+                self._ultimo_id = max(self._ultimo_id, fila_id)
+            self._version = version
+            self._podar()
+
+    def _podar(self):
+        if time.monotonic() - self._ultima_poda < INTERVALO_PODA:
+            return
+        ahora = timezone.now()
+        self._vencimientos = {jti: vence for jti, vence in self._vencimientos.items() if vence > ahora}
+        self._ultima_poda = time.monotonic()
+
+    def reiniciar(self):
+        with self._bloqueo:
+            self.__init__()
+
+
+revocados = ConjuntoRevocados()
+
+
+def contiene(jti):
+    return revocados.contiene(jti)
+
+
+def revocar(jti):
+    """Agrega a la lista negra el token ``jti`` ya registrado como emitido.
+
+    Devuelve ``False`` si no hay ``OutstandingToken`` para ese ``jti``.
+    """
+
+    token_id = OutstandingToken.objects.filter(jti=jti).values_list("id", flat=True).first()
+    if token_id is None:
+        return False
+    BlacklistedToken.objects.get_or_create(token_id=token_id)
+    return True
+
+
+@receiver(post_save, sender=BlacklistedToken, dispatch_uid="lista_negra_version")
+def publicar_alta(sender, created, **kwargs):
+    """Incrementa la versión compartida cuando el alta queda confirmada."""
+
+    if created:
+        transaction.on_commit(lambda: invalidar(_ESPACIO, alias=_ALIAS))
+
+
+def purgar_expirados(lote=TAMANO_LOTE, ahora=None):
+    """Borra por lotes los tokens expirados y sus altas en la lista negra.
+
+    Los ``id`` crecen con la emisión y la vida del token es fija, así que los
+    expirados se concentran al principio del índice primario: cada lote lo
+    recorre desde el último ``id`` borrado en lugar de filtrar por
+    ``expires_at``, que no tiene índice.
+    """
+
+    ahora = ahora or timezone.now()
+    desde = 0
+    borrados = 0
+    while True:
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=desde, expires_at__lte=ahora)
+            .order_by("id")
+            .values_list("id", flat=True)[:lote]
+        )
+        if not ids:
+            return borrados
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        borrados += len(ids)
+        desde = ids[-1]
@@ -0,0 +1,164 @@
+"""Benchmark de latencia de la API sobre una planta sintética."""
+
+import json
+import platform
+import subprocess
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from backend.core.services.benchmark import ESCALAS, medir_endpoints, sembrar_planta
+
+AJUSTES_ESCALA = {
+    "machines": "maquinas",
+    "formulas": "formulas",
+    "records": "registros",
+    "incidents": "incidentes",
+    "maintenances": "mantenimientos",
+}
+
+
+class Command(BaseCommand):
+    """Siembra una planta con ``bulk_create`` y mide cada endpoint de los routers.
+
+    Por defecto trabaja sobre una base de prueba aparte (``bench_<NAME>`` o
+    ``bench.sqlite3``) para no tocar datos reales. El resultado es un JSON con
+    p50/p95/p99, consultas y bytes por endpoint y variante, pensado para
+    comparar entre versiones.
+    """
+
+    help = "Mide latencia, consultas y bytes de los endpoints sobre datos sintéticos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(ESCALAS), default="media", help="Perfil de tamaño de la planta")
+        for opcion, clave in AJUSTES_ESCALA.items():
+            parser.add_argument(f"--{opcion}", type=int, help=f"Sobrescribe la cantidad de {clave} del perfil")
+        parser.add_argument("--iterations", type=int, default=30, help="Mediciones por endpoint y variante")
+        parser.add_argument("--warmup", type=int, default=3, help="Peticiones descartadas antes de medir")
+        parser.add_argument("--page-sizes", default="10,50,200", help="Tamaños de página separados por coma")
+        parser.add_argument("--only", default="", help="Basenames (o fragmentos) a medir, separados por coma")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla para datos y muestreo reproducibles")
+        parser.add_argument("--output", help="Archivo JSON de salida (por defecto stdout)")
+        parser.add_argument("--no-seed", action="store_true", help="No sembrar; medir los datos existentes")
+        parser.add_argument(
+            "--seed-only",
+            action="store_true",
+            help="Solo sembrar (implica --current-db); útil para preparar datos de loadtest",
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Conservar la base de benchmark entre corridas")
+        parser.add_argument(
+            "--current-db",
+            action="store_true",
+            help="Usar la base configurada en lugar de una base de benchmark aparte",
+        )
+
+    def handle(self, *args, **options):
+        escala = dict(ESCALAS[options["scale"]])
+        for opcion, clave in AJUSTES_ESCALA.items():
+            if options[opcion] is not None:
+                escala[clave] = options[opcion]
+        try:
+            tamanos = [int(valor) for valor in options["page_sizes"].split(",") if valor.strip()]
+        except ValueError as exc:
+            raise CommandError("--page-sizes debe ser una lista de enteros separados por coma") from exc
+
+        if options["current_db"] or options["seed_only"]:
+            return self._ejecutar(escala, tamanos, options)
+
+        nombre_original = connection.settings_dict["NAME"]
+        prueba = connection.settings_dict.setdefault("TEST", {})
+        if not prueba.get("NAME"):
+            if connection.vendor == "sqlite":
+                prueba["NAME"] = str(Path(settings.BASE_DIR) / "bench.sqlite3")
+            else:
+                prueba["NAME"] = f"bench_{nombre_original}"
+        verbosidad = max(0, options["verbosity"] - 1)
+        connection.creation.create_test_db(
+            verbosity=verbosidad,
+            autoclobber=True,
+            keepdb=options["keepdb"],
+            serialize=False,
+        )
+        try:
+            return self._ejecutar(escala, tamanos, options)
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=verbosidad, keepdb=options["keepdb"])
+
+    def _ejecutar(self, escala, tamanos, options):
+        informar = self._informar(options["verbosity"])
+        RegistroProduccion = apps.get_model("produccion", "RegistroProduccion")
+        UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+        sembradas = None
+        if options["no_seed"] or (options["keepdb"] and RegistroProduccion.objects.exists()):
+            informar("Usando datos existentes.")
+        else:
+            sembradas = sembrar_planta(escala, semilla=options["seed"], informar=informar)
+        if options["seed_only"]:
+            informar(f"Filas sembradas: {sembradas}")
+            return
+
+        usuario = UserModel.objects.filter(is_superuser=True).order_by("pk").first()
+        if usuario is None:
+            usuario = UserModel.objects.create_superuser("bench-admin", "bench@example.com", None)
+
+        resultados = medir_endpoints(
+            usuario,
+            iteraciones=options["iterations"],
+            calentamiento=options["warmup"],
+            tamanos_pagina=tamanos,
+            solo=[valor.strip() for valor in options["only"].split(",") if valor.strip()],
+            semilla=options["seed"],
+            informar=informar,
+        )
+
+        reporte = {
+            "fecha": timezone.now().isoformat(),
+            "version": {
+                "commit": self._commit(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "base_de_datos": connection.vendor,
+            },
+            "escala": {"perfil": options["scale"], **escala},
+            "filas_sembradas": sembradas,
+            "parametros": {
+                "iteraciones": options["iterations"],
+                "calentamiento": options["warmup"],
+                "tamanos_pagina": tamanos,
+            },
+            "resultados": resultados,
+        }
+        contenido = json.dumps(reporte, ensure_ascii=False, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(contenido, encoding="utf-8")
+            informar(f"Resultados en {options['output']}")
+        else:
+            self.stdout.write(contenido)
+
+    def _informar(self, verbosidad):
+        def informar(mensaje):
+            if verbosidad > 0:
+                # stderr para no mezclar progreso con el JSON de stdout.
+                self.stderr.write(mensaje)
+
+        return informar
+
+    @staticmethod
+    def _commit():
+        try:
+            salida = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                timeout=5,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return salida.stdout.strip() or None
@@ -0,0 +1,22 @@
+"""Compactación de la lista negra de refresh tokens."""
+
+from django.core.management.base import BaseCommand
+
+from backend.core.lista_negra import TAMANO_LOTE, purgar_expirados
+
+
+class Command(BaseCommand):
+    """Borra por lotes los tokens emitidos ya expirados y sus altas en la lista negra.
+
+    A diferencia de ``flushexpiredtokens`` no arma un único ``DELETE`` con
+    cascada sobre toda la tabla: cada lote se confirma por separado.
+    """
+
+    help = "Elimina por lotes los refresh tokens expirados de la lista negra"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=TAMANO_LOTE, help="Tokens por lote")
+
+    def handle(self, *args, **options):
+        borrados = purgar_expirados(lote=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{borrados} tokens expirados eliminados"))
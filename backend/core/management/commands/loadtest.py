@@ -0,0 +1,121 @@
+"""Generador de carga por escenarios contra un servidor local."""
+
+import json
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.core.carga import escenarios
+from backend.core.carga.cliente import DestinoNoPermitido, validar_destino
+from backend.core.carga.ejecutor import Ejecucion
+from backend.core.services.benchmark import ESCALAS
+
+
+class Command(BaseCommand):
+    """Reproduce un escenario declarativo (por ejemplo ``cambio_de_turno``).
+
+    Los usuarios de los escenarios incluidos son los operarios que siembra
+    ``manage.py bench --seed-only``; la escala ``media`` siembra 60 y
+    ``planta`` 200. Antes de empezar se verifica en la base local que existan
+    todos, salvo con ``--skip-user-check`` (servidor con otra base). Solo se
+    aceptan destinos en loopback o redes privadas.
+    """
+
+    help = "Ejecuta un escenario de carga concurrente contra un servidor local en ejecución"
+
+    def add_arguments(self, parser):
+        parser.add_argument("escenario", nargs="?", help="Nombre en backend/core/carga/escenarios o ruta a un JSON")
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="URL base del servidor")
+        parser.add_argument("--users", type=int, help="Sobrescribe la cantidad de usuarios virtuales")
+        parser.add_argument("--concurrency", type=int, help="Sobrescribe los usuarios activos simultáneos")
+        parser.add_argument("--ramp", type=float, help="Sobrescribe la ventana de llegada en segundos")
+        parser.add_argument(
+            "--simulate-ips",
+            action="store_true",
+            help="Enviar un X-Forwarded-For distinto por usuario (como detrás del proxy de planta)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Semilla de las elecciones aleatorias")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por petición en segundos")
+        parser.add_argument("--output", help="Archivo JSON con el reporte completo")
+        parser.add_argument("--list", action="store_true", help="Listar escenarios disponibles")
+        parser.add_argument(
+            "--skip-user-check",
+            action="store_true",
+            help="No verificar en la base local que existan los usuarios del escenario",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"] or not options["escenario"]:
+            for nombre in escenarios.disponibles():
+                self.stdout.write(f"{nombre}: {escenarios.cargar(nombre).descripcion}")
+            return
+
+        try:
+            escenario = escenarios.cargar(options["escenario"])
+            destino = validar_destino(options["url"])
+        except (escenarios.EscenarioInvalido, DestinoNoPermitido) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["users"] is not None:
+            escenario.usuarios = options["users"]
+            escenario.concurrencia = min(escenario.concurrencia, escenario.usuarios)
+        if options["concurrency"] is not None:
+            escenario.concurrencia = options["concurrency"]
+        if options["ramp"] is not None:
+            escenario.rampa_segundos = options["ramp"]
+        if not options["skip_user_check"]:
+            self._verificar_usuarios(escenario)
+
+        reporte = Ejecucion(
+            escenario,
+            destino,
+            ips_simuladas=options["simulate_ips"],
+            semilla=options["seed"],
+            timeout=options["timeout"],
+        ).ejecutar()
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(reporte, ensure_ascii=False, indent=2), encoding="utf-8")
+        self._imprimir(reporte)
+
+    def _verificar_usuarios(self, escenario):
+        nombres = escenario.nombres_de_usuario()
+        if not nombres:
+            return
+        UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+        existentes = set(UserModel.objects.filter(username__in=nombres).values_list("username", flat=True))
+        faltantes = [nombre for nombre in nombres if nombre not in existentes]
+        if not faltantes:
+            return
+        consejos = [
+            f"siembre con `manage.py bench --seed-only --scale {perfil}`"
+            for perfil, tamanos in sorted(ESCALAS.items(), key=lambda item: item[1]["operarios"])
+            if tamanos["operarios"] >= len(nombres)
+        ][:1]
+        if existentes:
+            consejos.append(f"use --users {len(existentes)}")
+        raise CommandError(
+            f"Faltan {len(faltantes)} de {len(nombres)} usuarios del escenario (por ejemplo {faltantes[0]}): "
+            f"{' o '.join(consejos) or 'créelos antes de ejecutarlo'}."
+        )
+
+    def _imprimir(self, reporte):
+        self.stdout.write(
+            f"{reporte['escenario']} contra {reporte['destino']}: {reporte['peticiones']} peticiones en "
+            f"{reporte['duracion_s']:.1f} s ({reporte['throughput_rps']} req/s), "
+            f"{reporte['usuarios_completos']}/{reporte['usuarios']} usuarios completos"
+        )
+        self.stdout.write(f"{'paso':<26}{'pet.':>7}{'ok':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'429':>6}")
+        for paso in reporte["pasos"]:
+            latencia = paso["latencia_ms"] or {}
+            self.stdout.write(
+                f"{paso['nombre']:<26}{paso['peticiones']:>7}{paso['exitosas']:>7}"
+                f"{paso['throughput_rps'] or 0:>8}{latencia.get('p50', '-'):>9}"
+                f"{latencia.get('p95', '-'):>9}{latencia.get('p99', '-'):>9}{paso['limitadas_429']:>6}"
+            )
+        for alerta in reporte["alertas"]:
+            self.stdout.write(self.style.WARNING(f"[{alerta['tipo']}] {alerta['paso']}: {alerta['detalle']}"))
+        if reporte["usuarios_abortados"]:
+            self.stdout.write(f"Usuarios abortados por paso: {reporte['usuarios_abortados']}")
@@ -0,0 +1,177 @@
+"""Métricas de rendimiento por vista en formato de texto de Prometheus.
+
+Cada proceso acumula histogramas en memoria. Si ``METRICS_DIR`` está
+configurado, el proceso vuelca su estado periódicamente a un archivo propio
+dentro de ese directorio y el endpoint de exportación combina los archivos de
+todos los procesos; así los workers de gunicorn reportan un total consistente
+sin importar cuál atiende el scrape. El directorio debe vaciarse al iniciar el
+despliegue, igual que con ``prometheus_client`` en modo multiproceso.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICAS = {
+    "siprosa_http_request_duration_seconds": (
+        "Latencia total de la petición por vista y acción",
+        BUCKETS_SEGUNDOS,
+    ),
+    "siprosa_http_db_queries": (
+        "Consultas SQL ejecutadas por petición",
+        BUCKETS_CONSULTAS,
+    ),
+    "siprosa_http_db_duration_seconds": (
+        "Tiempo acumulado en la base de datos por petición",
+        BUCKETS_SEGUNDOS,
+    ),
+    "siprosa_http_render_duration_seconds": (
+        "Tiempo de serialización de la respuesta (render)",
+        BUCKETS_SEGUNDOS,
+    ),
+    "siprosa_http_response_size_bytes": (
+        "Tamaño del cuerpo de la respuesta",
+        BUCKETS_BYTES,
+    ),
+}
+ETIQUETAS = ("view", "action", "method", "status")
+
+
+class RegistroMetricas:
+    """Acumula histogramas de un proceso y los combina con los de otros."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datos = {}
+        self._ultimo_volcado = 0.0
+        self._archivo = None
+
+    def observar(self, metrica, etiquetas, valor):
+        buckets = METRICAS[metrica][1]
+        clave = (metrica, etiquetas)
+        with self._lock:
+            serie = self._datos.get(clave)
+            if serie is None:
+                serie = self._datos[clave] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+            indice = bisect_left(buckets, valor)
+            if indice < len(buckets):
+                serie["buckets"][indice] += 1
+            serie["sum"] += valor
+            serie["count"] += 1
+        self._volcar_si_corresponde()
+
+    def reiniciar(self):
+        with self._lock:
+            self._datos.clear()
+
+    def _directorio(self):
+        directorio = getattr(settings, "METRICS_DIR", None)
+        return Path(directorio) if directorio else None
+
+    def _ruta_archivo(self, directorio):
+        if self._archivo is None or self._archivo[0] != os.getpid():
+            # Un proceso hijo hereda el estado del padre tras un fork; se descarta.
+            if self._archivo is not None:
+                self.reiniciar()
+            nombre = f"metricas-{os.getpid()}-{int(time.time() * 1000)}.json"
+            self._archivo = (os.getpid(), directorio / nombre)
+        return self._archivo[1]
+
+    def _serializar(self):
+        with self._lock:
+            return [
+                [metrica, list(etiquetas), dict(serie, buckets=list(serie["buckets"]))]
+                for (metrica, etiquetas), serie in self._datos.items()
+            ]
+
+    def volcar(self):
+        directorio = self._directorio()
+        if directorio is None:
+            return
+        directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self._ruta_archivo(directorio)
+        temporal = ruta.with_suffix(".tmp")
+        temporal.write_text(json.dumps(self._serializar()), encoding="utf-8")
+        os.replace(temporal, ruta)
+        self._ultimo_volcado = time.monotonic()
+
+    def _volcar_si_corresponde(self):
+        intervalo = getattr(settings, "METRICS_FLUSH_SECONDS", 5)
+        if self._directorio() and time.monotonic() - self._ultimo_volcado >= intervalo:
+            self.volcar()
+
+    def combinar(self):
+        """Devuelve las series de todos los procesos sumadas por etiqueta."""
+
+        directorio = self._directorio()
+        if directorio is None:
+            return {clave: serie for clave, serie in self._iterar(self._serializar())}
+
+        self.volcar()
+        combinadas = {}
+        for ruta in directorio.glob("metricas-*.json"):
+            try:
+                contenido = json.loads(ruta.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            for clave, serie in self._iterar(contenido):
+                destino = combinadas.get(clave)
+                if destino is None:
+                    combinadas[clave] = serie
+                    continue
+                destino["buckets"] = [a + b for a, b in zip(destino["buckets"], serie["buckets"])]
+                destino["sum"] += serie["sum"]
+                destino["count"] += serie["count"]
+        return combinadas
+
+    @staticmethod
+    def _iterar(filas):
+        for metrica, etiquetas, serie in filas:
+            if metrica in METRICAS:
+                yield (metrica, tuple(etiquetas)), serie
+
+
+registro = RegistroMetricas()
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(nombres, valores, extra=None):
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}"
+
+
+def exportar_prometheus():
+    """Serializa las series combinadas en el formato de exposición de texto."""
+
+    series = registro.combinar()
+    lineas = []
+    for metrica, (descripcion, buckets) in METRICAS.items():
+        lineas.append(f"# HELP {metrica} {descripcion}")
+        lineas.append(f"# TYPE {metrica} histogram")
+        for (nombre, etiquetas), serie in sorted(series.items()):
+            if nombre != metrica:
+                continue
+            acumulado = 0
+            for limite, cantidad in zip(buckets, serie["buckets"]):
+                acumulado += cantidad
+                le = f'le="{limite:g}"'
+                lineas.append(f"{metrica}_bucket{_etiquetas(ETIQUETAS, etiquetas, le)} {acumulado}")
+            infinito = _etiquetas(ETIQUETAS, etiquetas, 'le="+Inf"')
+            lineas.append(f"{metrica}_bucket{infinito} {serie['count']}")
+            lineas.append(f"{metrica}_sum{_etiquetas(ETIQUETAS, etiquetas)} {serie['sum']:.6f}")
+            lineas.append(f"{metrica}_count{_etiquetas(ETIQUETAS, etiquetas)} {serie['count']}")
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,296 @@
+"""Middlewares transversales del backend."""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+from backend.core import idempotencia, metrics
+
+try:
+    import brotli
+except ImportError:  # Opcional: sin brotli solo se ofrece gzip.
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Medicion:
+    """Tiempos y consultas acumulados durante una petición."""
+
+    __slots__ = ("consultas", "tiempo_db", "inicio_render", "tiempo_render", "vista", "accion")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.inicio_render = None
+        self.tiempo_render = 0.0
+        self.vista = "<sin_resolver>"
+        self.accion = ""
+
+    def registrar_consulta(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tiempo_db += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+class PerformanceMetricsMiddleware:
+    """Mide latencia, consultas SQL, render y tamaño de respuesta por vista.
+
+    Los valores se publican en la cabecera ``Server-Timing`` y se agregan en
+    histogramas expuestos por ``/api/metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        medicion = _Medicion()
+        request._medicion = medicion
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(medicion.registrar_consulta))
+            response = self.get_response(request)
+        total = time.perf_counter() - inicio
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f"total;dur={total * 1000:.1f}",
+                f'db;dur={medicion.tiempo_db * 1000:.1f};desc="{medicion.consultas} consultas"',
+                f"render;dur={medicion.tiempo_render * 1000:.1f}",
+            ]
+        )
+
+        etiquetas = (
+            medicion.vista,
+            medicion.accion,
+            request.method,
+            f"{response.status_code // 100}xx",
+        )
+        metrics.registro.observar("siprosa_http_request_duration_seconds", etiquetas, total)
+        metrics.registro.observar("siprosa_http_db_queries", etiquetas, medicion.consultas)
+        metrics.registro.observar("siprosa_http_db_duration_seconds", etiquetas, medicion.tiempo_db)
+        metrics.registro.observar("siprosa_http_render_duration_seconds", etiquetas, medicion.tiempo_render)
+        if not response.streaming:
+            metrics.registro.observar("siprosa_http_response_size_bytes", etiquetas, len(response.content))
+
+        umbral = settings.METRICS_SLOW_REQUEST_MS
+        if umbral and total * 1000 >= umbral:
+            logger.warning(
+                "Petición lenta %s %s (%s/%s): %.0f ms, %s consultas en %.0f ms",
+                request.method,
+                request.path,
+                medicion.vista,
+                medicion.accion,
+                total * 1000,
+                medicion.consultas,
+                medicion.tiempo_db * 1000,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        medicion = getattr(request, "_medicion", None)
+        if medicion is None:
+            return None
+        match = request.resolver_match
+        medicion.vista = (match.view_name or match.route) if match else "<sin_resolver>"
+        # Los ViewSets exponen el mapeo método -> acción en la vista generada.
+        acciones = getattr(view_func, "actions", None) or {}
+        medicion.accion = acciones.get(request.method.lower(), request.method.lower())
+        return None
+
+    def process_template_response(self, request, response):
+        medicion = getattr(request, "_medicion", None)
+        if medicion is not None:
+            medicion.inicio_render = time.perf_counter()
+            response.add_post_render_callback(lambda r: self._fin_render(medicion))
+        return response
+
+    @staticmethod
+    def _fin_render(medicion):
+        if medicion.inicio_render is not None:
+            medicion.tiempo_render = time.perf_counter() - medicion.inicio_render
+
+
+class RateLimitHeadersMiddleware:
+    """Publica ``RateLimit-*`` cuando algún throttle evaluó la petición.
+
+    Los throttles de ``backend.core.throttles`` dejan en ``request.limite_tasa``
+    el límite, las peticiones restantes y los segundos hasta el reinicio.
+    ``Retry-After`` en las respuestas 429 lo agrega DRF con ``wait()``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        info = getattr(request, "limite_tasa", None)
+        if info is not None:
+            response["RateLimit-Limit"] = str(info["limite"])
+            response["RateLimit-Remaining"] = str(info["restantes"])
+            response["RateLimit-Reset"] = str(info["reinicio"])
+            response["RateLimit-Policy"] = f'{info["limite"]};w={info["ventana"]}'
+        return response
+
+
+class IdempotencyMiddleware:
+    """Aplica ``Idempotency-Key`` a los POST (ver ``backend.core.idempotencia``).
+
+    En ``process_view`` reserva la clave o responde con la respuesta guardada
+    sin ejecutar la vista; al terminar la petición guarda la respuesta o
+    libera la clave.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        reserva = getattr(request, "_idempotencia", None)
+        if reserva is not None:
+            idempotencia.finalizar(reserva, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in settings.IDEMPOTENCY_METHODS
+            or not request.headers.get(idempotencia.CABECERA, "").strip()
+            or idempotencia.es_exenta(view_func)
+        ):
+            return None
+        reserva, respuesta = idempotencia.iniciar(request)
+        request._idempotencia = reserva
+        return respuesta
+
+
+# Tipos que vale la pena comprimir; imágenes, PDFs y XLSX ya vienen comprimidos.
+_COMPRIMIBLES = ("text/", "application/json", "application/javascript", "application/xml")
+_SUFIJOS_COMPRIMIBLES = ("+json", "+xml")
+
+
+def _calidades(accept_encoding):
+    """``"br;q=0.9, gzip"`` -> ``{"br": 0.9, "gzip": 1.0}``."""
+
+    calidades = {}
+    for parte in accept_encoding.split(","):
+        nombre, *parametros = parte.strip().split(";")
+        calidad = 1.0
+        for parametro in parametros:
+            clave, _, valor = parametro.strip().partition("=")
+            if clave.strip().lower() == "q":
+                try:
+                    calidad = float(valor)
+                except ValueError:
+                    calidad = 0.0
+        if nombre.strip():
+            calidades[nombre.strip().lower()] = calidad
+    return calidades
+
+
+def elegir_codificacion(accept_encoding):
+    """Codificación a usar según ``Accept-Encoding`` o ``None``; a igual calidad gana brotli."""
+
+    calidades = _calidades(accept_encoding)
+    comodin = calidades.get("*", 0.0)
+    disponibles = codificaciones_disponibles()
+    puntajes = [(calidades.get(nombre, comodin), -orden, nombre) for orden, nombre in enumerate(disponibles)]
+    calidad, _, nombre = max(puntajes)
+    return nombre if calidad > 0 else None
+
+
+def _brotli_secuencia(partes, calidad):
+    compresor = brotli.Compressor(quality=calidad)
+    for parte in partes:
+        # ``flush`` por parte: el cliente recibe cada bloque sin esperar al final.
+        datos = compresor.process(parte) + compresor.flush()
+        if datos:
+            yield datos
+    yield compresor.finish()
+
+
+def comprimir(contenido, codificacion, max_random_bytes=100):
+    """``contenido`` comprimido con ``codificacion`` (``"br"`` o ``"gzip"``)."""
+
+    if codificacion == "br":
+        return brotli.compress(contenido, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # Relleno aleatorio de gzip contra BREACH, el mismo que usa Django.
+    return compress_string(contenido, max_random_bytes=max_random_bytes)
+
+
+def codificaciones_disponibles():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def comprimible(response):
+    """Si ``CompressionMiddleware`` comprimiría ``response``."""
+
+    if response.has_header("Content-Encoding") or response.status_code in (204, 304):
+        return False
+    if "no-transform" in response.get("Cache-Control", ""):
+        return False
+    if response.streaming:
+        if response.is_async:
+            return False
+    elif len(response.content) < settings.COMPRESSION_MIN_BYTES:
+        return False
+    tipo = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return tipo.startswith(_COMPRIMIBLES) or tipo.endswith(_SUFIJOS_COMPRIMIBLES)
+
+
+class CompressionMiddleware:
+    """Comprime las respuestas con brotli o gzip según ``Accept-Encoding``.
+
+    Como ``GZipMiddleware`` de Django, pero con brotli si está instalado,
+    solo para tipos de texto y por encima de ``COMPRESSION_MIN_BYTES``. Las
+    respuestas en streaming (exportaciones) se comprimen bloque a bloque.
+    Va después de ``PerformanceMetricsMiddleware`` para que el tamaño medido
+    sea el que viaja por la red.
+    """
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not comprimible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codificacion = elegir_codificacion(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codificacion is None:
+            return response
+
+        if response.streaming:
+            if codificacion == "br":
+                contenido = _brotli_secuencia(response.streaming_content, settings.COMPRESSION_BROTLI_QUALITY)
+            else:
+                contenido = compress_sequence(response.streaming_content, max_random_bytes=self.max_random_bytes)
+            response.streaming_content = contenido
+            # El tamaño comprimido no se conoce hasta terminar de enviar.
+            del response.headers["Content-Length"]
+        else:
+            comprimido = comprimir(response.content, codificacion, self.max_random_bytes)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response.headers["Content-Length"] = str(len(comprimido))
+
+        # Un ETag fuerte deja de valer para el cuerpo comprimido (RFC 9110 8.8.1).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codificacion
+        return response
@@ -1,5 +1,44 @@
 """El módulo ``core`` no define modelos concretos.
 
-Este archivo se mantiene para cumplir con las convenciones de Django y
-facilitar futuras extensiones transversales.
+Solo contiene modelos proxy transversales, como el usuario construido a
+partir de los claims del JWT.
 """
+
+from django.contrib.auth import get_user_model
+
+UserModel = get_user_model()
+
+
+class UsuarioToken(UserModel):
+    """Usuario armado desde los claims del access token, sin leer la base.
+
+    Solo trae cargados los campos presentes en el token; el resto queda
+    diferido. Al tocar cualquiera de ellos se cargan todos en una única
+    consulta en lugar de una por campo.
+
+    Los valores del token pueden estar vencidos (un usuario degradado o
+    desactivado conserva su access token hasta que expira). ``save`` los
+    relee de la base antes de escribir, salvo los que el código cambió.
+    """
+
+    _valores_token = None
+
+    class Meta:
+        proxy = True
+        default_permissions = ()
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        diferidos = self.get_deferred_fields()
+        if fields is not None and diferidos:
+            fields = set(fields) | diferidos
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+    def save(self, *args, **kwargs):
+        if self._valores_token and self.pk is not None:
+            actuales = type(self)._default_manager.filter(pk=self.pk).values(*self._valores_token).first()
+            if actuales is not None:
+                for campo, valor in self._valores_token.items():
+                    if getattr(self, campo) == valor:
+                        setattr(self, campo, actuales[campo])
+            self._valores_token = None
+        super().save(*args, **kwargs)
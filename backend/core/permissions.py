@@ -2,7 +2,13 @@
 from rest_framework.permissions import BasePermission
 
 def _is_in(user, group_name: str) -> bool:
-    return user.is_authenticated and user.groups.filter(name=group_name).exists()
+    if not user.is_authenticated:
+        return False
+    # Con autenticación sin estado los grupos vienen en el token.
+    grupos_token = getattr(user, "grupos_token", None)
+    if grupos_token is not None:
+        return group_name in grupos_token
+    return user.groups.filter(name=group_name).exists()
 
 def is_admin(user) -> bool:
     """Determina si el usuario debe ser considerado administrador."""
@@ -0,0 +1,38 @@
+"""Renderer JSON con orjson.
+
+Produce los mismos bytes que ``rest_framework.renderers.JSONRenderer`` con la
+configuración por defecto (compacto, UTF-8 sin escapar), pero varias veces
+más rápido en listados grandes. Los tipos que orjson no resuelve igual que
+DRF (``datetime``, ``Decimal``, textos diferidos, querysets) pasan por el
+``JSONEncoder`` de DRF. Sin orjson instalado se comporta como el de DRF.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+_encoder = JSONEncoder()
+# Las fechas van al encoder de DRF: recorta a milisegundos y usa ``Z`` para UTC.
+_OPCIONES = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # ``; indent=4`` en el Accept: orjson solo sabe indentar con 2 espacios.
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            contenido = orjson.dumps(data, default=_encoder.default, option=_OPCIONES)
+        except orjson.JSONEncodeError:
+            # Enteros de más de 64 bits u otros casos que solo resuelve ``json``.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Igual que DRF: separadores de línea de JavaScript escapados.
+        if b"\xe2\x80\xa8" in contenido or b"\xe2\x80\xa9" in contenido:
+            contenido = contenido.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return contenido
@@ -0,0 +1,557 @@
+"""Siembra de una planta sintética y medición de latencia de los endpoints.
+
+``sembrar_planta`` genera catálogos y registros con ``bulk_create`` por lotes
+(memoria constante aun con millones de filas). ``medir_endpoints`` recorre
+los routers registrados y mide listados, detalles y altas a través del
+cliente de pruebas de Django, con autenticación JWT real.
+"""
+
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import time as hora, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.test import Client
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.core.services.rutas import viewsets_registrados
+
+ESCALAS = {
+    "mini": {
+        "ubicaciones": 4,
+        "maquinas": 20,
+        "productos": 30,
+        "etapas": 8,
+        "formulas": 40,
+        "operarios": 5,
+        "registros": 500,
+        "incidentes": 100,
+        "mantenimientos": 100,
+        "observaciones": 50,
+    },
+    "media": {
+        "ubicaciones": 10,
+        "maquinas": 200,
+        "productos": 600,
+        "etapas": 25,
+        "formulas": 2_000,
+        "operarios": 60,
+        "registros": 100_000,
+        "incidentes": 20_000,
+        "mantenimientos": 30_000,
+        "observaciones": 10_000,
+    },
+    "planta": {
+        "ubicaciones": 20,
+        "maquinas": 500,
+        "productos": 1_500,
+        "etapas": 40,
+        "formulas": 5_000,
+        "operarios": 200,
+        "registros": 2_000_000,
+        "incidentes": 300_000,
+        "mantenimientos": 500_000,
+        "observaciones": 100_000,
+    },
+}
+
+TAMANO_LOTE = 5_000
+PASSWORD_OPERARIOS = "bench-operario"
+
+
+def _modelo(etiqueta):
+    return apps.get_model(*etiqueta.split("."))
+
+
+def _por_lotes(filas, modelo, tamano=TAMANO_LOTE):
+    """Inserta un generador de instancias en lotes y devuelve la cantidad."""
+
+    total = 0
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) >= tamano:
+            modelo.objects.bulk_create(lote)
+            total += len(lote)
+            lote = []
+    if lote:
+        modelo.objects.bulk_create(lote)
+        total += len(lote)
+    return total
+
+
+def _momento(rnd, ahora, dias=365):
+    return ahora - timedelta(seconds=rnd.randint(3_600, dias * 86_400))
+
+
+def sembrar_planta(escala, semilla=0, informar=None):
+    """Puebla la base con una planta de tamaño ``escala`` (dict de cantidades).
+
+    Devuelve el conteo de filas creadas por modelo. ``informar`` recibe
+    mensajes de progreso.
+    """
+
+    informar = informar or (lambda mensaje: None)
+    rnd = random.Random(semilla)
+    ahora = timezone.now()
+    creadas = {}
+
+    Ubicacion = _modelo("catalogos.Ubicacion")
+    Maquina = _modelo("catalogos.Maquina")
+    Producto = _modelo("catalogos.Producto")
+    Parametro = _modelo("catalogos.Parametro")
+    EtapaProduccion = _modelo("catalogos.EtapaProduccion")
+    Formula = _modelo("catalogos.Formula")
+    FormulaEtapa = _modelo("catalogos.FormulaEtapa")
+    FormulaIngrediente = _modelo("catalogos.FormulaIngrediente")
+    Turno = _modelo("catalogos.Turno")
+    Funcion = _modelo("catalogos.Funcion")
+    RegistroProduccion = _modelo("produccion.RegistroProduccion")
+    RegistroProduccionEtapa = _modelo("produccion.RegistroProduccionEtapa")
+    RegistroMantenimiento = _modelo("mantenimiento.RegistroMantenimiento")
+    Incidente = _modelo("incidentes.Incidente")
+    ObservacionGeneral = _modelo("observaciones.ObservacionGeneral")
+    UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+    informar("Catálogos...")
+    Turno.objects.bulk_create(
+        [
+            Turno(codigo="M", nombre="Mañana", hora_inicio=hora(6), hora_fin=hora(14)),
+            Turno(codigo="T", nombre="Tarde", hora_inicio=hora(14), hora_fin=hora(22)),
+            Turno(codigo="N", nombre="Noche", hora_inicio=hora(22), hora_fin=hora(6)),
+        ],
+        ignore_conflicts=True,
+    )
+    turnos = list(Turno.objects.all())
+    funciones = Funcion.objects.bulk_create(
+        [Funcion(codigo=f"BF-{i:02d}", nombre=f"Función {i}") for i in range(1, 5)]
+    )
+
+    ubicaciones = Ubicacion.objects.bulk_create(
+        [Ubicacion(codigo=f"BU-{i:04d}", nombre=f"Área {i}") for i in range(escala["ubicaciones"])]
+    )
+    tipos_maquina = [valor for valor, _ in Maquina.TIPO_CHOICES]
+    maquinas = Maquina.objects.bulk_create(
+        [
+            Maquina(
+                codigo=f"BM-{i:05d}",
+                nombre=f"Máquina {i}",
+                tipo=rnd.choice(tipos_maquina),
+                fabricante=rnd.choice(["Fette", "Korsch", "Glatt", "Uhlmann", "IMA"]),
+                ubicacion=rnd.choice(ubicaciones),
+                activa=rnd.random() > 0.05,
+            )
+            for i in range(escala["maquinas"])
+        ]
+    )
+    tipos_producto = [valor for valor, _ in Producto.TIPO_CHOICES]
+    presentaciones = [valor for valor, _ in Producto.PRESENTACION_CHOICES]
+    productos = Producto.objects.bulk_create(
+        [
+            Producto(
+                codigo=f"BP-{i:05d}",
+                nombre=f"Producto {i}",
+                tipo=rnd.choice(tipos_producto),
+                presentacion=rnd.choice(presentaciones),
+                concentracion=f"{rnd.choice([5, 10, 50, 100, 250, 500])}mg",
+                activo=rnd.random() > 0.05,
+            )
+            for i in range(escala["productos"])
+        ]
+    )
+    parametros = Parametro.objects.bulk_create(
+        [Parametro(codigo=f"BPAR-{i:03d}", nombre=f"Parámetro {i}", unidad="kg") for i in range(20)]
+    )
+    etapas = EtapaProduccion.objects.bulk_create(
+        [EtapaProduccion(codigo=f"BE-{i:03d}", nombre=f"Etapa {i}") for i in range(escala["etapas"])]
+    )
+    EtapaProduccion.maquinas_permitidas.through.objects.bulk_create(
+        [
+            EtapaProduccion.maquinas_permitidas.through(etapaproduccion=etapa, maquina=maquina)
+            for etapa in etapas
+            for maquina in rnd.sample(maquinas, min(len(maquinas), 5))
+        ]
+    )
+    EtapaProduccion.parametros.through.objects.bulk_create(
+        [
+            EtapaProduccion.parametros.through(etapaproduccion=etapa, parametro=parametro)
+            for etapa in etapas
+            for parametro in rnd.sample(parametros, 3)
+        ]
+    )
+
+    informar("Fórmulas...")
+    formulas = Formula.objects.bulk_create(
+        [
+            Formula(codigo=f"BF-{i:05d}", version="1.0", producto=rnd.choice(productos))
+            for i in range(escala["formulas"])
+        ],
+        batch_size=TAMANO_LOTE,
+    )
+    _por_lotes(
+        (
+            FormulaEtapa(formula=formula, etapa=etapa, orden=orden, duracion_estimada_min=rnd.randint(15, 240))
+            for formula in formulas
+            for orden, etapa in enumerate(rnd.sample(etapas, min(len(etapas), rnd.randint(3, 6))))
+        ),
+        FormulaEtapa,
+    )
+    _por_lotes(
+        (
+            FormulaIngrediente(
+                formula=formula,
+                material=material,
+                cantidad=Decimal(rnd.randint(1, 50_000)) / 1000,
+                unidad="kg",
+                orden=orden,
+            )
+            for formula in formulas
+            for orden, material in enumerate(rnd.sample(productos, min(len(productos), rnd.randint(2, 8))))
+        ),
+        FormulaIngrediente,
+    )
+    etapas_por_formula = {}
+    for formula_id, etapa_id in FormulaEtapa.objects.order_by("formula_id", "orden").values_list("formula_id", "id"):
+        etapas_por_formula.setdefault(formula_id, []).append(etapa_id)
+
+    informar("Operarios...")
+    password = make_password(PASSWORD_OPERARIOS)
+    operarios = []
+    for i in range(escala["operarios"]):
+        usuario = UserModel(username=f"bench-op-{i:04d}", first_name="Operario", last_name=str(i), password=password)
+        usuario.save()
+        perfil = getattr(usuario, "user_profile", None)
+        if perfil is not None:
+            perfil.funcion = rnd.choice(funciones)
+            perfil.turno_habitual = rnd.choice(turnos)
+            perfil.save()
+        operarios.append(usuario)
+
+    creadas["catalogos"] = {
+        "ubicaciones": len(ubicaciones),
+        "maquinas": len(maquinas),
+        "productos": len(productos),
+        "etapas": len(etapas),
+        "formulas": len(formulas),
+        "operarios": len(operarios),
+    }
+
+    informar(f"Registros de producción ({escala['registros']})...")
+    estados = ["CREADO", "EN_PROCESO", "COMPLETADO", "COMPLETADO", "COMPLETADO", "CANCELADO"]
+    total_registros = total_etapas = 0
+    restantes = escala["registros"]
+    while restantes > 0:
+        cantidad = min(TAMANO_LOTE, restantes)
+        lote = []
+        for _ in range(cantidad):
+            formula = rnd.choice(formulas)
+            inicio = _momento(rnd, ahora)
+            lote.append(
+                RegistroProduccion(
+                    estado=rnd.choice(estados),
+                    producto_id=formula.producto_id,
+                    formula=formula,
+                    maquina=rnd.choice(maquinas),
+                    turno=rnd.choice(turnos),
+                    hora_inicio=inicio,
+                    hora_fin=inicio + timedelta(minutes=rnd.randint(30, 600)),
+                    cantidad_producida=Decimal(rnd.randint(1_000, 500_000)),
+                    unidad_medida="unidades",
+                    registrado_por=rnd.choice(operarios),
+                )
+            )
+        RegistroProduccion.objects.bulk_create(lote)
+        etapas_lote = []
+        for registro in lote:
+            momento = registro.hora_inicio
+            for etapa_id in etapas_por_formula.get(registro.formula_id, []):
+                duracion = rnd.randint(10, 120)
+                completada = registro.estado == "COMPLETADO"
+                etapas_lote.append(
+                    RegistroProduccionEtapa(
+                        registro_id=registro.pk,
+                        etapa_id=etapa_id,
+                        hora_inicio=momento,
+                        hora_fin=momento + timedelta(minutes=duracion) if completada else None,
+                        duracion_real=duracion if completada else None,
+                        maquina=registro.maquina if completada else None,
+                        completada=completada,
+                    )
+                )
+                momento += timedelta(minutes=duracion)
+        RegistroProduccionEtapa.objects.bulk_create(etapas_lote, batch_size=TAMANO_LOTE)
+        total_registros += len(lote)
+        total_etapas += len(etapas_lote)
+        restantes -= cantidad
+
+    informar(f"Mantenimientos ({escala['mantenimientos']}) e incidentes ({escala['incidentes']})...")
+    tipos_mantenimiento = [valor for valor, _ in RegistroMantenimiento.TIPO_CHOICES]
+
+    def _mantenimientos():
+        for _ in range(escala["mantenimientos"]):
+            inicio = _momento(rnd, ahora)
+            anomalias = rnd.random() < 0.15
+            yield RegistroMantenimiento(
+                hora_inicio=inicio,
+                hora_fin=inicio + timedelta(minutes=rnd.randint(15, 480)),
+                maquina=rnd.choice(maquinas),
+                tipo_mantenimiento=rnd.choice(tipos_mantenimiento),
+                descripcion="Mantenimiento programado de rutina",
+                tiene_anomalias=anomalias,
+                descripcion_anomalias="Vibración fuera de rango" if anomalias else "",
+                registrado_por=rnd.choice(operarios),
+            )
+
+    origenes = [valor for valor, _ in Incidente.ORIGEN_CHOICES]
+
+    def _incidentes():
+        for _ in range(escala["incidentes"]):
+            inicio = _momento(rnd, ahora)
+            yield Incidente(
+                fecha_inicio=inicio,
+                fecha_fin=inicio + timedelta(minutes=rnd.randint(5, 240)),
+                es_parada_no_planificada=rnd.random() < 0.7,
+                origen=rnd.choice(origenes),
+                maquina=rnd.choice(maquinas),
+                descripcion="Parada por atasco en alimentación",
+            )
+
+    def _observaciones():
+        for i in range(escala["observaciones"]):
+            yield ObservacionGeneral(texto=f"Novedad de turno {i}", creado_por=rnd.choice(operarios))
+
+    creadas["registros"] = total_registros
+    creadas["registro_etapas"] = total_etapas
+    creadas["mantenimientos"] = _por_lotes(_mantenimientos(), RegistroMantenimiento)
+    creadas["incidentes"] = _por_lotes(_incidentes(), Incidente)
+    creadas["observaciones"] = _por_lotes(_observaciones(), ObservacionGeneral)
+    return creadas
+
+
+# --- Medición ---------------------------------------------------------------
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano sobre ``valores`` (no vacío)."""
+
+    ordenados = sorted(valores)
+    indice = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[indice]
+
+
+@dataclass
+class Medicion:
+    """Muestras acumuladas de un endpoint con una variante de parámetros."""
+
+    endpoint: str
+    url: str
+    metodo: str
+    variante: Dict[str, str]
+    latencias: List[float] = field(default_factory=list)
+    consultas: List[int] = field(default_factory=list)
+    bytes: List[int] = field(default_factory=list)
+    estados: Dict[str, int] = field(default_factory=dict)
+
+    def agregar(self, latencia, consultas, tamano, estado):
+        self.latencias.append(latencia)
+        self.consultas.append(consultas)
+        self.bytes.append(tamano)
+        self.estados[str(estado)] = self.estados.get(str(estado), 0) + 1
+
+    def resumen(self):
+        milisegundos = [valor * 1000 for valor in self.latencias]
+        return {
+            "endpoint": self.endpoint,
+            "url": self.url,
+            "metodo": self.metodo,
+            "variante": self.variante,
+            "muestras": len(self.latencias),
+            "estados": self.estados,
+            "latencia_ms": {
+                "p50": round(percentil(milisegundos, 50), 3),
+                "p95": round(percentil(milisegundos, 95), 3),
+                "p99": round(percentil(milisegundos, 99), 3),
+                "media": round(statistics.fmean(milisegundos), 3),
+                "max": round(max(milisegundos), 3),
+            },
+            "consultas": {"p50": percentil(self.consultas, 50), "max": max(self.consultas)},
+            "bytes": {"p50": percentil(self.bytes, 50), "max": max(self.bytes)},
+        }
+
+
+class _ContadorConsultas:
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+def _contexto_escritura():
+    """Claves de catálogos para armar altas sin consultar dentro de la medición."""
+
+    Formula = _modelo("catalogos.Formula")
+    Maquina = _modelo("catalogos.Maquina")
+    return {
+        "formulas": list(Formula.objects.order_by("-pk").values_list("pk", "producto_id")[:200]),
+        "maquinas": list(Maquina.objects.order_by("-pk").values_list("pk", flat=True)[:200]),
+    }
+
+
+def _carga_produccion(rnd, ahora, contexto):
+    formula, producto = rnd.choice(contexto["formulas"])
+    inicio = ahora - timedelta(hours=rnd.randint(2, 48))
+    return {
+        "producto": producto,
+        "formula": formula,
+        "maquina": rnd.choice(contexto["maquinas"]),
+        "hora_inicio": inicio.isoformat(),
+        "hora_fin": (inicio + timedelta(hours=1)).isoformat(),
+        "cantidad_producida": "1200.00",
+        "unidad_medida": "unidades",
+    }
+
+
+def _carga_mantenimiento(rnd, ahora, contexto):
+    inicio = ahora - timedelta(hours=rnd.randint(2, 48))
+    return {
+        "maquina": rnd.choice(contexto["maquinas"]),
+        "tipo_mantenimiento": "PREVENTIVO",
+        "hora_inicio": inicio.isoformat(),
+        "hora_fin": (inicio + timedelta(minutes=45)).isoformat(),
+        "descripcion": "Cambio de punzones",
+    }
+
+
+def _carga_incidente(rnd, ahora, contexto):
+    inicio = ahora - timedelta(hours=rnd.randint(2, 48))
+    return {
+        "maquina": rnd.choice(contexto["maquinas"]),
+        "origen": "produccion",
+        "fecha_inicio": inicio.isoformat(),
+        "fecha_fin": (inicio + timedelta(minutes=20)).isoformat(),
+        "descripcion": "Atasco en tolva",
+    }
+
+
+def _carga_observacion(rnd, ahora, contexto):
+    return {"texto": f"Novedad {rnd.randint(1, 10_000)}"}
+
+
+# basename del router -> generador del cuerpo de un alta válida.
+CARGAS_ESCRITURA = {
+    "registro-produccion": _carga_produccion,
+    "registro-mantenimiento": _carga_mantenimiento,
+    "incidente": _carga_incidente,
+    "observacion-general": _carga_observacion,
+}
+
+
+def _variantes(viewset, muestra, tamanos_pagina):
+    """Combinaciones de tamaño de página y filtros declarados en el ViewSet."""
+
+    filtros = [{}]
+    ordenamientos = getattr(viewset, "ordering_fields", None) or []
+    if ordenamientos and ordenamientos != "__all__":
+        filtros.append({"ordering": f"-{ordenamientos[0]}"})
+    busqueda = getattr(viewset, "search_fields", None) or []
+    if busqueda:
+        filtros.append({"search": "1"})
+    campos = getattr(viewset, "filterset_fields", None) or []
+    for campo in list(campos)[:2]:
+        valor = getattr(muestra, f"{campo}_id", None) if muestra is not None else None
+        if valor is None and muestra is not None:
+            valor = getattr(muestra, campo, None)
+        if valor is not None and not hasattr(valor, "_meta"):
+            filtros.append({campo: str(valor).lower() if isinstance(valor, bool) else str(valor)})
+
+    return [{"page_size": str(tamano), **filtro} for tamano in tamanos_pagina for filtro in filtros]
+
+
+def medir_endpoints(
+    usuario,
+    iteraciones=30,
+    calentamiento=3,
+    tamanos_pagina=(10, 50, 200),
+    solo=None,
+    semilla=0,
+    informar=None,
+):
+    """Mide cada endpoint de los routers y devuelve la lista de resúmenes."""
+
+    informar = informar or (lambda mensaje: None)
+    rnd = random.Random(semilla)
+    token = str(RefreshToken.for_user(usuario).access_token)
+    cliente = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {token}")
+    contexto = _contexto_escritura()
+    mediciones = []
+
+    def _medir(medicion, ejecutar, preparar=lambda: ()):
+        for indice in range(calentamiento + iteraciones):
+            argumentos = preparar()
+            contador = _ContadorConsultas()
+            with connections["default"].execute_wrapper(contador):
+                inicio = time.perf_counter()
+                respuesta = ejecutar(*argumentos)
+                latencia = time.perf_counter() - inicio
+            if indice >= calentamiento:
+                tamano = 0 if respuesta.streaming else len(respuesta.content)
+                medicion.agregar(latencia, contador.total, tamano, respuesta.status_code)
+        mediciones.append(medicion)
+
+    for registrado in viewsets_registrados():
+        modelo = registrado.modelo
+        if modelo is None or (solo and not any(nombre in registrado.basename for nombre in solo)):
+            continue
+        informar(f"Midiendo {registrado.basename}...")
+        muestra = modelo._default_manager.order_by("-pk").first()
+
+        try:
+            url = reverse(f"{registrado.basename}-list")
+        except NoReverseMatch:
+            continue
+
+        if registrado.tiene_accion("list"):
+            for variante in _variantes(registrado.viewset, muestra, tamanos_pagina):
+                _medir(
+                    Medicion(f"{registrado.basename}-list", url, "GET", variante),
+                    lambda url=url, variante=variante: cliente.get(url, variante),
+                )
+
+        if registrado.tiene_accion("retrieve") and muestra is not None:
+            claves = list(modelo._default_manager.order_by("pk").values_list("pk", flat=True)[:100])
+            claves += list(modelo._default_manager.order_by("-pk").values_list("pk", flat=True)[:100])
+            _medir(
+                Medicion(f"{registrado.basename}-detail", f"{url}{{pk}}/", "GET", {}),
+                lambda clave, url=url: cliente.get(f"{url}{clave}/"),
+                lambda claves=claves: (rnd.choice(claves),),
+            )
+
+        carga = CARGAS_ESCRITURA.get(registrado.basename)
+        if carga and registrado.tiene_accion("create"):
+
+            def _alta(cuerpo, url=url):
+                # Cada alta se revierte para que corridas sucesivas midan la misma base.
+                with transaction.atomic():
+                    respuesta = cliente.post(url, cuerpo, content_type="application/json")
+                    transaction.set_rollback(True)
+                return respuesta
+
+            _medir(
+                Medicion(f"{registrado.basename}-list", url, "POST", {}),
+                _alta,
+                lambda carga=carga: (carga(rnd, timezone.now(), contexto),),
+            )
+
+    return [medicion.resumen() for medicion in mediciones]
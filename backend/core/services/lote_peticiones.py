@@ -0,0 +1,203 @@
+"""Despacho en proceso de varias peticiones a la API en un solo viaje.
+
+Cada subpetición ``{"method", "path", "query", "body"}`` se arma como una
+petición WSGI con las cabeceras de la original, se resuelve con el
+``URLconf`` y se entrega a la vista sin pasar por los middlewares. La
+autenticación ya resuelta se reutiliza (``_force_auth_user``): las
+subpeticiones no vuelven a validar el token ni a leer el usuario.
+
+Los middlewares solo procesan el ``POST /api/batch/``: las subpeticiones no
+pasan por idempotencia (``Idempotency-Key``), ``RateLimit-*``, compresión
+ni métricas por vista, que se registran una vez para el lote completo.
+
+Con el pool de conexiones de psycopg (``DB_POOL``) las lecturas
+consecutivas se ejecutan en paralelo en un ejecutor de hilos compartido por
+el proceso (``BATCH_MAX_WORKERS`` hilos); cada hilo devuelve su conexión al
+pool al terminar. Sin pool cada hilo abriría y cerraría una conexión nueva,
+así que todo corre en el hilo actual. Las escrituras se ejecutan en orden y
+separan esos grupos. Dentro de una transacción abierta (``ATOMIC_REQUESTS``,
+tests) tampoco hay paralelismo: otras conexiones no verían los datos sin
+confirmar.
+"""
+
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from backend.core.db import usa_pool
+
+logger = logging.getLogger(__name__)
+
+METODOS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"}
+LECTURAS = {"GET", "HEAD"}
+_CABECERAS_RESPUESTA = ("Location", "ETag", "Last-Modified")
+# Cabeceras de la petición original que no aplican a las subpeticiones.
+_EXCLUIDAS = {"CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_IDEMPOTENCY_KEY", "HTTP_ACCEPT_ENCODING"}
+
+_hilos = None
+_candado_hilos = threading.Lock()
+
+
+class SubpeticionInvalida(ValueError):
+    """La subpetición no puede despacharse (método, ruta o cuerpo inválidos)."""
+
+
+def _ruta_y_consulta(peticion):
+    partes = urlsplit(str(peticion.get("path") or ""))
+    if not partes.path.startswith("/api/") or partes.netloc:
+        raise SubpeticionInvalida("La ruta debe empezar con /api/")
+    consulta = peticion.get("query") or ""
+    if isinstance(consulta, dict):
+        consulta = urlencode(consulta, doseq=True)
+    consulta = "&".join(parte for parte in (partes.query, str(consulta)) if parte)
+    return partes.path, consulta
+
+
+def armar_peticion(original, peticion):
+    """``WSGIRequest`` para ``peticion`` con las cabeceras de ``original``."""
+
+    if not isinstance(peticion, dict):
+        raise SubpeticionInvalida("Cada subpetición debe ser un objeto")
+    metodo = str(peticion.get("method") or "GET").upper()
+    if metodo not in METODOS:
+        raise SubpeticionInvalida(f"Método no soportado: {metodo}")
+    ruta, consulta = _ruta_y_consulta(peticion)
+    cuerpo = b""
+    if "body" in peticion and peticion["body"] is not None:
+        cuerpo = json.dumps(peticion["body"]).encode()
+
+    entorno = {
+        clave: valor
+        for clave, valor in original.META.items()
+        if isinstance(clave, str) and clave.isupper() and clave not in _EXCLUIDAS
+    }
+    entorno.update(
+        {
+            "REQUEST_METHOD": metodo,
+            "PATH_INFO": ruta,
+            "SCRIPT_NAME": original.META.get("SCRIPT_NAME", ""),
+            "QUERY_STRING": consulta,
+            "HTTP_ACCEPT": "application/json",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(cuerpo)),
+            "wsgi.input": BytesIO(cuerpo),
+            "wsgi.url_scheme": original.scheme,
+        }
+    )
+    subpeticion = WSGIRequest(entorno)
+    subpeticion.user = getattr(original, "user", None)
+    # DRF toma la autenticación de la petición original en vez de repetirla.
+    subpeticion._force_auth_user = getattr(original, "user", None)
+    subpeticion._force_auth_token = getattr(original, "auth", None)
+    return subpeticion
+
+
+def _cuerpo(respuesta):
+    datos = getattr(respuesta, "data", None)
+    if datos is not None or respuesta.status_code == 204:
+        return datos
+    if hasattr(respuesta, "render"):
+        respuesta.render()
+    if not respuesta.content:
+        return None
+    if "json" in respuesta.get("Content-Type", ""):
+        return json.loads(respuesta.content)
+    return respuesta.content.decode(respuesta.charset or "utf-8", errors="replace")
+
+
+def _resultado(status, cuerpo, cabeceras=None):
+    resultado = {"status": status, "body": cuerpo}
+    if cabeceras:
+        resultado["headers"] = cabeceras
+    return resultado
+
+
+def ejecutar(original, peticion, excluir=()):
+    """Despacha una subpetición y devuelve ``{"status", "body"[, "headers"]}``."""
+
+    try:
+        subpeticion = armar_peticion(original, peticion)
+        coincidencia = resolve(subpeticion.path_info)
+    except SubpeticionInvalida as exc:
+        return _resultado(400, {"detail": str(exc)})
+    except Resolver404:
+        return _resultado(404, {"detail": "No encontrado."})
+    if coincidencia.func in excluir or getattr(coincidencia.func, "cls", None) in excluir:
+        return _resultado(400, {"detail": "Esta ruta no puede incluirse en un lote"})
+
+    subpeticion.resolver_match = coincidencia
+    try:
+        respuesta = coincidencia.func(subpeticion, *coincidencia.args, **coincidencia.kwargs)
+        if getattr(respuesta, "streaming", False):
+            return _resultado(400, {"detail": "Las respuestas en streaming no se admiten en un lote"})
+        cuerpo = _cuerpo(respuesta)
+    except Exception:
+        logger.error("Error en subpetición %s", peticion.get("path"), exc_info=sys.exc_info())
+        return _resultado(500, {"detail": "Error interno del servidor."})
+    cabeceras = {nombre: respuesta[nombre] for nombre in _CABECERAS_RESPUESTA if nombre in respuesta}
+    return _resultado(respuesta.status_code, cuerpo, cabeceras)
+
+
+def _ejecutar_en_hilo(original, peticion, excluir):
+    try:
+        return ejecutar(original, peticion, excluir)
+    finally:
+        # Las conexiones son por hilo: se devuelven al pool al terminar.
+        connections.close_all()
+
+
+def _ejecutor():
+    global _hilos
+
+    with _candado_hilos:
+        if _hilos is None:
+            _hilos = ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix="lote")
+        return _hilos
+
+
+def _es_lectura(peticion):
+    return isinstance(peticion, dict) and str(peticion.get("method") or "GET").upper() in LECTURAS
+
+
+def _en_transaccion():
+    return any(conexion.in_atomic_block for conexion in connections.all(initialized_only=True))
+
+
+def despachar(original, peticiones, excluir=()):
+    """Ejecuta ``peticiones`` y devuelve sus resultados en el mismo orden."""
+
+    resultados = [None] * len(peticiones)
+    paralelo = settings.BATCH_MAX_WORKERS > 1 and usa_pool() and not _en_transaccion()
+    lecturas = []
+
+    def vaciar():
+        if paralelo and len(lecturas) > 1:
+            hilos = _ejecutor()
+            futuros = [
+                (indice, hilos.submit(_ejecutar_en_hilo, original, peticiones[indice], excluir))
+                for indice in lecturas
+            ]
+            for indice, futuro in futuros:
+                resultados[indice] = futuro.result()
+        else:
+            for indice in lecturas:
+                resultados[indice] = ejecutar(original, peticiones[indice], excluir)
+        lecturas.clear()
+
+    for indice, peticion in enumerate(peticiones):
+        if _es_lectura(peticion):
+            lecturas.append(indice)
+            continue
+        vaciar()
+        resultados[indice] = ejecutar(original, peticion, excluir)
+    vaciar()
+    return resultados
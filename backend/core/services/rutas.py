@@ -0,0 +1,47 @@
+"""Descubrimiento de los ViewSets registrados en los routers de cada app."""
+
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Iterator, Type
+
+from django.apps import apps
+from rest_framework.routers import BaseRouter
+
+
+@dataclass(frozen=True)
+class ViewSetRegistrado:
+    """Entrada de un router: app de origen, prefijo, clase y basename."""
+
+    app_label: str
+    prefijo: str
+    viewset: Type
+    basename: str
+
+    @property
+    def modelo(self):
+        queryset = getattr(self.viewset, "queryset", None)
+        return queryset.model if queryset is not None else None
+
+    def tiene_accion(self, accion):
+        return hasattr(self.viewset, accion)
+
+
+def viewsets_registrados() -> Iterator[ViewSetRegistrado]:
+    """Recorre ``backend/<app>/urls.py`` y devuelve los ViewSets de sus routers."""
+
+    for config in apps.get_app_configs():
+        if not config.name.startswith("backend."):
+            continue
+        try:
+            modulo = import_module(f"{config.name}.urls")
+        except ModuleNotFoundError:
+            continue
+        routers = [valor for valor in vars(modulo).values() if isinstance(valor, BaseRouter)]
+        for router in routers:
+            for prefijo, viewset, basename in router.registry:
+                yield ViewSetRegistrado(
+                    app_label=config.label,
+                    prefijo=prefijo,
+                    viewset=viewset,
+                    basename=basename or router.get_default_basename(viewset),
+                )
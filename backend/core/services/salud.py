@@ -0,0 +1,170 @@
+"""Chequeos de dependencias para el endpoint de readiness.
+
+Cada chequeo mide su propia latencia y devuelve ``status`` ``ok``,
+``degradado`` o ``error``. Solo la base de datos y las migraciones
+pendientes vuelven ``error`` al conjunto (el worker no puede atender); el
+resto lo degrada y queda informado.
+
+El resultado se guarda en memoria del proceso durante
+``HEALTH_CHECK_TTL_SECONDS``: los sondeos frecuentes del orquestador no
+repiten las consultas, y mientras un sondeo calcula los demás esperan su
+resultado en lugar de repetirlo.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from backend.core.db import pool_stats
+
+OK = "ok"
+DEGRADADO = "degradado"
+ERROR = "error"
+_GRAVEDAD = {OK: 0, DEGRADADO: 1, ERROR: 2}
+
+_bloqueo = threading.Lock()
+_ultimo = {"momento": None, "resultado": None}
+# Sin migraciones pendientes no hace falta volver a cargar el grafo: el
+# código del proceso no cambia hasta el próximo despliegue.
+_migraciones_al_dia = False
+
+
+def _peor(estados):
+    return max(estados, key=_GRAVEDAD.__getitem__, default=OK)
+
+
+def _medir(chequeo):
+    inicio = time.perf_counter()
+    try:
+        datos = chequeo()
+    except Exception as exc:  # noqa: BLE001 - cualquier falla se informa como error del chequeo
+        datos = {"status": ERROR, "error": f"{exc.__class__.__name__}: {exc}"[:200]}
+    datos["latencia_ms"] = round((time.perf_counter() - inicio) * 1000, 2)
+    return datos
+
+
+def base_de_datos():
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    datos = pool_stats()
+    saturado = datos["pool"] and datos["pool"]["saturacion"] >= settings.HEALTH_POOL_SATURATION
+    return {"status": DEGRADADO if saturado else OK, **datos}
+
+
+def cache():
+    sonda = f"salud:{uuid.uuid4().hex}"
+    alias = {}
+    for nombre in settings.CACHES:
+        inicio = time.perf_counter()
+        try:
+            caches[nombre].set(sonda, 1, timeout=10)
+            estado = OK if caches[nombre].get(sonda) == 1 else DEGRADADO
+            caches[nombre].delete(sonda)
+        except Exception as exc:  # noqa: BLE001
+            estado = DEGRADADO
+            alias[nombre] = {"status": estado, "error": exc.__class__.__name__}
+            continue
+        alias[nombre] = {"status": estado, "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+    return {"status": _peor(datos["status"] for datos in alias.values()), "alias": alias}
+
+
+def migraciones():
+    global _migraciones_al_dia
+
+    if _migraciones_al_dia:
+        return {"status": OK, "pendientes": 0}
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    pendientes = len(executor.migration_plan(executor.loader.graph.leaf_nodes()))
+    _migraciones_al_dia = pendientes == 0
+    return {"status": ERROR if pendientes else OK, "pendientes": pendientes}
+
+
+def almacenamiento():
+    ruta = Path(settings.MEDIA_ROOT)
+    # ``MEDIA_ROOT`` puede no existir hasta la primera subida.
+    while not ruta.exists() and ruta != ruta.parent:
+        ruta = ruta.parent
+    uso = shutil.disk_usage(ruta)
+    libre_mb = uso.free // (1024 * 1024)
+    escribible = os.access(ruta, os.W_OK)
+    bajo = libre_mb < settings.HEALTH_MIN_FREE_DISK_MB
+    return {
+        "status": DEGRADADO if bajo or not escribible else OK,
+        "libre_mb": libre_mb,
+        "total_mb": uso.total // (1024 * 1024),
+        "escribible": escribible,
+    }
+
+
+def tareas():
+    Tarea = apps.get_model("tareas", "Tarea")
+    vencidas = Tarea.objects.filter(estado=Tarea.PENDIENTE, ejecutar_despues__lte=timezone.now())
+    pendientes = vencidas.count()
+    mas_antigua = vencidas.order_by("ejecutar_despues").values_list("ejecutar_despues", flat=True).first()
+    espera_s = round((timezone.now() - mas_antigua).total_seconds(), 1) if mas_antigua else 0
+    return {
+        "status": DEGRADADO if pendientes > settings.HEALTH_MAX_TASK_BACKLOG else OK,
+        "pendientes": pendientes,
+        "espera_maxima_s": espera_s,
+    }
+
+
+CHEQUEOS = {
+    "database": base_de_datos,
+    "migrations": migraciones,
+    "cache": cache,
+    "storage": almacenamiento,
+}
+
+
+def _chequeos():
+    chequeos = dict(CHEQUEOS)
+    if apps.is_installed("backend.tareas"):
+        chequeos["tasks"] = tareas
+    return chequeos
+
+
+def _ejecutar():
+    resultados = {}
+    for nombre, chequeo in _chequeos().items():
+        if nombre == "migrations" and resultados["database"]["status"] == ERROR:
+            resultados[nombre] = {"status": ERROR, "error": "Base de datos no disponible"}
+            continue
+        resultados[nombre] = _medir(chequeo)
+    return {"status": _peor(datos["status"] for datos in resultados.values()), "checks": resultados}
+
+
+def readiness(forzar=False):
+    """Resultado de los chequeos, reutilizado mientras no supere el TTL.
+
+    Devuelve ``(resultado, edad_en_segundos)``.
+    """
+
+    with _bloqueo:
+        momento = _ultimo["momento"]
+        vigente = momento is not None and time.monotonic() - momento < settings.HEALTH_CHECK_TTL_SECONDS
+        if forzar or not vigente:
+            _ultimo["resultado"] = _ejecutar()
+            _ultimo["momento"] = momento = time.monotonic()
+        return _ultimo["resultado"], round(time.monotonic() - momento, 3)
+
+
+def reiniciar():
+    """Descarta el resultado en memoria (pruebas y recargas)."""
+
+    global _migraciones_al_dia
+
+    with _bloqueo:
+        _ultimo["momento"] = _ultimo["resultado"] = None
+        _migraciones_al_dia = False
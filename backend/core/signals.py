@@ -2,21 +2,105 @@
 
 from django.apps import apps
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
 from django.dispatch import receiver
 
+from backend.core.actividad import registrar_login
+from backend.core.authentication import revocar_tokens
+from backend.core.models import UsuarioToken
+
 UserModel = apps.get_model(settings.AUTH_USER_MODEL)
 UserProfile = apps.get_model("usuarios", "UserProfile")
 
+# Campos embebidos en el JWT cuyo cambio debe invalidar los tokens emitidos.
+CAMPOS_DE_ROL = ("is_active", "is_staff", "is_superuser", "username")
+# Campos del usuario que el perfil muestra (``nombre_completo``).
+CAMPOS_DE_PERFIL = ("username", "first_name", "last_name", "email")
+
+
+def _valores(instance, campos):
+    return tuple(instance.__dict__.get(campo) for campo in campos)
+
+
+def _roles(instance):
+    return _valores(instance, CAMPOS_DE_ROL)
+
 
 @receiver(post_save, sender=UserModel)
-def update_existing_user_profile(sender, instance, created, **kwargs):
-    """Actualiza el perfil del usuario solo si ya existe."""
+def update_existing_user_profile(sender, instance, created, update_fields=None, **kwargs):
+    """Actualiza el perfil existente solo si cambiaron datos que muestra.
+
+    Guardados como el de ``last_login`` no tocan la fila del perfil.
+    """
+    actuales = _valores(instance, CAMPOS_DE_PERFIL)
+    iniciales = getattr(instance, "_perfil_inicial", None)
+    instance._perfil_inicial = actuales
+    if created or actuales == iniciales:
+        return
+    if update_fields is not None and not set(update_fields) & set(CAMPOS_DE_PERFIL):
+        return
+
     try:
         profile = instance.user_profile
     except UserProfile.DoesNotExist:
         # La creación del perfil se delega al serializer de usuarios
         return
 
+    profile.save()
+
+
+def recordar_valores_iniciales(sender, instance, **kwargs):
+    instance._roles_iniciales = _roles(instance)
+    instance._perfil_inicial = _valores(instance, CAMPOS_DE_PERFIL)
+
+
+def revocar_si_cambian_roles(sender, instance, created, **kwargs):
+    actuales = _roles(instance)
+    if not created and actuales != getattr(instance, "_roles_iniciales", actuales):
+        revocar_tokens(instance.pk)
+    instance._roles_iniciales = actuales
+
+
+for _modelo in (UserModel, UsuarioToken):
+    post_init.connect(recordar_valores_iniciales, sender=_modelo, dispatch_uid=f"roles_iniciales_{_modelo.__name__}")
+    post_save.connect(revocar_si_cambian_roles, sender=_modelo, dispatch_uid=f"revocar_roles_{_modelo.__name__}")
+
+
+# Los logins de sesión (admin) también pasan por el buffer de actividad en
+# lugar del ``update_last_login`` de Django, que guarda al usuario entero.
+user_logged_in.disconnect(dispatch_uid="update_last_login")
+
+
+@receiver(user_logged_in, dispatch_uid="registrar_login_en_buffer")
+def registrar_login_de_sesion(sender, request, user, **kwargs):
+    registrar_login(user)
+
+
+@receiver(post_delete, sender=UserModel)
+def revocar_usuario_eliminado(sender, instance, **kwargs):
+    revocar_tokens(instance.pk)
+
+
+@receiver(m2m_changed, sender=UserModel.groups.through)
+def revocar_por_cambio_de_grupos(sender, instance, action, reverse, pk_set, **kwargs):
+    """Los grupos viajan en el token: cualquier alta o baja lo invalida."""
+
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        revocar_tokens(instance.pk)
+    elif action == "pre_clear":
+        for user_id in instance.user_set.values_list("pk", flat=True):
+            revocar_tokens(user_id)
+    else:
+        for user_id in pk_set or ():
+            revocar_tokens(user_id)
+
+
+@receiver(post_save, sender=Group)
+def revocar_por_grupo_renombrado(sender, instance, created, **kwargs):
     if not created:
-        profile.save()
+        for user_id in instance.user_set.values_list("pk", flat=True):
+            revocar_tokens(user_id)
@@ -0,0 +1,23 @@
+"""Tareas periódicas del dominio core."""
+
+from django.conf import settings
+
+from backend.core import actividad, lista_negra
+from backend.tareas.registro import tarea
+
+
+@tarea(
+    "core.vaciar_actividad_login",
+    cada=settings.LOGIN_ACTIVITY_FLUSH_SECONDS or None,
+)
+def vaciar_actividad_login():
+    """Vuelca los ``last_login`` pendientes del buffer de actividad."""
+
+    return {"actualizados": actividad.vaciar()}
+
+
+@tarea("core.compactar_tokens", cada=24 * 60 * 60)
+def compactar_tokens():
+    """Elimina por lotes los refresh tokens expirados de la lista negra."""
+
+    return {"eliminados": lista_negra.purgar_expirados()}
@@ -0,0 +1,244 @@
+"""Utilidades de prueba reutilizables: fábrica de filas y conteo de consultas.
+
+``FabricaAutomatica`` genera filas válidas para cualquier modelo a partir de
+sus campos (incluidas FKs, M2M y relaciones hijas en cascada), de modo que
+los listados serializan relaciones reales y los N+1 se hacen visibles.
+``ConteoConsultasMixin`` agrega a los ``TestCase`` una aserción que compara
+las consultas de un listado con N y con 10·N filas.
+"""
+
+import itertools
+import re
+import traceback
+from collections import Counter
+from datetime import time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, models
+from django.utils import timezone
+
+RAIZ_BACKEND = str(Path(settings.BASE_DIR) / "backend")
+
+
+class FabricaAutomatica:
+    """Crea instancias completando los campos obligatorios con valores únicos.
+
+    ``ajustes`` mapea un modelo a una función que recibe y devuelve los
+    valores antes de crear la fila (para reglas de negocio como "la fórmula
+    debe corresponder al producto"). ``posteriores`` mapea un modelo a una
+    función que recibe la instancia ya creada.
+    """
+
+    def __init__(self, ajustes=None, posteriores=None):
+        self.contador = itertools.count(1)
+        self.indices_opciones = Counter()
+        self.ajustes = ajustes or {}
+        self.posteriores = posteriores or {}
+
+    @staticmethod
+    def capacidad(modelo):
+        """Filas posibles si un campo único está limitado por sus ``choices``."""
+
+        limites = [
+            len(campo.choices)
+            for campo in modelo._meta.concrete_fields
+            if campo.unique and not campo.primary_key and campo.choices
+        ]
+        return min(limites) if limites else None
+
+    def crear(self, modelo, cantidad=1, con_hijos=True):
+        return [self.crear_uno(modelo, con_hijos=con_hijos) for _ in range(cantidad)]
+
+    def crear_uno(self, modelo, con_hijos=True, profundidad=0, **valores):
+        for campo in modelo._meta.concrete_fields:
+            if campo.name in valores or campo.attname in valores:
+                continue
+            valor = self._valor(campo, profundidad)
+            if valor is not _OMITIR:
+                valores[campo.name] = valor
+
+        ajuste = self.ajustes.get(modelo)
+        if ajuste:
+            valores = ajuste(valores)
+
+        instancia = modelo.objects.create(**valores)
+
+        for campo in modelo._meta.local_many_to_many:
+            destino = campo.remote_field.model
+            if campo.remote_field.through._meta.auto_created and _es_del_proyecto(destino):
+                getattr(instancia, campo.name).add(self.crear_uno(destino, con_hijos=False, profundidad=profundidad + 1))
+
+        if con_hijos:
+            for relacion in modelo._meta.related_objects:
+                hijo = relacion.related_model
+                if (
+                    relacion.one_to_many
+                    and relacion.on_delete is models.CASCADE
+                    and hijo._meta.app_label == modelo._meta.app_label
+                ):
+                    self.crear_uno(
+                        hijo,
+                        con_hijos=False,
+                        profundidad=profundidad + 1,
+                        **{relacion.field.name: instancia},
+                    )
+
+        posterior = self.posteriores.get(modelo)
+        if posterior:
+            posterior(instancia)
+        return instancia
+
+    def _valor(self, campo, profundidad):
+        if campo.primary_key or campo.auto_created:
+            return _OMITIR
+        if getattr(campo, "auto_now", False) or getattr(campo, "auto_now_add", False):
+            return _OMITIR
+
+        if campo.is_relation:
+            destino = campo.remote_field.model
+            if profundidad > 3 and campo.null:
+                return None
+            capacidad = self.capacidad(destino)
+            if capacidad is not None and destino.objects.count() >= capacidad:
+                return destino.objects.first()
+            return self.crear_uno(destino, con_hijos=False, profundidad=profundidad + 1)
+
+        numero = next(self.contador)
+        if campo.choices:
+            opciones = [valor for valor, _ in campo.flatchoices]
+            if campo.unique:
+                usados = set(campo.model._default_manager.values_list(campo.attname, flat=True))
+                libres = [opcion for opcion in opciones if opcion not in usados]
+                return libres[0] if libres else opciones[0]
+            clave = (campo.model, campo.name)
+            self.indices_opciones[clave] += 1
+            return opciones[(self.indices_opciones[clave] - 1) % len(opciones)]
+        if campo.has_default():
+            return _OMITIR
+
+        if isinstance(campo, models.FileField):
+            return f"pruebas/archivo-{numero}.txt"
+        if isinstance(campo, (models.CharField, models.TextField)):
+            limite = campo.max_length or 50
+            return f"{campo.name[:4]}{numero}"[-limite:]
+        if isinstance(campo, models.BooleanField):
+            return False
+        if isinstance(campo, models.DecimalField):
+            return Decimal("1.00")
+        if isinstance(campo, (models.IntegerField, models.FloatField)):
+            return numero
+        if isinstance(campo, models.DateTimeField):
+            # Ventanas válidas y en el pasado: inicio < fin <= ahora.
+            base = timezone.now() - timedelta(hours=2, minutes=numero)
+            return base + timedelta(hours=1) if "fin" in campo.name else base
+        if isinstance(campo, models.DateField):
+            return timezone.localdate()
+        if isinstance(campo, models.TimeField):
+            return time(14, 0) if "fin" in campo.name else time(6, 0)
+        if isinstance(campo, models.JSONField):
+            return {}
+        if campo.null:
+            return None
+        raise ValueError(f"No se puede generar un valor para {campo.model.__name__}.{campo.name}")
+
+
+_OMITIR = object()
+
+
+def _es_del_proyecto(modelo):
+    return modelo.__module__.startswith("backend.")
+
+
+def normalizar_sql(sql):
+    """Reemplaza literales para agrupar consultas con la misma forma."""
+
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(?:\.\d+)?\b", "?", sql)
+    return re.sub(r"\((?:\s*\?\s*,)+\s*\?\s*\)", "(?...)", sql)
+
+
+class CapturaConsultas:
+    """Registra cada consulta ejecutada junto con la pila de llamadas del proyecto."""
+
+    def __init__(self, conexion=None):
+        self.conexion = conexion or connection
+        self.consultas = []
+        self._contexto = None
+
+    def __enter__(self):
+        self._contexto = self.conexion.execute_wrapper(self._registrar)
+        self._contexto.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._contexto.__exit__(*exc)
+
+    def __len__(self):
+        return len(self.consultas)
+
+    def _registrar(self, execute, sql, params, many, context):
+        pila = [
+            marco
+            for marco in traceback.extract_stack()[:-1]
+            if marco.filename.startswith(RAIZ_BACKEND) and not marco.filename.endswith("testing.py")
+        ]
+        self.consultas.append((sql, pila))
+        return execute(sql, params, many, context)
+
+    def formas(self):
+        return Counter(normalizar_sql(sql) for sql, _ in self.consultas)
+
+    def ejemplo(self, forma):
+        for sql, pila in self.consultas:
+            if normalizar_sql(sql) == forma:
+                return sql, pila
+        return None, []
+
+
+def reporte_diferencias(chica, grande, n_chica, n_grande):
+    """Describe las consultas que crecieron con la cantidad de filas."""
+
+    lineas = [
+        f"{len(chica)} consultas con {n_chica} filas vs {len(grande)} con {n_grande} filas.",
+    ]
+    formas_chica = chica.formas()
+    for forma, cantidad in grande.formas().items():
+        if cantidad <= formas_chica.get(forma, 0):
+            continue
+        sql, pila = grande.ejemplo(forma)
+        lineas.append("")
+        lineas.append(f"x{cantidad} (antes x{formas_chica.get(forma, 0)}): {sql}")
+        lineas.extend("    " + linea.rstrip() for linea in traceback.format_list(pila))
+    return "\n".join(lineas)
+
+
+class ConteoConsultasMixin:
+    """Aserciones de conteo de consultas para ``TestCase``."""
+
+    factor_filas = 10
+
+    def assertConsultasIndependientesDeN(self, url, crear_filas, n=2, factor=None, params=None):
+        """Falla si listar ``url`` cuesta más consultas con ``factor``·N filas que con N.
+
+        ``crear_filas(cantidad)`` debe agregar filas al listado. El tamaño de
+        página se ajusta para que ambas mediciones serialicen todas las filas.
+        """
+
+        factor = factor or self.factor_filas
+        grande = n * factor
+        consulta = {"page_size": grande, **(params or {})}
+
+        crear_filas(n)
+        with CapturaConsultas() as chica:
+            respuesta = self.client.get(url, consulta)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:500])
+
+        crear_filas(grande - n)
+        with CapturaConsultas() as mayor:
+            respuesta = self.client.get(url, consulta)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:500])
+
+        if len(mayor) != len(chica):
+            self.fail(reporte_diferencias(chica, mayor, n, grande))
@@ -0,0 +1,49 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from backend.core.services.benchmark import percentil
+
+
+class BenchCommandTests(TestCase):
+    def test_percentil_por_rango_mas_cercano(self):
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil([7], 99), 7)
+
+    def test_siembra_y_mide_listados_detalles_y_altas(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            salida = Path(directorio, "bench.json")
+            call_command(
+                "bench",
+                "--current-db",
+                "--scale=mini",
+                "--records=30",
+                "--incidents=10",
+                "--maintenances=10",
+                "--iterations=2",
+                "--warmup=0",
+                "--page-sizes=5",
+                "--only=registro-produccion,incidente,maquina",
+                f"--output={salida}",
+                verbosity=0,
+            )
+            reporte = json.loads(salida.read_text())
+
+        self.assertEqual(reporte["filas_sembradas"]["registros"], 30)
+        self.assertGreater(reporte["filas_sembradas"]["registro_etapas"], 30)
+        medidos = {(r["endpoint"], r["metodo"]) for r in reporte["resultados"]}
+        self.assertIn(("registro-produccion-list", "GET"), medidos)
+        self.assertIn(("registro-produccion-detail", "GET"), medidos)
+        self.assertIn(("registro-produccion-list", "POST"), medidos)
+        for resultado in reporte["resultados"]:
+            self.assertEqual(resultado["muestras"], 2)
+            self.assertEqual(set(resultado["latencia_ms"]), {"p50", "p95", "p99", "media", "max"})
+            self.assertTrue(all(int(estado) < 500 for estado in resultado["estados"]), resultado)
+        altas = [r for r in reporte["resultados"] if r["metodo"] == "POST"]
+        self.assertTrue(all(set(r["estados"]) == {"201"} for r in altas), altas)
@@ -0,0 +1,52 @@
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Funcion, Producto
+from backend.core.busqueda import SinAcentos, normalizar
+from backend.usuarios.models import UserProfile
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class BusquedaTests(TestCase):
+    def setUp(self):
+        self.admin = UserModel.objects.create_superuser("admin", password="pass1234")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        for codigo, nombre in (("GR-01", "Granulación húmeda"), ("CO-01", "COMPRESIÓN directa"), ("EN-01", "Envasado")):
+            Producto.objects.create(
+                codigo=codigo, nombre=nombre, tipo="COMPRIMIDO", presentacion="BLISTER", concentracion="500mg"
+            )
+
+    def _codigos(self, url, busqueda):
+        respuesta = self.client.get(url, {"search": busqueda})
+        self.assertEqual(respuesta.status_code, 200)
+        return sorted(fila["codigo"] for fila in respuesta.json()["results"])
+
+    def test_normalizar(self):
+        self.assertEqual(normalizar("COMPRESIÓN Ñandú"), "compresion nandu")
+
+    def test_funcion_sqlite(self):
+        valores = Producto.objects.annotate(normalizado=SinAcentos("nombre")).values_list("normalizado", flat=True)
+        self.assertIn("compresion directa", set(valores))
+
+    def test_ignora_acentos_y_mayusculas(self):
+        url = reverse("producto-list")
+        self.assertEqual(self._codigos(url, "granulacion"), ["GR-01"])
+        self.assertEqual(self._codigos(url, "Compresión"), ["CO-01"])
+        self.assertEqual(self._codigos(url, "húmeda gran"), ["GR-01"])
+        self.assertEqual(self._codigos(url, "-01"), ["CO-01", "EN-01", "GR-01"])
+        self.assertEqual(self._codigos(url, "inexistente"), [])
+
+    def test_campos_relacionados_en_usuarios(self):
+        funcion = Funcion.objects.create(codigo="OPE", nombre="Operación de línea")
+        operario = UserModel.objects.create_user("operario", password="pass1234", first_name="José")
+        UserProfile.objects.update_or_create(user=operario, defaults={"funcion": funcion})
+
+        url = reverse("usuario-list")
+        for busqueda in ("operacion", "jose"):
+            respuesta = self.client.get(url, {"search": busqueda})
+            self.assertEqual([fila["username"] for fila in respuesta.json()["results"]], ["operario"])
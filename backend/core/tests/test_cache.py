@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.core import cache as cache_utils
+
+
+class CacheAliasTests(TestCase):
+    def setUp(self):
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    def test_alias_con_ttl_y_prefijo_propios(self):
+        self.assertEqual(
+            set(settings.CACHES), {"default", "sessions", "throttle", "catalog", "reports"}
+        )
+        caches["catalog"].set("clave", "catalogo")
+        self.assertIsNone(caches["reports"].get("clave"))
+        self.assertNotEqual(caches["catalog"].default_timeout, caches["throttle"].default_timeout)
+
+    def test_invalidar_cambia_la_clave_versionada(self):
+        calculos = []
+
+        def calcular():
+            calculos.append(1)
+            return len(calculos)
+
+        primero = cache_utils.obtener_o_calcular("maquinas", "lista", calcular=calcular, alias="catalog")
+        repetido = cache_utils.obtener_o_calcular("maquinas", "lista", calcular=calcular, alias="catalog")
+        anterior = cache_utils.clave_versionada("maquinas", "lista", alias="catalog")
+
+        cache_utils.invalidar("maquinas", alias="catalog")
+
+        self.assertNotEqual(cache_utils.clave_versionada("maquinas", "lista", alias="catalog"), anterior)
+        self.assertEqual((primero, repetido), (1, 1))
+        self.assertEqual(cache_utils.obtener_o_calcular("maquinas", "lista", calcular=calcular, alias="catalog"), 2)
+
+    def test_invalidar_sin_version_previa_no_retrocede(self):
+        version = cache_utils.version_actual("productos")
+        caches["default"].clear()
+        self.assertGreater(cache_utils.invalidar("productos"), 0)
+        self.assertGreaterEqual(cache_utils.version_actual("productos"), version)
+
+    def test_throttle_de_login_usa_el_alias_compartido(self):
+        cliente = APIClient()
+
+        def intentar():
+            return cliente.post(reverse("login"), {"username": "nadie", "password": "x"}, format="json")
+
+        for _ in range(5):
+            intentar()
+        self.assertEqual(intentar().status_code, 429)
+        caches["default"].clear()
+        self.assertEqual(intentar().status_code, 429)
+        caches["throttle"].clear()
+        self.assertEqual(intentar().status_code, 401)
@@ -0,0 +1,114 @@
+import gzip
+import json
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import (
+    EtapaProduccion,
+    Formula,
+    FormulaIngrediente,
+    Maquina,
+    Parametro,
+    Producto,
+    Turno,
+    Ubicacion,
+)
+from backend.core.cache_respuestas import invalidar_respuestas
+from backend.core.checks import cache_de_respuestas
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+@override_settings(CACHE_BACKEND="redis", RESPONSE_CACHE_ENABLED=True)
+class CacheRespuestasTests(TestCase):
+    def setUp(self):
+        caches["catalog"].clear()
+        self.producto = Producto.objects.create(
+            codigo="PRD-1", nombre="Producto", tipo="COMPRIMIDO", presentacion="BLISTER", concentracion="500mg"
+        )
+        self.formula = Formula.objects.create(codigo="FOR-1", version="1.0.0", producto=self.producto)
+        self.ubicacion = Ubicacion.objects.create(codigo="PLT", nombre="Planta")
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("operario", password="pass1234"))
+
+    def test_acierto_sin_consultas_e_invalidacion_precisa(self):
+        url = reverse("formula-list")
+        primera = self.client.get(url, {"activa": "true", "page": 1})
+        with self.assertNumQueries(0):
+            # El orden de los parámetros no cambia la clave.
+            segunda = self.client.get(url, {"page": 1, "activa": "true"})
+        self.assertEqual(segunda.content, primera.content)
+
+        # Un catálogo que la vista no lee no invalida sus respuestas.
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        with self.assertNumQueries(0):
+            self.client.get(url, {"activa": "true", "page": 1})
+
+        FormulaIngrediente.objects.create(formula=self.formula, material=self.producto, cantidad="1.5", unidad="kg")
+        ingredientes = self.client.get(url, {"activa": "true", "page": 1}).json()["results"][0]["ingredientes"]
+        self.assertEqual([fila["material_nombre"] for fila in ingredientes], ["Producto"])
+
+    def test_anotacion_y_detalle(self):
+        lista = reverse("ubicacion-list")
+        detalle = reverse("ubicacion-detail", args=[self.ubicacion.pk])
+        self.assertEqual(self.client.get(lista).json()["results"][0]["maquinas_count"], 0)
+        self.assertEqual(self.client.get(detalle).json()["maquinas_count"], 0)
+
+        Maquina.objects.create(codigo="M-1", nombre="Mezcladora", tipo="MEZCLADO", ubicacion=self.ubicacion)
+        self.assertEqual(self.client.get(lista).json()["results"][0]["maquinas_count"], 1)
+        self.assertEqual(self.client.get(detalle).json()["maquinas_count"], 1)
+
+    def test_cambios_m2m_e_invalidacion_manual(self):
+        etapa = EtapaProduccion.objects.create(codigo="GRA", nombre="Granulación")
+        url = reverse("etapaproduccion-detail", args=[etapa.pk])
+        self.assertEqual(self.client.get(url).json()["parametros_nombres"], [])
+
+        etapa.parametros.add(Parametro.objects.create(codigo="TMP", nombre="Temperatura", unidad="°C"))
+        self.assertEqual(self.client.get(url).json()["parametros_nombres"], ["Temperatura"])
+
+        EtapaProduccion.objects.filter(pk=etapa.pk).update(nombre="Secado")
+        self.assertEqual(self.client.get(url).json()["nombre"], "Granulación")
+        invalidar_respuestas(EtapaProduccion)
+        self.assertEqual(self.client.get(url).json()["nombre"], "Secado")
+
+    def test_perfil_de_permisos_separa_entradas(self):
+        url = reverse("producto-list")
+        self.client.get(url)
+        admin = APIClient()
+        admin.force_authenticate(UserModel.objects.create_superuser("admin", password="pass1234"))
+        with self.assertNumQueries(2):
+            admin.get(url)
+
+    def test_cuerpo_precomprimido(self):
+        Producto.objects.bulk_create(
+            Producto(
+                codigo=f"PRD-{indice:03d}",
+                nombre=f"Producto {indice}",
+                tipo="COMPRIMIDO",
+                presentacion="BLISTER",
+                concentracion="500mg",
+            )
+            for indice in range(2, 30)
+        )
+        invalidar_respuestas(Producto)
+        url = reverse("producto-list")
+        plano = self.client.get(url, HTTP_ACCEPT_ENCODING="identity")
+        self.assertNotIn("Content-Encoding", plano)
+
+        with self.assertNumQueries(0):
+            comprimida = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(comprimida["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", comprimida["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(comprimida.content)), plano.json())
+
+    def test_chequeo_de_cache_compartida(self):
+        self.assertEqual(cache_de_respuestas(None), [])
+        with override_settings(CACHE_BACKEND="locmem"):
+            self.assertEqual([error.id for error in cache_de_respuestas(None)], ["core.E004"])
+        with override_settings(CACHE_BACKEND="locmem", RESPONSE_CACHE_ENABLED=False):
+            self.assertEqual(cache_de_respuestas(None), [])
@@ -0,0 +1,100 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Maquina, Turno
+from backend.core.columnar import codificar
+from backend.core.testing import FabricaAutomatica
+from backend.produccion.models import RegistroProduccion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+MEDIA_TYPE = "application/vnd.siprosa.columnar+json"
+
+
+def _producto_de_la_formula(valores):
+    valores["producto"] = valores["formula"].producto
+    return valores
+
+
+def _decodificar(datos):
+    filas = []
+    for fila in datos["rows"]:
+        objeto = dict(zip(datos["columns"], fila))
+        for columna, valores in datos["dictionaries"].items():
+            if objeto[columna] is not None:
+                objeto[columna] = valores[objeto[columna]]
+        filas.append(objeto)
+    return filas
+
+
+class CodificarTests(TestCase):
+    def test_codifica_solo_textos_repetidos(self):
+        datos = codificar(
+            ["id", "estado", "codigo"],
+            [[1, "EN_PROCESO", "A"], [2, "FINALIZADO", "B"], [3, "EN_PROCESO", None]],
+        )
+        self.assertEqual(datos["dictionaries"], {"estado": ["EN_PROCESO", "FINALIZADO"]})
+        self.assertEqual(datos["rows"], [[1, 0, "A"], [2, 1, "B"], [3, 0, None]])
+
+
+class ColumnarTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("supervisor", password="pass1234"))
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        self.fabrica = FabricaAutomatica(ajustes={RegistroProduccion: _producto_de_la_formula})
+
+    def _listar(self, url, **extra):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(url, **extra)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:300])
+        return respuesta, len(consultas)
+
+    def test_mismos_valores_que_el_json(self):
+        self.fabrica.crear(RegistroProduccion, 3)
+        url = reverse("registro-produccion-list")
+        objetos = self.client.get(url).json()["results"]
+        respuesta, _ = self._listar(url + "?format=columnar")
+
+        self.assertTrue(respuesta["Content-Type"].startswith(MEDIA_TYPE))
+        datos = respuesta.json()
+        self.assertEqual(datos["count"], 3)
+        filas = _decodificar(datos["results"])
+        self.assertIn("producto", datos["results"]["columns"])
+        for fila, objeto in zip(filas, objetos):
+            self.assertEqual(fila, {columna: objeto[columna] for columna in fila})
+
+    def test_negociacion_por_accept_y_campos_relacionados(self):
+        self.fabrica.crear(Maquina, 4)
+        respuesta, _ = self._listar(reverse("maquina-list"), HTTP_ACCEPT=MEDIA_TYPE)
+
+        datos = respuesta.json()["results"]
+        self.assertIn("ubicacion_nombre", datos["columns"])
+        self.assertNotIn("tipo_display", datos["columns"])
+        self.assertEqual(len(datos["rows"]), 4)
+
+    def test_consultas_constantes_y_paginas_grandes(self):
+        self.fabrica.crear(RegistroProduccion, 2)
+        url = reverse("registro-produccion-list") + "?format=columnar"
+        _, pocas = self._listar(url)
+        self.fabrica.crear(RegistroProduccion, 8)
+        _, muchas = self._listar(url)
+        self.assertEqual(pocas, muchas)
+
+        respuesta, _ = self._listar(url + "&page_size=1000")
+        self.assertEqual(len(respuesta.json()["results"]["rows"]), 10)
+        respuesta, _ = self._listar(url + "&page_size=4&page=3")
+        self.assertEqual(len(respuesta.json()["results"]["rows"]), 2)
+        self.assertIsNone(respuesta.json()["next"])
+
+    def test_detalle_y_json_sin_cambios(self):
+        registro = self.fabrica.crear(RegistroProduccion)[0]
+        respuesta = self.client.get(reverse("registro-produccion-list"))
+        self.assertIsInstance(respuesta.json()["results"], list)
+        respuesta = self.client.get(reverse("registro-produccion-detail", args=[registro.pk]), {"format": "columnar"})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()["id"], registro.pk)
@@ -0,0 +1,91 @@
+import gzip
+import json
+from decimal import Decimal
+
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Maquina
+from backend.core import middleware
+from backend.core.middleware import CompressionMiddleware, elegir_codificacion
+from backend.core.renderers import ORJSONRenderer
+from backend.core.testing import FabricaAutomatica
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_mismos_bytes_que_drf(self):
+        datos = {
+            "cantidad_producida": Decimal("12.50"),
+            "fecha": timezone.now(),
+            "texto": "Línea nueva",
+            "lista": [1, 2.5, None, True],
+            7: "clave numérica",
+        }
+        self.assertEqual(ORJSONRenderer().render(datos), JSONRenderer().render(datos))
+
+    def test_enteros_grandes_usan_el_encoder_de_drf(self):
+        self.assertEqual(ORJSONRenderer().render({"n": 2**70}), b'{"n":%d}' % 2**70)
+
+
+@override_settings(COMPRESSION_MIN_BYTES=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _procesar(self, response, accept_encoding="gzip, deflate"):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda _request: response)(request)
+
+    def test_negociacion(self):
+        self.assertEqual(elegir_codificacion("gzip;q=0.5, identity"), "gzip")
+        self.assertIsNone(elegir_codificacion("gzip;q=0, deflate"))
+        self.assertIsNone(elegir_codificacion(""))
+        self.assertEqual(elegir_codificacion("*"), "br" if middleware.brotli else "gzip")
+
+    def test_comprime_json_por_encima_del_umbral(self):
+        contenido = json.dumps([{"estado": "EN_PROCESO", "lote": i} for i in range(200)]).encode()
+        response = self._procesar(HttpResponse(contenido, content_type="application/json"))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), contenido)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+    def test_respeta_umbral_tipo_y_cliente(self):
+        chica = self._procesar(HttpResponse(b"{}", content_type="application/json"))
+        self.assertFalse(chica.has_header("Content-Encoding"))
+        imagen = self._procesar(HttpResponse(b"x" * 1000, content_type="image/png"))
+        self.assertFalse(imagen.has_header("Content-Encoding"))
+        sin_gzip = self._procesar(HttpResponse(b"x" * 1000, content_type="text/csv"), accept_encoding="")
+        self.assertFalse(sin_gzip.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", sin_gzip["Vary"])
+
+    def test_streaming_se_comprime_por_bloques(self):
+        bloques = [b"codigo;nombre\n"] + [b"M-%04d;Mezcladora\n" % i for i in range(100)]
+        response = self._procesar(StreamingHttpResponse(iter(bloques), content_type="text/csv"))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"".join(bloques))
+
+
+class CompresionApiTests(TestCase):
+    def test_listado_comprimido(self):
+        client = APIClient()
+        client.force_authenticate(UserModel.objects.create_user("supervisor", password="pass1234"))
+        FabricaAutomatica().crear(Maquina, 30)
+
+        plano = client.get(reverse("maquina-list"))
+        comprimido = client.get(reverse("maquina-list"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(comprimido["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(comprimido.content)), plano.json())
+        self.assertLess(len(comprimido.content) * 4, len(plano.content))
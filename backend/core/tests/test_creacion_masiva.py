@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Maquina, Ubicacion
+from backend.incidentes.models import Incidente
+from backend.mantenimiento.models import RegistroMantenimiento
+from backend.observaciones.models import ObservacionGeneral
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class CreacionMasivaTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.usuario = UserModel.objects.create_user("tablet", password="pass1234")
+        self.client.force_authenticate(self.usuario)
+        ubicacion = Ubicacion.objects.create(codigo="PL1", nombre="Planta 1")
+        self.maquinas = [
+            Maquina.objects.create(codigo=f"M{n}", nombre=f"Máquina {n}", tipo="COMPRESION", ubicacion=ubicacion)
+            for n in range(3)
+        ]
+        self.inicio = timezone.now() - timedelta(hours=3)
+
+    def _mantenimiento(self, maquina, **extra):
+        return {
+            "maquina": maquina,
+            "tipo_mantenimiento": "PREVENTIVO",
+            "hora_inicio": self.inicio.isoformat(),
+            "hora_fin": (self.inicio + timedelta(hours=1)).isoformat(),
+            "descripcion": "Lubricación",
+            **extra,
+        }
+
+    def test_mantenimiento_resuelve_maquinas_en_una_consulta(self):
+        elementos = [self._mantenimiento(self.maquinas[n % 3].pk) for n in range(30)]
+        # SAVEPOINT + in_bulk de máquinas + INSERT + RELEASE.
+        with self.assertNumQueries(4):
+            respuesta = self.client.post(reverse("registro-mantenimiento-bulk"), elementos, format="json")
+        self.assertEqual(respuesta.status_code, 201, respuesta.content[:300])
+        self.assertEqual(respuesta.json()["creados"], 30)
+        self.assertEqual(RegistroMantenimiento.objects.filter(registrado_por=self.usuario).count(), 30)
+        primero = respuesta.json()["resultados"][0]
+        self.assertEqual(primero["id"], primero["datos"]["id"])
+
+    def test_resultados_por_elemento_con_errores_parciales(self):
+        elementos = [
+            self._mantenimiento(self.maquinas[0].pk),
+            self._mantenimiento(9999),
+            self._mantenimiento(self.maquinas[1].pk, hora_fin=(timezone.now() + timedelta(days=1)).isoformat()),
+            "texto",
+        ]
+        respuesta = self.client.post(reverse("registro-mantenimiento-bulk"), elementos, format="json")
+        self.assertEqual(respuesta.status_code, 207)
+        resultados = respuesta.json()["resultados"]
+        self.assertEqual([resultado["status"] for resultado in resultados], [201, 400, 400, 400])
+        self.assertIn("maquina", resultados[1]["errores"])
+        self.assertIn("hora_fin", resultados[2]["errores"])
+        self.assertEqual(RegistroMantenimiento.objects.count(), 1)
+
+    def test_incidentes_y_observaciones(self):
+        fin = (self.inicio + timedelta(hours=1)).isoformat()
+        incidentes = [
+            {"fecha_inicio": self.inicio.isoformat(), "fecha_fin": fin, "origen": "general", "descripcion": "Corte"},
+            {
+                "fecha_inicio": self.inicio.isoformat(),
+                "fecha_fin": fin,
+                "origen": "produccion",
+                "maquina": self.maquinas[2].pk,
+                "descripcion": "Atasco",
+                "requiere_acciones_correctivas": True,
+            },
+        ]
+        respuesta = self.client.post(reverse("incidente-bulk"), incidentes, format="json")
+        self.assertEqual(respuesta.status_code, 207)
+        self.assertIn("acciones_correctivas", respuesta.json()["resultados"][1]["errores"])
+        self.assertEqual(Incidente.objects.count(), 1)
+
+        respuesta = self.client.post(
+            reverse("observacion-general-bulk"), [{"texto": "Uno"}, {"texto": "Dos"}], format="json"
+        )
+        self.assertEqual(respuesta.status_code, 201)
+        self.assertEqual(ObservacionGeneral.objects.filter(creado_por=self.usuario).count(), 2)
+
+    @override_settings(BULK_CREATE_MAX_ITEMS=2)
+    def test_rechaza_cuerpos_invalidos(self):
+        url = reverse("observacion-general-bulk")
+        self.assertEqual(self.client.post(url, {"texto": "suelto"}, format="json").status_code, 400)
+        self.assertEqual(self.client.post(url, [], format="json").status_code, 400)
+        self.assertEqual(self.client.post(url, [{"texto": "x"}] * 3, format="json").status_code, 400)
+        self.assertEqual(self.client.post(url, [{"texto": ""}], format="json").status_code, 400)
+        self.assertFalse(ObservacionGeneral.objects.exists())
@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from backend.core.db import pool_stats
+
+
+class PoolStatsTests(SimpleTestCase):
+    def test_sin_pool_informa_conexiones_persistentes(self):
+        datos = pool_stats()
+        self.assertIsNone(datos["pool"])
+        self.assertIn("conn_max_age", datos)
+        self.assertIn("health_checks", datos)
+
+    def test_con_pool_calcula_la_saturacion(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_min": 1,
+            "pool_max": 4,
+            "pool_size": 4,
+            "pool_available": 1,
+            "requests_waiting": 2,
+        }
+        conexion = SimpleNamespace(
+            vendor="postgresql",
+            settings_dict={"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": True, "OPTIONS": {"pool": {"max_size": 4}}},
+            pool=pool,
+        )
+        with mock.patch("backend.core.db.connections", {"default": conexion}):
+            datos = pool_stats()
+
+        self.assertEqual(datos["pool"]["saturacion"], 0.75)
+        self.assertEqual(datos["pool"]["en_espera"], 2)
+
@@ -0,0 +1,93 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import FormulaIngrediente, Turno
+from backend.core.expansion import parsear
+from backend.core.testing import FabricaAutomatica
+from backend.mantenimiento.models import RegistroMantenimiento
+from backend.produccion.models import RegistroProduccion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def _producto_de_la_formula(valores):
+    valores["producto"] = valores["formula"].producto
+    return valores
+
+
+class ExpansionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserModel.objects.create_user("supervisor", password="pass1234"))
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        self.fabrica = FabricaAutomatica(ajustes={RegistroProduccion: _producto_de_la_formula})
+
+    def _consultas(self, url, **parametros):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(url, parametros)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:300])
+        return respuesta.json(), len(consultas)
+
+    def test_parsear(self):
+        self.assertEqual(
+            parsear("producto, formula.ingredientes.material,formula.producto"),
+            {"producto": {}, "formula": {"ingredientes": {"material": {}}, "producto": {}}},
+        )
+
+    def test_sin_expand_devuelve_ids(self):
+        registro = self.fabrica.crear(RegistroProduccion)[0]
+        datos, _ = self._consultas(reverse("registro-produccion-detail", args=[registro.pk]))
+        self.assertEqual(datos["producto"], registro.producto_id)
+
+    def _registros(self, cantidad):
+        for registro in self.fabrica.crear(RegistroProduccion, cantidad):
+            FormulaIngrediente.objects.create(
+                formula=registro.formula, material=registro.producto, cantidad=1, unidad="kg"
+            )
+
+    def test_expande_el_grafo_con_consultas_acotadas(self):
+        self._registros(2)
+        url = reverse("registro-produccion-list")
+        expand = "producto,maquina,turno,formula.ingredientes.material"
+        datos, pocas = self._consultas(url, expand=expand)
+
+        registro = datos["results"][0]
+        self.assertIsInstance(registro["producto"], dict)
+        self.assertIn("codigo", registro["maquina"])
+        self.assertIn("hora_inicio", registro["turno"])
+        self.assertIn("ingredientes", registro["formula"])
+        ingredientes = [ingrediente for fila in datos["results"] for ingrediente in fila["formula"]["ingredientes"]]
+        self.assertTrue(ingredientes)
+        self.assertIsInstance(ingredientes[0]["material"], dict)
+
+        self._registros(4)
+        datos, muchas = self._consultas(url, expand=expand)
+        self.assertEqual(datos["count"], 6)
+        self.assertEqual(muchas, pocas)
+
+    def test_mantenimiento_expande_maquina(self):
+        registro = self.fabrica.crear(RegistroMantenimiento)[0]
+        datos, _ = self._consultas(
+            reverse("registro-mantenimiento-detail", args=[registro.pk]), expand="maquina,registrado_por"
+        )
+        self.assertEqual(datos["maquina"]["codigo"], registro.maquina.codigo)
+        self.assertEqual(datos["registrado_por"]["username"], registro.registrado_por.username)
+
+    def test_formula_expande_material_de_ingredientes(self):
+        ingrediente = self.fabrica.crear(FormulaIngrediente)[0]
+        datos, _ = self._consultas(
+            reverse("formula-detail", args=[ingrediente.formula_id]), expand="producto,ingredientes.material"
+        )
+        self.assertIsInstance(datos["producto"], dict)
+        self.assertEqual(datos["ingredientes"][0]["material"]["id"], ingrediente.material_id)
+
+    def test_expansion_invalida(self):
+        url = reverse("registro-produccion-list")
+        self.assertEqual(self.client.get(url, {"expand": "observaciones"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"expand": "producto.formulas"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"expand": "formula.ingredientes.material.x"}).status_code, 400)
@@ -0,0 +1,123 @@
+import csv
+import gzip
+import io
+import zipfile
+from datetime import timedelta
+from xml.etree import ElementTree
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Turno
+from backend.core.testing import FabricaAutomatica
+from backend.incidentes.models import Incidente
+from backend.incidentes.views import IncidenteViewSet
+from backend.mantenimiento.models import RegistroMantenimiento
+from backend.observaciones.models import ObservacionGeneral
+from backend.produccion.models import RegistroProduccion, RegistroProduccionEtapa
+from backend.produccion.views import RegistroProduccionViewSet
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+ESPACIO_XLSX = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def _producto_de_la_formula(valores):
+    valores["producto"] = valores["formula"].producto
+    return valores
+
+
+class ExportacionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.usuario = UserModel.objects.create_user("supervisor", password="pass1234")
+        self.client.force_authenticate(self.usuario)
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        self.fabrica = FabricaAutomatica(ajustes={RegistroProduccion: _producto_de_la_formula})
+
+    def _descargar(self, nombre_url, **parametros):
+        respuesta = self.client.get(reverse(nombre_url), parametros)
+        self.assertEqual(respuesta.status_code, 200, getattr(respuesta, "content", b"")[:300])
+        self.assertTrue(respuesta.streaming)
+        return respuesta, b"".join(respuesta.streaming_content)
+
+    def _filas_csv(self, contenido):
+        return list(csv.reader(io.StringIO(contenido.decode("utf-8-sig"))))
+
+    def test_csv_de_cada_endpoint(self):
+        casos = {
+            "registro-mantenimiento-export": RegistroMantenimiento,
+            "incidente-export": Incidente,
+            "observacion-general-export": ObservacionGeneral,
+        }
+        for nombre_url, modelo in casos.items():
+            with self.subTest(nombre_url):
+                self.fabrica.crear(modelo, 3)
+                respuesta, contenido = self._descargar(nombre_url)
+                self.assertIn("attachment;", respuesta["Content-Disposition"])
+                filas = self._filas_csv(contenido)
+                self.assertEqual(filas[0][0], "id")
+                self.assertEqual(len(filas), 1 + modelo.objects.count())
+
+    def test_produccion_una_fila_por_etapa_en_una_consulta(self):
+        self.fabrica.crear(RegistroProduccion, 2)
+        etapas = RegistroProduccionEtapa.objects.count()
+        sin_etapas = RegistroProduccion.objects.filter(etapas__isnull=True).count()
+        self.assertGreater(etapas, 0)
+
+        respuesta = self.client.get(reverse("registro-produccion-export"))
+        with self.assertNumQueries(1):
+            filas = self._filas_csv(b"".join(respuesta.streaming_content))
+
+        encabezados = [encabezado for encabezado, _ in RegistroProduccionViewSet.export_columns]
+        self.assertEqual(filas[0], encabezados)
+        self.assertEqual(len(filas) - 1, etapas + sin_etapas)
+
+    def test_xlsx_es_un_libro_valido(self):
+        self.fabrica.crear(Incidente, 4)
+        respuesta, contenido = self._descargar("incidente-export", formato="xlsx")
+        self.assertTrue(respuesta["Content-Disposition"].endswith('.xlsx"'))
+
+        with zipfile.ZipFile(io.BytesIO(contenido)) as libro:
+            self.assertIsNone(libro.testzip())
+            hoja = ElementTree.fromstring(libro.read("xl/worksheets/sheet1.xml"))
+        filas = hoja.findall(f"{ESPACIO_XLSX}sheetData/{ESPACIO_XLSX}row")
+        self.assertEqual(len(filas), 5)
+        self.assertEqual(len(filas[0]), len(IncidenteViewSet.export_columns))
+
+    def test_gzip_al_vuelo(self):
+        self.fabrica.crear(Incidente, 3)
+        _, plano = self._descargar("incidente-export")
+        respuesta, comprimido = self._descargar("incidente-export", gzip="1")
+        self.assertEqual(respuesta["Content-Type"], "application/gzip")
+        self.assertEqual(gzip.decompress(comprimido), plano)
+
+    def test_rango_de_fechas(self):
+        self.fabrica.crear(Incidente, 3)
+        viejo = Incidente.objects.first()
+        Incidente.objects.filter(pk=viejo.pk).update(
+            fecha_inicio=timezone.now() - timedelta(days=400),
+            fecha_fin=timezone.now() - timedelta(days=399),
+        )
+        desde = (timezone.localdate() - timedelta(days=365)).isoformat()
+        _, contenido = self._descargar("incidente-export", desde=desde)
+        ids = [fila[0] for fila in self._filas_csv(contenido)[1:]]
+        self.assertNotIn(str(viejo.pk), ids)
+        self.assertEqual(len(ids), 2)
+
+    def test_formato_y_fecha_invalidos(self):
+        self.assertEqual(self.client.get(reverse("incidente-export"), {"formato": "pdf"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("incidente-export"), {"desde": "ayer"}).status_code, 400)
+
+    def test_texto_con_formula_se_neutraliza(self):
+        ObservacionGeneral.objects.create(texto="=HYPERLINK(\"x\")", creado_por=self.usuario)
+        _, contenido = self._descargar("observacion-general-export")
+        self.assertEqual(self._filas_csv(contenido)[1][3], "'=HYPERLINK(\"x\")")
+
+    def test_requiere_autenticacion(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(reverse("incidente-export")).status_code, 401)
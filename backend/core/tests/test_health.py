@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from backend.core.services import salud
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class LivenessTests(TestCase):
+    def test_no_consulta_la_base(self):
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(reverse("health_live"))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json(), {"status": "ok"})
+
+
+@override_settings(HEALTH_CHECK_TTL_SECONDS=60)
+class ReadinessTests(TestCase):
+    def setUp(self):
+        salud.reiniciar()
+        self.addCleanup(salud.reiniciar)
+
+    def test_informa_cada_dependencia_con_latencia(self):
+        self.client.force_login(UserModel.objects.create_user("admin", password="pass1234", is_staff=True))
+        respuesta = self.client.get(reverse("health_ready"))
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual(datos["status"], "ok")
+        for nombre in ("database", "migrations", "cache", "storage", "tasks"):
+            self.assertIn("latencia_ms", datos["checks"][nombre])
+        self.assertEqual(datos["checks"]["migrations"]["pendientes"], 0)
+        self.assertIn("pool", datos["checks"]["database"])
+        self.assertIn("libre_mb", datos["checks"]["storage"])
+        self.assertEqual(set(datos["checks"]["cache"]["alias"]), {"default", "sessions", "throttle", "catalog", "reports"})
+
+    def test_publico_solo_informa_estados(self):
+        with mock.patch.dict(salud.CHEQUEOS, database=mock.Mock(side_effect=RuntimeError("host db-1 rechazó"))):
+            respuesta = self.client.get(reverse("health_ready"))
+        self.assertEqual(respuesta.status_code, 503)
+        datos = respuesta.json()
+        self.assertEqual(set(datos), {"status", "checks"})
+        for chequeo in datos["checks"].values():
+            self.assertEqual(set(chequeo), {"status"})
+        self.assertNotIn("db-1", respuesta.content.decode())
+
+    @override_settings(DEBUG=True)
+    def test_debug_muestra_el_detalle(self):
+        self.assertIn("libre_mb", self.client.get(reverse("health_ready")).json()["checks"]["storage"])
+
+    def test_health_original_solo_depende_de_la_base(self):
+        pendiente = mock.Mock(return_value={"status": "error", "pendientes": 1})
+        with mock.patch.dict(salud.CHEQUEOS, migrations=pendiente):
+            original = self.client.get(reverse("api_health"))
+            listo = self.client.get(reverse("health_ready"))
+        self.assertEqual(original.status_code, 200)
+        self.assertEqual(original.json(), {"status": "ok"})
+        self.assertEqual(listo.status_code, 503)
+
+    def test_reutiliza_el_resultado_dentro_del_ttl(self):
+        self.client.get(reverse("health_ready"))
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse("health_check"))
+        self.assertEqual(len(consultas), 0)
+        self.assertEqual(respuesta.json()["status"], "ok")
+
+    @override_settings(HEALTH_CHECK_TTL_SECONDS=0)
+    def test_migraciones_al_dia_no_se_recalculan(self):
+        self.client.get(reverse("health_ready"))
+        with mock.patch.object(salud, "MigrationExecutor") as executor:
+            self.client.get(reverse("health_ready"))
+        executor.assert_not_called()
+
+    def test_base_caida_responde_503(self):
+        with mock.patch.dict(salud.CHEQUEOS, database=mock.Mock(side_effect=RuntimeError("sin conexión"))):
+            respuesta = self.client.get(reverse("health_ready"))
+        self.assertEqual(respuesta.status_code, 503)
+        self.assertEqual(respuesta.json()["checks"]["database"]["status"], "error")
+        self.assertEqual(respuesta.json()["checks"]["migrations"]["status"], "error")
+
+    @override_settings(HEALTH_MIN_FREE_DISK_MB=10**12)
+    def test_poco_disco_degrada_sin_sacar_de_servicio(self):
+        respuesta = self.client.get(reverse("health_ready"))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()["status"], "degradado")
+        self.assertEqual(respuesta.json()["checks"]["storage"]["status"], "degradado")
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.core import idempotencia
+from backend.incidentes.models import Incidente
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class IdempotenciaTests(TestCase):
+    def setUp(self):
+        caches[settings.IDEMPOTENCY_CACHE_ALIAS].clear()
+        self.usuario = UserModel.objects.create_user("tablet", password="pass1234")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.usuario)}")
+        inicio = timezone.now() - timedelta(hours=2)
+        self.datos = {
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": (inicio + timedelta(hours=1)).isoformat(),
+            "origen": "general",
+            "descripcion": "Corte de energía",
+        }
+
+    def _crear(self, clave="clave-1", cliente=None, **cambios):
+        return (cliente or self.client).post(
+            reverse("incidente-list"), {**self.datos, **cambios}, format="json", HTTP_IDEMPOTENCY_KEY=clave
+        )
+
+    def test_reintento_devuelve_la_respuesta_original_sin_ejecutar(self):
+        primera = self._crear()
+        self.assertEqual(primera.status_code, 201)
+        with self.assertNumQueries(0):
+            segunda = self._crear()
+        self.assertEqual(segunda.status_code, 201)
+        self.assertEqual(segunda["Idempotent-Replayed"], "true")
+        self.assertEqual(segunda.content, primera.content)
+        self.assertEqual(Incidente.objects.count(), 1)
+
+        self.assertEqual(self._crear(clave="clave-2").status_code, 201)
+        self.assertEqual(Incidente.objects.count(), 2)
+
+    def test_la_clave_es_por_usuario(self):
+        otro = UserModel.objects.create_user("otro", password="pass1234")
+        cliente = APIClient()
+        cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(otro)}")
+        self._crear()
+        self.assertNotIn("Idempotent-Replayed", self._crear(cliente=cliente))
+        self.assertEqual(Incidente.objects.count(), 2)
+
+    def test_misma_clave_con_otro_cuerpo_es_rechazada(self):
+        self._crear()
+        respuesta = self._crear(descripcion="Otro incidente")
+        self.assertEqual(respuesta.status_code, 422)
+        self.assertEqual(Incidente.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0)
+    def test_duplicado_concurrente_espera_la_clave(self):
+        reserva, _ = idempotencia.iniciar(self._peticion_en_curso())
+        self.assertIsNotNone(reserva)
+        respuesta = self._crear()
+        self.assertEqual(respuesta.status_code, 409)
+        self.assertEqual(respuesta["Retry-After"], "1")
+        self.assertFalse(Incidente.objects.exists())
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0.2)
+    def test_clave_que_desaparece_respeta_la_espera(self):
+        # ``add`` falla y ``get`` no encuentra la clave: se pausa y se corta al límite.
+        cache = mock.Mock(**{"add.return_value": False, "get.return_value": None})
+        with mock.patch.object(idempotencia, "_cache", return_value=cache), mock.patch.object(
+            idempotencia.time, "sleep", wraps=idempotencia.time.sleep
+        ) as pausa:
+            reserva, respuesta = idempotencia.iniciar(self._peticion_en_curso())
+        self.assertIsNone(reserva)
+        self.assertEqual(respuesta.status_code, 409)
+        self.assertEqual(pausa.call_count, cache.add.call_count - 1)
+
+    def _peticion_en_curso(self):
+        # La misma petición que ``_crear``, reservada como si la atendiera otro worker.
+        return APIRequestFactory().post(
+            reverse("incidente-list"),
+            self.datos,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="clave-1",
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.usuario)}",
+        )
+
+    def test_errores_de_autenticacion_no_se_guardan(self):
+        cliente = APIClient()
+        cliente.credentials(HTTP_AUTHORIZATION="Bearer invalido")
+        self.assertEqual(self._crear(cliente=cliente).status_code, 401)
+        self.assertEqual(self._crear().status_code, 201)
+
+    def test_login_queda_exento(self):
+        for _ in range(2):
+            respuesta = APIClient().post(
+                reverse("login"), {"username": "tablet", "password": "pass1234"}, format="json", HTTP_IDEMPOTENCY_KEY="x"
+            )
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertNotIn("Idempotent-Replayed", respuesta)
+
+    @override_settings(IDEMPOTENCY_REQUIRED=True)
+    def test_cabecera_obligatoria(self):
+        respuesta = self.client.post(reverse("incidente-list"), self.datos, format="json")
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("Idempotency-Key", respuesta.json())
+        self.assertEqual(self._crear().status_code, 201)
@@ -0,0 +1,84 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase, override_settings
+
+from backend.catalogos.models import Formula, Maquina, Producto, Turno, Ubicacion
+from backend.core.carga import escenarios
+from backend.core.carga.cliente import DestinoNoPermitido, validar_destino
+from backend.core.carga.ejecutor import Ejecucion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class EscenariosTests(SimpleTestCase):
+    def test_escenarios_incluidos_son_validos(self):
+        for nombre in escenarios.disponibles():
+            with self.subTest(escenario=nombre):
+                self.assertTrue(escenarios.cargar(nombre).pasos)
+
+    def test_resolver_conserva_tipos_y_formatea(self):
+        variables = escenarios.Variables({"n": 7, "maquina": 12})
+        cuerpo = escenarios.resolver({"maquina": "{maquina}", "usuario": "op-{n:03d}"}, variables)
+        self.assertEqual(cuerpo, {"maquina": 12, "usuario": "op-007"})
+        self.assertLess(escenarios.resolver("{hace_2h}", variables), escenarios.resolver("{ahora}", variables))
+
+    def test_solo_destinos_locales(self):
+        self.assertEqual(validar_destino("http://127.0.0.1:8000").puerto, 8000)
+        with self.assertRaises(DestinoNoPermitido):
+            validar_destino("http://8.8.8.8")
+
+
+class UsuariosDelEscenarioTests(TestCase):
+    def test_faltan_operarios_sembrados(self):
+        for indice in range(60):
+            UserModel.objects.create(username=f"bench-op-{indice:04d}")
+        with self.assertRaisesMessage(CommandError, "Faltan 140 de 200") as contexto:
+            call_command("loadtest", "cambio_de_turno")
+        self.assertIn("--scale planta", str(contexto.exception))
+        self.assertIn("--users 60", str(contexto.exception))
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    METRICS_SLOW_REQUEST_MS=0,
+)
+class CambioDeTurnoTests(LiveServerTestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+        ubicacion = Ubicacion.objects.create(codigo="U1", nombre="Planta")
+        Maquina.objects.create(codigo="M1", nombre="Compresora", tipo="COMPRESION", ubicacion=ubicacion)
+        producto = Producto.objects.create(
+            codigo="P1", nombre="Ibuprofeno", tipo="COMPRIMIDO", presentacion="BLISTER", concentracion="400mg"
+        )
+        Formula.objects.create(codigo="F1", version="1", producto=producto)
+        for indice in range(7):
+            UserModel.objects.create_user(f"bench-op-{indice:04d}", password="bench-operario")
+
+    def _ejecutar(self, usuarios, ips_simuladas):
+        escenario = escenarios.cargar("cambio_de_turno")
+        escenario.usuarios = escenario.concurrencia = usuarios
+        escenario.rampa_segundos = 0
+        for paso in escenario.pasos:
+            paso.pausa = (0.0, 0.0)
+        return Ejecucion(escenario, validar_destino(self.live_server_url), ips_simuladas=ips_simuladas).ejecutar()
+
+    def test_operarios_completan_el_turno(self):
+        reporte = self._ejecutar(3, ips_simuladas=True)
+
+        self.assertEqual(reporte["usuarios_completos"], 3, reporte)
+        pasos = {paso["nombre"]: paso for paso in reporte["pasos"]}
+        self.assertEqual(pasos["abrir_registro"]["estados"], {"201": 3})
+        self.assertEqual(pasos["cerrar_etapa"]["exitosas"], 3)
+        self.assertIsNotNone(pasos["login"]["latencia_ms"]["p99"])
+        self.assertGreater(reporte["throughput_rps"], 0)
+
+    def test_marca_throttling_de_login_con_ip_compartida(self):
+        reporte = self._ejecutar(7, ips_simuladas=False)
+
+        alertas = [alerta for alerta in reporte["alertas"] if alerta["tipo"] == "throttling"]
+        self.assertEqual(alertas[0]["paso"], "login")
+        self.assertIn("LoginRateThrottle", alertas[0]["detalle"])
+        self.assertEqual(reporte["usuarios_abortados"], {"login": 2})
@@ -0,0 +1,116 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.core import actividad
+from backend.core.checks import buffer_de_logins
+from backend.tareas import registro
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def _escrituras(consultas, tabla):
+    return [
+        q["sql"] for q in consultas
+        if q["sql"].startswith("UPDATE") and f'"{tabla}"' in q["sql"]
+    ]
+
+
+@override_settings(LOGIN_ACTIVITY_FLUSH_SECONDS=60, CACHE_BACKEND="redis")
+class BufferLoginTests(TestCase):
+    def setUp(self):
+        caches["sessions"].clear()
+        caches["throttle"].clear()
+        self.client = APIClient()
+        self.usuarios = [
+            UserModel.objects.create_user(f"operario{i}", password="pass1234")
+            for i in range(3)
+        ]
+        # El primer login de cada intervalo vacía el buffer; se consume aquí.
+        caches["sessions"].set("actividad:login:intervalo", 1, timeout=60)
+
+    def _login(self, username):
+        respuesta = self.client.post(reverse("login"), {"username": username, "password": "pass1234"}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()
+
+    def test_login_no_escribe_usuario_ni_perfil(self):
+        with CaptureQueriesContext(connection) as consultas:
+            for usuario in self.usuarios:
+                self._login(usuario.username)
+
+        self.assertEqual(_escrituras(consultas, "auth_user"), [])
+        self.assertEqual(_escrituras(consultas, "usuarios_userprofile"), [])
+        self.assertFalse(UserModel.objects.filter(last_login__isnull=False).exists())
+
+    def test_vaciar_usa_un_unico_update(self):
+        for usuario in self.usuarios + self.usuarios[:1]:
+            self._login(usuario.username)
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(actividad.vaciar(), 3)
+        self.assertEqual(len(_escrituras(consultas, "auth_user")), 1)
+        self.assertEqual(UserModel.objects.filter(last_login__isnull=False).count(), 3)
+
+        # Sin logins nuevos no hay nada que volcar.
+        with self.assertNumQueries(0):
+            self.assertEqual(actividad.vaciar(), 0)
+
+    def test_primer_login_del_intervalo_vacia(self):
+        self._login(self.usuarios[0].username)
+        caches["sessions"].delete("actividad:login:intervalo")
+
+        self._login(self.usuarios[1].username)
+        self.assertEqual(UserModel.objects.filter(last_login__isnull=False).count(), 2)
+
+    def test_tarea_periodica_registrada(self):
+        definicion = registro.obtener("core.vaciar_actividad_login")
+        self.assertIsNotNone(definicion)
+        self._login(self.usuarios[0].username)
+        self.assertEqual(definicion.funcion(), {"actualizados": 1})
+
+    @override_settings(LOGIN_ACTIVITY_FLUSH_SECONDS=0)
+    def test_intervalo_cero_escribe_directo(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self._login(self.usuarios[0].username)
+        self.assertEqual(len(_escrituras(consultas, "auth_user")), 1)
+        self.assertEqual(_escrituras(consultas, "usuarios_userprofile"), [])
+        self.assertIsNotNone(UserModel.objects.get(pk=self.usuarios[0].pk).last_login)
+
+    @override_settings(CACHE_BACKEND="locmem")
+    def test_sin_cache_compartida_escribe_cada_login(self):
+        # La tarea de vaciado corre en otro proceso: con locmem no vería el buffer.
+        for usuario in self.usuarios:
+            self._login(usuario.username)
+        self.assertEqual(UserModel.objects.filter(last_login__isnull=False).count(), 3)
+
+    def test_chequeos_del_buffer(self):
+        self.assertEqual(buffer_de_logins(None), [])
+        with override_settings(CACHE_BACKEND="locmem"):
+            self.assertEqual([error.id for error in buffer_de_logins(None)], ["core.E002"])
+        with override_settings(LOGIN_ACTIVITY_RETENTION_SECONDS=60):
+            self.assertEqual([error.id for error in buffer_de_logins(None)], ["core.E003"])
+
+
+class PerfilSoloSiCambiaTests(TestCase):
+    def setUp(self):
+        self.usuario = UserModel.objects.create_user("operario", password="pass1234")
+
+    def test_guardado_sin_cambios_de_perfil_no_lo_toca(self):
+        usuario = UserModel.objects.get(pk=self.usuario.pk)
+        with CaptureQueriesContext(connection) as consultas:
+            usuario.is_staff = True
+            usuario.save()
+        self.assertEqual(_escrituras(consultas, "usuarios_userprofile"), [])
+
+    def test_cambio_de_nombre_actualiza_el_perfil(self):
+        usuario = UserModel.objects.get(pk=self.usuario.pk)
+        with CaptureQueriesContext(connection) as consultas:
+            usuario.first_name = "Ana"
+            usuario.save()
+        self.assertEqual(len(_escrituras(consultas, "usuarios_userprofile")), 1)
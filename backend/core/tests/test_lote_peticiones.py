@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Maquina, Ubicacion
+from backend.core.services import lote_peticiones
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class LotePeticionesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.usuario = UserModel.objects.create_superuser("admin", "admin@example.com", "pass1234")
+        self.client.force_authenticate(self.usuario)
+        self.ubicacion = Ubicacion.objects.create(codigo="PL1", nombre="Planta 1")
+        Maquina.objects.create(codigo="M1", nombre="Compresora", tipo="COMPRESION", ubicacion=self.ubicacion)
+
+    def _lote(self, peticiones):
+        return self.client.post(reverse("batch"), peticiones, format="json")
+
+    def test_devuelve_cada_respuesta_en_orden(self):
+        respuesta = self._lote(
+            [
+                {"id": "maquinas", "path": "/api/catalogos/maquinas/", "query": {"search": "Comp"}},
+                {"id": "ubicacion", "method": "GET", "path": f"/api/catalogos/ubicaciones/{self.ubicacion.pk}/"},
+                {"id": "no-existe", "path": "/api/no-existe/"},
+            ]
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        resultados = respuesta.json()["resultados"]
+        self.assertEqual([resultado["id"] for resultado in resultados], ["maquinas", "ubicacion", "no-existe"])
+        self.assertEqual([resultado["status"] for resultado in resultados], [200, 200, 404])
+        self.assertEqual(resultados[0]["body"]["results"][0]["codigo"], "M1")
+        self.assertEqual(resultados[1]["body"]["codigo"], "PL1")
+
+    def test_escrituras_en_orden_con_la_autenticacion_de_quien_llama(self):
+        respuesta = self._lote(
+            [
+                {"method": "POST", "path": "/api/catalogos/ubicaciones/", "body": {"codigo": "PL2", "nombre": "Planta 2"}},
+                {"path": "/api/catalogos/ubicaciones/", "query": "search=PL2"},
+                {"method": "POST", "path": "/api/catalogos/ubicaciones/", "body": {"codigo": "PL2"}},
+            ]
+        )
+        resultados = respuesta.json()["resultados"]
+        self.assertEqual([resultado["status"] for resultado in resultados], [201, 200, 400])
+        self.assertEqual(resultados[1]["body"]["count"], 1)
+        self.assertTrue(Ubicacion.objects.filter(codigo="PL2").exists())
+
+    def test_no_repite_la_autenticacion_por_subpeticion(self):
+        with mock.patch(
+            "backend.core.authentication.StatelessJWTAuthentication.authenticate", return_value=None
+        ) as autenticar:
+            self._lote([{"path": "/api/catalogos/ubicaciones/"}] * 3)
+        autenticar.assert_not_called()
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_rechaza_lotes_invalidos(self):
+        self.assertEqual(self._lote([{"path": "/api/catalogos/ubicaciones/"}] * 3).status_code, 400)
+        self.assertEqual(self._lote({"path": "/api/catalogos/ubicaciones/"}).status_code, 400)
+        resultados = self._lote([{"path": "/api/batch/", "method": "POST"}, {"path": "/admin/"}]).json()["resultados"]
+        self.assertEqual([resultado["status"] for resultado in resultados], [400, 400])
+
+    def test_requiere_autenticacion(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self._lote([{"path": "/api/catalogos/ubicaciones/"}]).status_code, 401)
+
+
+@override_settings(BATCH_MAX_WORKERS=3)
+class LecturasEnParaleloTests(TransactionTestCase):
+    def test_lecturas_consecutivas_usan_el_pool(self):
+        usuario = UserModel.objects.create_superuser("admin", "admin@example.com", "pass1234")
+        Ubicacion.objects.create(codigo="PL1", nombre="Planta 1")
+        client = APIClient()
+        client.force_authenticate(usuario)
+
+        lote = [{"path": "/api/catalogos/ubicaciones/"}, {"path": "/api/catalogos/maquinas/"}]
+
+        with mock.patch.object(lote_peticiones, "usa_pool", return_value=True), mock.patch.object(
+            lote_peticiones, "_ejecutar_en_hilo", wraps=lote_peticiones._ejecutar_en_hilo
+        ) as en_hilo:
+            respuesta = client.post(reverse("batch"), lote, format="json")
+            client.post(reverse("batch"), lote, format="json")
+        self.assertEqual(en_hilo.call_count, 4)
+        self.assertEqual([resultado["status"] for resultado in respuesta.json()["resultados"]], [200, 200])
+        self.assertEqual(respuesta.json()["resultados"][0]["body"]["count"], 1)
+        # Un solo ejecutor por proceso, reutilizado entre lotes.
+        self.assertIs(lote_peticiones._ejecutor(), lote_peticiones._hilos)
+
+        # Sin pool cada hilo abriría su propia conexión: se ejecuta en orden.
+        with mock.patch.object(lote_peticiones, "_ejecutar_en_hilo") as en_hilo:
+            client.post(reverse("batch"), lote, format="json")
+        en_hilo.assert_not_called()
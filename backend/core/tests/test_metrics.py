@@ -0,0 +1,83 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.core import metrics
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class PerformanceMetricsTests(TestCase):
+    def setUp(self):
+        metrics.registro.reiniciar()
+        self.client = APIClient()
+        self.usuario = UserModel.objects.create_user("operario", password="pass1234")
+        self.client.force_authenticate(self.usuario)
+
+    def test_server_timing_incluye_db_y_render(self):
+        response = self.client.get(reverse("maquina-list"))
+
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertIn("total;dur=", timing)
+        self.assertIn('db;dur=', timing)
+        self.assertIn("consultas", timing)
+        self.assertIn("render;dur=", timing)
+
+    def test_endpoint_prometheus_agrega_por_vista_y_accion(self):
+        self.client.get(reverse("maquina-list"))
+        self.client.get(reverse("maquina-list"))
+
+        with override_settings(METRICS_PUBLIC=True):
+            response = self.client.get("/api/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        cuerpo = response.content.decode()
+        self.assertIn("# TYPE siprosa_http_request_duration_seconds histogram", cuerpo)
+        self.assertIn(
+            'siprosa_http_request_duration_seconds_count{view="maquina-list",'
+            'action="list",method="GET",status="2xx"} 2',
+            cuerpo,
+        )
+
+    def test_privado_por_defecto(self):
+        anonimo = APIClient()
+        self.assertEqual(anonimo.get("/api/metrics").status_code, 401)
+        # Sin token configurado, ningún Bearer habilita el acceso.
+        self.assertEqual(anonimo.get("/api/metrics", HTTP_AUTHORIZATION="Bearer ").status_code, 401)
+
+        staff = APIClient()
+        staff.force_login(UserModel.objects.create_user("admin", password="pass1234", is_staff=True))
+        self.assertEqual(staff.get("/api/metrics").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="secreto")
+    def test_token_requerido_si_esta_configurado(self):
+        self.assertEqual(self.client.get("/api/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer otro").status_code, 401)
+        autorizado = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer secreto")
+        self.assertEqual(autorizado.status_code, 200)
+
+    def test_combina_archivos_de_otros_procesos(self):
+        with tempfile.TemporaryDirectory() as directorio, override_settings(METRICS_DIR=directorio):
+            etiquetas = ["maquina-list", "list", "GET", "2xx"]
+            otro_proceso = [
+                [
+                    "siprosa_http_db_queries",
+                    etiquetas,
+                    {"buckets": [0, 0, 3, 0, 0, 0, 0, 0, 0], "sum": 6.0, "count": 3},
+                ]
+            ]
+            Path(directorio, "metricas-99999-1.json").write_text(json.dumps(otro_proceso))
+            metrics.registro.observar("siprosa_http_db_queries", tuple(etiquetas), 2)
+
+            combinadas = metrics.registro.combinar()
+
+        serie = combinadas[("siprosa_http_db_queries", tuple(etiquetas))]
+        self.assertEqual(serie["count"], 4)
+        self.assertEqual(serie["sum"], 8.0)
@@ -0,0 +1,83 @@
+"""Regresión de N+1: el costo en consultas de cada listado no depende de N.
+
+Recorre automáticamente todos los routers de ``backend/*/urls.py``. Un
+ViewSet nuevo queda cubierto sin tocar este archivo; si sus filas necesitan
+reglas de negocio para ser válidas, se agregan en ``AJUSTES``.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.test import TestCase
+from django.urls import NoReverseMatch, reverse
+from rest_framework.test import APIClient
+
+from backend.catalogos.models import Funcion, Turno
+from backend.core.services.rutas import viewsets_registrados
+from backend.core.testing import ConteoConsultasMixin, FabricaAutomatica
+from backend.produccion.models import RegistroProduccion
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def _producto_de_la_formula(valores):
+    valores["producto"] = valores["formula"].producto
+    return valores
+
+
+def _completar_perfil(usuario):
+    perfil = getattr(usuario, "user_profile", None)
+    if perfil is None:
+        return
+    perfil.funcion = Funcion.objects.create(codigo=f"F-{usuario.pk}", nombre=f"Función {usuario.pk}")
+    perfil.turno_habitual = Turno.objects.first()
+    perfil.save()
+
+
+AJUSTES = {
+    RegistroProduccion: _producto_de_la_formula,
+}
+POSTERIORES = {
+    UserModel: _completar_perfil,
+}
+
+
+class ListadosSinNMasUnoTests(ConteoConsultasMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = UserModel.objects.create_superuser("admin", "admin@example.com", "pass1234")
+        self.client.force_authenticate(self.admin)
+        Turno.objects.create(codigo="M", nombre="Mañana", hora_inicio="06:00", hora_fin="14:00")
+
+    def test_listados_de_todos_los_routers(self):
+        fabrica = FabricaAutomatica(ajustes=AJUSTES, posteriores=POSTERIORES)
+        cubiertos = 0
+
+        for registrado in viewsets_registrados():
+            modelo = registrado.modelo
+            if modelo is None or not registrado.tiene_accion("list"):
+                continue
+            try:
+                url = reverse(f"{registrado.basename}-list")
+            except NoReverseMatch:
+                continue
+
+            n, factor = 2, self.factor_filas
+            capacidad = fabrica.capacidad(modelo)
+            if capacidad is not None:
+                n, factor = 1, capacidad - modelo.objects.count()
+                if factor < 2:
+                    continue
+
+            with self.subTest(viewset=registrado.viewset.__name__, url=url):
+                with transaction.atomic():
+                    self.assertConsultasIndependientesDeN(
+                        url,
+                        lambda cantidad, modelo=modelo: fabrica.crear(modelo, cantidad),
+                        n=n,
+                        factor=factor,
+                    )
+                    transaction.set_rollback(True)
+            cubiertos += 1
+
+        self.assertGreater(cubiertos, 10)
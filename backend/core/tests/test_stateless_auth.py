@@ -0,0 +1,128 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.core.authentication import usuario_desde_claims
+from backend.core.checks import cache_compartida_requerida
+from backend.core.permissions import is_supervisor
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+@override_settings(JWT_STATELESS_AUTH=True)
+class StatelessJWTTests(TestCase):
+    def setUp(self):
+        caches["sessions"].clear()
+        caches["throttle"].clear()
+        self.client = APIClient()
+        self.supervisor = Group.objects.create(name="Supervisor")
+        self.usuario = UserModel.objects.create_user("operario", password="pass1234", email="op@example.com")
+        self.usuario.groups.add(self.supervisor)
+        self.admin = UserModel.objects.create_superuser("admin", "admin@example.com", "pass1234")
+
+    def _login(self, username="operario"):
+        respuesta = self.client.post(reverse("login"), {"username": username, "password": "pass1234"}, format="json")
+        self.assertEqual(respuesta.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {respuesta.json()['access']}")
+        return respuesta.json()
+
+    def _consultas_de_auth(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200, respuesta.content[:300])
+        return [q["sql"] for q in consultas if "auth_user" in q["sql"] or "auth_group" in q["sql"]]
+
+    def test_lecturas_sin_consultas_de_autenticacion(self):
+        self._login()
+        self.assertEqual(self._consultas_de_auth(reverse("maquina-list")), [])
+
+    def test_grupos_del_token_resuelven_permisos(self):
+        datos = self._login()
+
+        token_usuario = usuario_desde_claims(AccessToken(datos["access"]))
+        with self.assertNumQueries(0):
+            self.assertTrue(is_supervisor(token_usuario))
+            self.assertEqual(token_usuario.username, "operario")
+        # Un campo fuera del token se carga completo en una sola consulta.
+        with self.assertNumQueries(1):
+            self.assertEqual(token_usuario.email, "op@example.com")
+            self.assertIsNotNone(token_usuario.date_joined)
+
+    def test_desactivar_usuario_revoca_sus_tokens(self):
+        datos_operario = self._login()
+        self.assertEqual(self.client.get(reverse("maquina-list")).status_code, 200)
+
+        admin = APIClient()
+        admin.force_authenticate(self.admin)
+        self.assertEqual(admin.delete(reverse("usuario-detail", args=[self.usuario.pk])).status_code, 200)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {datos_operario['access']}")
+        self.assertEqual(self.client.get(reverse("maquina-list")).status_code, 401)
+        refresco = self.client.post("/api/token/refresh/", {"refresh": datos_operario["refresh"]}, format="json")
+        self.assertEqual(refresco.status_code, 401)
+
+    def test_cambio_de_grupo_revoca_y_el_refresco_trae_roles_nuevos(self):
+        datos = self._login()
+        self.usuario.groups.remove(self.supervisor)
+
+        self.assertEqual(self.client.get(reverse("maquina-list")).status_code, 401)
+
+        # ``iat`` tiene resolución de segundos: se evita emitir en el mismo segundo de la revocación.
+        caches["sessions"].clear()
+        refresco = self.client.post("/api/token/refresh/", {"refresh": datos["refresh"]}, format="json")
+        self.assertEqual(refresco.status_code, 200)
+        self.assertEqual(AccessToken(refresco.json()["access"])["groups"], [])
+
+    @override_settings(JWT_STATELESS_AUTH=False)
+    def test_modo_con_estado_consulta_el_usuario(self):
+        self._login()
+        self.assertTrue(self._consultas_de_auth(reverse("maquina-list")))
+
+    def test_guardar_el_usuario_del_token_no_restaura_privilegios(self):
+        self.usuario.is_staff = True
+        self.usuario.save()
+        # El cambio de rol revoca en el mismo segundo en que se emitiría el token.
+        caches["sessions"].clear()
+        self._login()
+        # Degradado sin que la revocación llegue a este worker (p. ej. caché por proceso).
+        UserModel.objects.filter(pk=self.usuario.pk).update(is_staff=False, is_superuser=False)
+
+        respuesta = self.client.post(
+            reverse("usuario-cambiar-mi-password"),
+            {
+                "password_actual": "pass1234",
+                "password_nueva": "Nueva-clave-123",
+                "password_confirmacion": "Nueva-clave-123",
+            },
+            format="json",
+        )
+        self.assertEqual(respuesta.status_code, 200, respuesta.content)
+        self.usuario.refresh_from_db()
+        self.assertFalse(self.usuario.is_staff)
+        self.assertTrue(self.usuario.check_password("Nueva-clave-123"))
+
+    def test_save_del_usuario_token_relee_los_claims(self):
+        datos = self._login()
+        UserModel.objects.filter(pk=self.usuario.pk).update(is_active=False, is_staff=True)
+
+        token_usuario = usuario_desde_claims(AccessToken(datos["access"]))
+        token_usuario.username = "operario2"
+        token_usuario.save()
+        self.usuario.refresh_from_db()
+        self.assertEqual(
+            (self.usuario.username, self.usuario.is_active, self.usuario.is_staff), ("operario2", False, True)
+        )
+
+    def test_chequeo_rechaza_cache_por_proceso(self):
+        self.assertIn("core.E001", [error.id for error in cache_compartida_requerida(None)])
+        with override_settings(JWT_STATELESS_AUTH=False):
+            self.assertNotIn("core.E001", [error.id for error in cache_compartida_requerida(None)])
+        with override_settings(CACHE_BACKEND="redis"):
+            self.assertEqual(cache_compartida_requerida(None), [])
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from backend.core.throttles import EscrituraRateThrottle, LoginRateThrottle
+from backend.incidentes.views import IncidenteViewSet
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class _Reloj:
+    def __init__(self, ahora):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.reloj = _Reloj(6000.0)  # inicio exacto de una ventana de 60 s
+        self.peticion = Request(RequestFactory().post("/api/auth/login/"))
+
+    def _permitir(self):
+        throttle = LoginRateThrottle()
+        throttle.timer = self.reloj
+        return throttle, throttle.allow_request(self.peticion, None)
+
+    def test_pondera_la_ventana_anterior(self):
+        for _ in range(5):
+            self.assertTrue(self._permitir()[1])
+        throttle, permitido = self._permitir()
+        self.assertFalse(permitido)
+        self.assertEqual(throttle.wait(), 60.0)
+
+        # A mitad de la ventana siguiente la anterior pesa 2.5: entran 3 más.
+        self.reloj.ahora = 6090.0
+        for _ in range(3):
+            self.assertTrue(self._permitir()[1])
+        throttle, permitido = self._permitir()
+        self.assertFalse(permitido)
+        self.assertAlmostEqual(throttle.wait(), 6.0)
+
+    def test_un_contador_entero_por_ventana(self):
+        for _ in range(200):
+            self._permitir()
+        propias = {
+            clave: valor for clave, valor in caches["throttle"]._cache.items() if "throttle_login" in clave
+        }
+        self.assertEqual(len(propias), 1)
+
+
+class ThrottleHeadersTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def test_login_informa_ratelimit_y_retry_after(self):
+        respuesta = self.client.post(reverse("login"), {"username": "x", "password": "y"}, format="json")
+        self.assertEqual(respuesta["RateLimit-Limit"], "5")
+        self.assertEqual(respuesta["RateLimit-Remaining"], "4")
+        self.assertEqual(respuesta["RateLimit-Policy"], "5;w=60")
+
+        for _ in range(4):
+            self.client.post(reverse("login"), {"username": "x", "password": "y"}, format="json")
+        bloqueada = self.client.post(reverse("login"), {"username": "x", "password": "y"}, format="json")
+
+        self.assertEqual(bloqueada.status_code, 429)
+        self.assertEqual(bloqueada["RateLimit-Remaining"], "0")
+        self.assertGreater(int(bloqueada["Retry-After"]), 0)
+
+    def test_escrituras_limitadas_por_scope_y_lecturas_libres(self):
+        usuario = UserModel.objects.create_user("operario", password="pass1234")
+        self.client.force_authenticate(usuario)
+        url = reverse("incidente-list")
+        cuerpo = {
+            "fecha_inicio": "2024-01-01T08:00:00Z",
+            "fecha_fin": "2024-01-01T09:00:00Z",
+            "origen": "general",
+            "descripcion": "Parada",
+        }
+
+        tasas = {**EscrituraRateThrottle.THROTTLE_RATES, "incidentes": "2/min"}
+        with mock.patch.object(EscrituraRateThrottle, "THROTTLE_RATES", tasas):
+            self.assertEqual(self.client.post(url, cuerpo, format="json").status_code, 201)
+            self.assertEqual(self.client.post(url, cuerpo, format="json").status_code, 201)
+            self.assertEqual(self.client.post(url, cuerpo, format="json").status_code, 429)
+            lectura = self.client.get(url)
+
+        self.assertEqual(IncidenteViewSet.throttle_scope, "incidentes")
+        self.assertEqual(lectura.status_code, 200)
+        self.assertNotIn("RateLimit-Limit", lectura)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from backend.core import lista_negra
+from backend.core.cache import invalidar
+from backend.core.tokens import RoleRefreshToken
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+
+class ListaNegraTestMixin:
+    def setUp(self):
+        caches["sessions"].clear()
+        caches["throttle"].clear()
+        lista_negra.revocados.reiniciar()
+        self.usuario = UserModel.objects.create_user("operario", password="pass1234")
+
+
+class CompactacionTests(ListaNegraTestMixin, TestCase):
+    def test_purga_por_lotes_solo_los_expirados(self):
+        tokens = [RoleRefreshToken.for_user(self.usuario) for _ in range(5)]
+        for token in tokens[:3]:
+            token.blacklist()
+        vencidos = [token["jti"] for token in tokens[1:4]]
+        OutstandingToken.objects.filter(jti__in=vencidos).update(expires_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(lista_negra.purgar_expirados(lote=2), 3)
+
+        self.assertEqual(
+            set(OutstandingToken.objects.values_list("jti", flat=True)),
+            {tokens[0]["jti"], tokens[4]["jti"]},
+        )
+        self.assertEqual(list(BlacklistedToken.objects.values_list("token__jti", flat=True)), [tokens[0]["jti"]])
+
+    def test_comando(self):
+        token = RoleRefreshToken.for_user(self.usuario)
+        OutstandingToken.objects.filter(jti=token["jti"]).update(expires_at=timezone.now() - timedelta(seconds=1))
+        salida = StringIO()
+        call_command("compact_tokens", "--batch-size", "10", stdout=salida)
+        self.assertIn("1 tokens expirados eliminados", salida.getvalue())
+        self.assertFalse(OutstandingToken.objects.exists())
+
+
+@override_settings(CACHE_BACKEND="redis")
+class ConsultaRapidaTests(ListaNegraTestMixin, TestCase):
+    def test_verificar_no_consulta_la_base_si_no_hubo_altas(self):
+        RoleRefreshToken(str(RoleRefreshToken.for_user(self.usuario)))
+        texto = str(RoleRefreshToken.for_user(self.usuario))
+        with self.assertNumQueries(0):
+            RoleRefreshToken(texto)
+
+    def test_alta_confirmada_se_ve_sin_releer_todo(self):
+        texto = str(RoleRefreshToken.for_user(self.usuario))
+        RoleRefreshToken(texto)
+        with self.captureOnCommitCallbacks(execute=True):
+            RoleRefreshToken(texto).blacklist()
+
+        with self.assertRaises(TokenError):
+            RoleRefreshToken(texto)
+
+    def _revocar_con_id(self, fila_id):
+        jti = RoleRefreshToken.for_user(self.usuario)["jti"]
+        BlacklistedToken.objects.create(id=fila_id, token=OutstandingToken.objects.get(jti=jti))
+        invalidar("lista_negra", alias="sessions")
+        return jti
+
+    def test_alta_confirmada_fuera_de_orden(self):
+        # La fila con ``id`` menor se confirma después de leer las posteriores.
+        primera = self._revocar_con_id(1)
+        self.assertTrue(lista_negra.contiene(primera))
+        self.assertTrue(lista_negra.contiene(self._revocar_con_id(500)))
+        self.assertTrue(lista_negra.contiene(self._revocar_con_id(2)))
+
+        # Un salto mayor que MAX_HUECOS hace releer la tabla completa.
+        self.assertTrue(lista_negra.contiene(self._revocar_con_id(500 + lista_negra.MAX_HUECOS + 10)))
+        self.assertTrue(lista_negra.contiene(self._revocar_con_id(501)))
+
+    def test_rotacion_rechaza_el_refresh_reutilizado(self):
+        client = APIClient()
+        login = client.post(reverse("login"), {"username": "operario", "password": "pass1234"}, format="json").json()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            primero = client.post("/api/token/refresh/", {"refresh": login["refresh"]}, format="json")
+        self.assertEqual(primero.status_code, 200)
+
+        reuso = client.post("/api/token/refresh/", {"refresh": login["refresh"]}, format="json")
+        self.assertEqual(reuso.status_code, 401)
+
+    def test_logout_revoca_el_refresh(self):
+        client = APIClient()
+        login = client.post(reverse("login"), {"username": "operario", "password": "pass1234"}, format="json").json()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {login['access']}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(client.post(reverse("logout"), {"refresh": login["refresh"]}, format="json").status_code, 200)
+
+        refresco = client.post("/api/token/refresh/", {"refresh": login["refresh"]}, format="json")
+        self.assertEqual(refresco.status_code, 401)
+
+
+class SinCacheCompartidaTests(ListaNegraTestMixin, TestCase):
+    def test_locmem_consulta_la_base(self):
+        texto = str(RoleRefreshToken.for_user(self.usuario))
+        with self.assertNumQueries(1):
+            RoleRefreshToken(texto)
+        RoleRefreshToken(texto).blacklist()
+        with self.assertRaises(TokenError):
+            RoleRefreshToken(texto)
@@ -1,9 +1,97 @@
-"""Clases de rate limiting para vistas de autenticación."""
+"""Clases de rate limiting con ventana deslizante de memoria constante.
 
+``SimpleRateThrottle`` de DRF guarda la lista completa de timestamps por
+clave y la reescribe en cada petición. Aquí se usa un contador de ventana
+deslizante: dos contadores enteros por clave (ventana actual y anterior) y
+un incremento atómico en la caché compartida, sin importar la tasa.
+"""
+
+import math
+import time
+
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.throttling import SimpleRateThrottle
 
+from backend.core.cache import throttle_cache
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Estimación ``anterior * (1 - fracción transcurrida) + actual`` contra el límite.
+
+    Deja en ``request.limite_tasa`` los datos para las cabeceras
+    ``RateLimit-*`` que agrega ``RateLimitHeadersMiddleware``.
+    """
+
+    cache = throttle_cache
+    timer = time.time
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        ventana = int(self.now // self.duration)
+        transcurrido = (self.now - ventana * self.duration) / self.duration
+        clave_actual = f"{self.key}:{ventana}"
+        clave_anterior = f"{self.key}:{ventana - 1}"
+
+        contadores = self.cache.get_many([clave_actual, clave_anterior])
+        anterior = contadores.get(clave_anterior, 0)
+        actual = contadores.get(clave_actual, 0)
+        peso = anterior * (1 - transcurrido)
+
+        if peso + actual >= self.num_requests:
+            self._espera = self._calcular_espera(anterior, actual, transcurrido)
+            self._publicar(request, 0, transcurrido)
+            return False
+
+        actual = self._incrementar(clave_actual)
+        self._espera = None
+        self._publicar(request, self.num_requests - math.ceil(peso + actual), transcurrido)
+        return True
 
-class _BaseUserOrIpThrottle(SimpleRateThrottle):
+    def _incrementar(self, clave):
+        # Las claves viven dos ventanas: la actual y la que se pondera después.
+        if self.cache.add(clave, 1, timeout=2 * self.duration):
+            return 1
+        try:
+            return self.cache.incr(clave)
+        except ValueError:
+            self.cache.set(clave, 1, timeout=2 * self.duration)
+            return 1
+
+    def _calcular_espera(self, anterior, actual, transcurrido):
+        """Segundos hasta que la estimación vuelva a quedar bajo el límite."""
+
+        if actual < self.num_requests and anterior:
+            # Dentro de esta ventana, cuando el peso de la anterior decaiga lo suficiente.
+            fraccion = 1 - (self.num_requests - actual) / anterior
+            return max(0.0, (fraccion - transcurrido) * self.duration)
+        # Hay que pasar a la próxima ventana, donde ``actual`` pasa a ser la anterior.
+        fraccion = max(0.0, 1 - self.num_requests / actual) if actual else 0.0
+        return (1 - transcurrido + fraccion) * self.duration
+
+    def _publicar(self, request, restantes, transcurrido):
+        info = {
+            "limite": self.num_requests,
+            "restantes": max(0, restantes),
+            "reinicio": math.ceil((1 - transcurrido) * self.duration),
+            "ventana": self.duration,
+        }
+        peticion = getattr(request, "_request", request)
+        previo = getattr(peticion, "limite_tasa", None)
+        # Con varios throttles se informa el más restrictivo.
+        if previo is None or info["restantes"] <= previo["restantes"]:
+            peticion.limite_tasa = info
+
+    def wait(self):
+        return getattr(self, "_espera", None)
+
+
+class _BaseUserOrIpThrottle(SlidingWindowRateThrottle):
     """Throttle que combina la IP del request con el usuario autenticado."""
 
     def get_cache_key(self, request, view):
@@ -25,3 +113,26 @@ class RegisterRateThrottle(_BaseUserOrIpThrottle):
 
     scope = "register"
 
+
+class EscrituraRateThrottle(_BaseUserOrIpThrottle):
+    """Limita escrituras por usuario según el ``throttle_scope`` de la vista.
+
+    Las lecturas y las vistas sin ``throttle_scope`` no se limitan. La tasa
+    sale de ``DEFAULT_THROTTLE_RATES[<scope>]``.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # La tasa depende de la vista; se resuelve en ``allow_request``.
+        pass
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,103 @@
+"""Tokens JWT con los roles del usuario embebidos como claims.
+
+Con los claims ``username``, ``is_staff``, ``is_superuser`` y ``groups`` la
+autenticación sin estado (``JWT_STATELESS_AUTH``) resuelve permisos sin
+consultar ``auth_user`` ni ``auth_user_groups``.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from backend.core import lista_negra
+from backend.core.actividad import registrar_login
+
+CLAIM_GRUPOS = "groups"
+
+
+def agregar_claims_de_rol(token, user):
+    token["username"] = user.get_username()
+    token["is_staff"] = user.is_staff
+    token["is_superuser"] = user.is_superuser
+    token[CLAIM_GRUPOS] = sorted(user.groups.values_list("name", flat=True))
+    return token
+
+
+class RoleRefreshToken(RefreshToken):
+    """Refresh token cuyo access token hereda los claims de rol.
+
+    La lista negra se consulta y se alimenta a través de
+    ``backend.core.lista_negra``.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return agregar_claims_de_rol(super().for_user(user), user)
+
+    def check_blacklist(self):
+        if lista_negra.contiene(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        # El token ya figura como emitido (``for_user`` u ``outstand``): se
+        # evita releer el usuario que hace la implementación base.
+        if not lista_negra.revocar(self.payload[api_settings.JTI_CLAIM]):
+            return super().blacklist()
+
+
+def renovar_claims(refresh):
+    """Relee al usuario del refresh token y actualiza sus claims de rol.
+
+    Se usa al refrescar: es el único momento en que el flujo sin estado
+    consulta la base, y garantiza que un rol modificado llegue al nuevo
+    access token. Falla si el usuario ya no puede autenticarse.
+    """
+
+    UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+    user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+    user = UserModel.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+    if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+        raise AuthenticationFailed(
+            TokenRefreshSerializer.default_error_messages["no_active_account"],
+            "no_active_account",
+        )
+    agregar_claims_de_rol(refresh, user)
+    return user
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        # ``UPDATE_LAST_LOGIN`` queda apagado: el login va al buffer de actividad.
+        registrar_login(self.user)
+        return data
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        renovar_claims(refresh)
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+
+            data["refresh"] = str(refresh)
+
+        return data
@@ -1,7 +1,7 @@
 # URLs del núcleo (no monta dominios)
 
 from django.conf import settings
-from django.urls import path
+from django.urls import path, re_path
 
 from .auth_views import (
     login_view,
@@ -10,15 +10,19 @@ from .auth_views import (
     refresh_token_view,
     register_view,
 )
-from .views import health_check
+from .views import LotePeticionesView, health_check, liveness_check, metrics_view, readiness_check
 
 urlpatterns = [
     path('health/', health_check, name='health_check'),
+    path('health/live/', liveness_check, name='health_live'),
+    path('health/ready/', readiness_check, name='health_ready'),
+    re_path(r'^metrics/?$', metrics_view, name='metrics'),
     path('auth/login/', login_view, name='login'),
     path('auth/logout/', logout_view, name='logout'),
     path('auth/me/', me_view, name='me'),
     path('auth/refresh/', refresh_token_view, name='refresh_token'),
     path('auth/register/', register_view, name='register'),
+    path('batch/', LotePeticionesView.as_view(), name='batch'),
 ]
 
 if settings.ENABLE_GLOBAL_SEARCH:
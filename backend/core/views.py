@@ -1,12 +1,15 @@
 """Vistas transversales del núcleo de la aplicación."""
 
-from django.db import connections
-from django.db.utils import OperationalError
-from django.http import JsonResponse
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.core import metrics
+from backend.core.services import lote_peticiones, salud
 from backend.core.services.search import global_search
 
 
@@ -44,6 +47,33 @@ class BusquedaGlobalView(APIView):
         )
 
 
+class LotePeticionesView(APIView):
+    """Ejecuta varias peticiones a la API en un solo viaje (``POST /api/batch/``).
+
+    Recibe una lista de ``{"id", "method", "path", "query", "body"}`` y
+    devuelve ``{"resultados": [{"id", "status", "body"}, ...]}`` en el mismo
+    orden, con la autenticación de quien llama.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        peticiones = request.data
+        if not isinstance(peticiones, list) or not peticiones:
+            return Response({'detail': 'Envíe una lista de subpeticiones'}, status=400)
+        if len(peticiones) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'detail': f'Como máximo {settings.BATCH_MAX_REQUESTS} subpeticiones por lote'},
+                status=400,
+            )
+
+        resultados = lote_peticiones.despachar(request, peticiones, excluir={LotePeticionesView})
+        for peticion, resultado in zip(peticiones, resultados):
+            if isinstance(peticion, dict) and 'id' in peticion:
+                resultado['id'] = peticion['id']
+        return Response({'resultados': resultados})
+
+
 def home(request):
     """Redirige al panel de administración de Django."""
 
@@ -53,14 +83,70 @@ def home(request):
 
 
 
-def health_check(request):
-    """Comprueba la conexión a la base de datos."""
-
-    try:
-        with connections['default'].cursor() as cursor:
-            cursor.execute('SELECT 1')
-            cursor.fetchone()
-    except OperationalError:
-        return JsonResponse({'status': 'error'}, status=503)
+def liveness_check(request):
+    """Confirma que el proceso atiende peticiones, sin tocar dependencias."""
 
     return JsonResponse({'status': 'ok'})
+
+
+def _detalle_de_salud(request):
+    """Latencias, errores y capacidades solo en DEBUG o para staff."""
+
+    return settings.DEBUG or request.user.is_staff
+
+
+def health_check(request):
+    """Contrato original de ``/api/health/``: solo la base de datos.
+
+    Responde 503 únicamente si la base no atiende; migraciones pendientes o
+    dependencias degradadas no lo afectan. Reutiliza el resultado de
+    readiness mientras siga vigente.
+    """
+
+    resultado, _edad = salud.readiness()
+    base = resultado['checks']['database']
+    disponible = base['status'] != salud.ERROR
+    cuerpo = {'status': 'ok' if disponible else 'error'}
+    if _detalle_de_salud(request):
+        cuerpo['database'] = base
+    return JsonResponse(cuerpo, status=200 if disponible else 503)
+
+
+def readiness_check(request):
+    """Readiness: estado de base, migraciones, cachés, almacenamiento y cola.
+
+    Los chequeos se reutilizan durante ``HEALTH_CHECK_TTL_SECONDS``. Responde
+    503 solo si el worker no puede atender (base caída o migraciones
+    pendientes); un estado ``degradado`` mantiene el 200. Sin detalle
+    (``_detalle_de_salud``) cada chequeo informa solo su ``status``.
+    """
+
+    resultado, edad = salud.readiness()
+    codigo = 503 if resultado['status'] == salud.ERROR else 200
+    if not _detalle_de_salud(request):
+        checks = {nombre: {'status': datos['status']} for nombre, datos in resultado['checks'].items()}
+        return JsonResponse({'status': resultado['status'], 'checks': checks}, status=codigo)
+    return JsonResponse({**resultado, 'edad_s': edad}, status=codigo)
+
+
+def metrics_view(request):
+    """Expone los histogramas de rendimiento en formato Prometheus.
+
+    Requiere ``Authorization: Bearer <METRICS_TOKEN>`` o una sesión de staff;
+    el acceso anónimo solo se habilita explícitamente con ``METRICS_PUBLIC``.
+    """
+
+    token = settings.METRICS_TOKEN
+    autorizacion = request.headers.get('Authorization', '')
+    autorizado = (
+        settings.METRICS_PUBLIC
+        or request.user.is_staff
+        or (bool(token) and hmac.compare_digest(autorizacion.encode(), f'Bearer {token}'.encode()))
+    )
+    if not autorizado:
+        return JsonResponse({'error': 'No autorizado'}, status=401)
+
+    return HttpResponse(
+        metrics.exportar_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -23,9 +23,18 @@ do
   sleep 2
 done
 
+if [ -n "${METRICS_DIR}" ]; then
+  echo "Limpiando métricas de procesos anteriores en ${METRICS_DIR}..."
+  mkdir -p "${METRICS_DIR}"
+  rm -f "${METRICS_DIR}"/metricas-*.json
+fi
+
 echo "Aplicando migraciones..."
 python manage.py migrate --noinput
 
+echo "Creando tablas de caché (solo con CACHE_BACKEND=db)..."
+python manage.py createcachetable
+
 echo "Recopilando archivos estáticos..."
 python manage.py collectstatic --noinput --verbosity 0
 
@@ -1,9 +1,13 @@
 from rest_framework import serializers
 
+from backend.catalogos.memoria import CatalogoRelatedField
+from backend.core.expansion import ExpansionSerializerMixin
+
 from .models import Incidente
 
 
-class IncidenteSerializer(serializers.ModelSerializer):
+class IncidenteSerializer(ExpansionSerializerMixin, serializers.ModelSerializer):
+    serializer_related_field = CatalogoRelatedField
     maquina_detalle = serializers.SerializerMethodField()
 
     class Meta:
@@ -24,6 +28,7 @@ class IncidenteSerializer(serializers.ModelSerializer):
             'modified',
         ]
         read_only_fields = ['created', 'modified']
+        expandable_fields = {'maquina': 'backend.catalogos.serializers.MaquinaSerializer'}
 
     def get_maquina_detalle(self, obj):
         if not obj.maquina:
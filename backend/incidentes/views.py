@@ -1,13 +1,38 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+
+from backend.core.columnar import ColumnarMixin
+from backend.core.creacion_masiva import CreacionMasivaMixin
+from backend.core.expansion import ExpansionViewSetMixin
+from backend.core.exportacion import ExportacionMixin
+from backend.core.idempotencia import IdempotenciaMixin
+
 from .models import Incidente
 from .serializers import IncidenteSerializer
 
-class IncidenteViewSet(viewsets.ModelViewSet):
-    queryset = Incidente.objects.all()
+class IncidenteViewSet(ColumnarMixin, ExpansionViewSetMixin, IdempotenciaMixin, CreacionMasivaMixin, ExportacionMixin, viewsets.ModelViewSet):
+    queryset = Incidente.objects.select_related('maquina').all()
     serializer_class = IncidenteSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'incidentes'
     filterset_fields = ['es_parada_no_planificada', 'origen', 'maquina']
     search_fields = ['descripcion', 'acciones_correctivas', 'observaciones']
     ordering_fields = ['fecha_inicio', 'fecha_fin', 'created', 'modified']
     ordering = ['-fecha_inicio']
+    export_filename = 'incidentes'
+    export_date_field = 'fecha_inicio'
+    export_columns = [
+        ('id', 'id'),
+        ('fecha_inicio', 'fecha_inicio'),
+        ('fecha_fin', 'fecha_fin'),
+        ('es_parada_no_planificada', 'es_parada_no_planificada'),
+        ('origen', 'origen'),
+        ('maquina_codigo', 'maquina__codigo'),
+        ('maquina', 'maquina__nombre'),
+        ('descripcion', 'descripcion'),
+        ('requiere_acciones_correctivas', 'requiere_acciones_correctivas'),
+        ('acciones_correctivas', 'acciones_correctivas'),
+        ('observaciones', 'observaciones'),
+        ('created', 'created'),
+        ('modified', 'modified'),
+    ]
@@ -1,11 +1,16 @@
 from rest_framework import serializers
 
+from backend.catalogos.memoria import CatalogoRelatedField
+from backend.core.expansion import ExpansionSerializerMixin
+
 from .models import RegistroMantenimiento
 
 
-class RegistroMantenimientoSerializer(serializers.ModelSerializer):
+class RegistroMantenimientoSerializer(ExpansionSerializerMixin, serializers.ModelSerializer):
     """Serializer para registros de mantenimiento."""
-    
+
+    serializer_related_field = CatalogoRelatedField
+
     class Meta:
         model = RegistroMantenimiento
         fields = [
@@ -26,6 +31,10 @@ class RegistroMantenimientoSerializer(serializers.ModelSerializer):
             "registrado_por",  # No se puede modificar
             "fecha_registro",
         ]
+        expandable_fields = {
+            "maquina": "backend.catalogos.serializers.MaquinaSerializer",
+            "registrado_por": "backend.core.user_serializers.BasicUserSerializer",
+        }
 
     def validate(self, data):
         """Validaciones adicionales."""
@@ -1,11 +1,17 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from backend.core.columnar import ColumnarMixin
+from backend.core.creacion_masiva import CreacionMasivaMixin
+from backend.core.expansion import ExpansionViewSetMixin
+from backend.core.exportacion import ExportacionMixin
+from backend.core.idempotencia import IdempotenciaMixin
+
 from .models import RegistroMantenimiento
 from .serializers import RegistroMantenimientoSerializer
 
 
-class RegistroMantenimientoViewSet(ModelViewSet):
+class RegistroMantenimientoViewSet(ColumnarMixin, ExpansionViewSetMixin, IdempotenciaMixin, CreacionMasivaMixin, ExportacionMixin, ModelViewSet):
     """API para registros de mantenimiento."""
     
     queryset = RegistroMantenimiento.objects.select_related(
@@ -14,6 +20,7 @@ class RegistroMantenimientoViewSet(ModelViewSet):
     ).all()
     serializer_class = RegistroMantenimientoSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "mantenimiento"
     filterset_fields = {
         "maquina": ["exact"],
         "tipo_mantenimiento": ["exact", "in"],
@@ -34,4 +41,23 @@ class RegistroMantenimientoViewSet(ModelViewSet):
         "maquina__nombre",
         "tipo_mantenimiento"
     ]
-    ordering = ["-hora_inicio"]
\ No newline at end of file
+    ordering = ["-hora_inicio"]
+    export_filename = "mantenimiento"
+    export_date_field = "hora_inicio"
+    export_columns = [
+        ("id", "id"),
+        ("maquina_codigo", "maquina__codigo"),
+        ("maquina", "maquina__nombre"),
+        ("tipo_mantenimiento", "tipo_mantenimiento"),
+        ("hora_inicio", "hora_inicio"),
+        ("hora_fin", "hora_fin"),
+        ("descripcion", "descripcion"),
+        ("tiene_anomalias", "tiene_anomalias"),
+        ("descripcion_anomalias", "descripcion_anomalias"),
+        ("observaciones", "observaciones"),
+        ("registrado_por", "registrado_por__username"),
+        ("fecha_registro", "fecha_registro"),
+    ]
+
+    def get_bulk_create_kwargs(self):
+        return {"registrado_por": self.request.user}
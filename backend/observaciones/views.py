@@ -2,18 +2,33 @@ from rest_framework.exceptions import MethodNotAllowed
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from backend.core.creacion_masiva import CreacionMasivaMixin
+from backend.core.exportacion import ExportacionMixin
+from backend.core.idempotencia import IdempotenciaMixin
+
 from .models import ObservacionGeneral
 from .serializers import ObservacionGeneralSerializer
 
 
-class ObservacionGeneralViewSet(ModelViewSet):
+class ObservacionGeneralViewSet(IdempotenciaMixin, CreacionMasivaMixin, ExportacionMixin, ModelViewSet):
     queryset = ObservacionGeneral.objects.all().order_by("-fecha_hora")
     serializer_class = ObservacionGeneralSerializer
     permission_classes = (IsAuthenticated,)
+    export_filename = "observaciones"
+    export_date_field = "fecha_hora"
+    export_columns = [
+        ("id", "id"),
+        ("fecha_hora", "fecha_hora"),
+        ("creado_por", "creado_por__username"),
+        ("texto", "texto"),
+    ]
 
     def perform_create(self, serializer):
         serializer.save(creado_por=self.request.user)
 
+    def get_bulk_create_kwargs(self):
+        return {"creado_por": self.request.user}
+
     def update(self, request, *args, **kwargs):
         raise MethodNotAllowed(request.method)
 
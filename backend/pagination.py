@@ -1,5 +1,6 @@
 # Política de paginación por defecto.
 
+from django.conf import settings
 from rest_framework.pagination import PageNumberPagination
 
 
@@ -9,3 +10,11 @@ class DefaultPageNumberPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
+
+
+class ColumnarPageNumberPagination(DefaultPageNumberPagination):
+    """Páginas más grandes para el formato columnar (grillas y reportes)."""
+
+    @property
+    def max_page_size(self):
+        return settings.COLUMNAR_MAX_PAGE_SIZE
@@ -1,11 +1,17 @@
 from rest_framework import serializers
 
+from backend.catalogos.memoria import CatalogoRelatedField
+from backend.core.expansion import ExpansionSerializerMixin
+
 from .models import RegistroProduccion
 
 
-class RegistroProduccionSerializer(serializers.ModelSerializer):
+class RegistroProduccionSerializer(ExpansionSerializerMixin, serializers.ModelSerializer):
     """Serializer para registros de producción."""
-    
+
+    # Las FKs a catálogos se validan sin consultas (``backend.catalogos.memoria``).
+    serializer_related_field = CatalogoRelatedField
+
     class Meta:
         model = RegistroProduccion
         fields = [
@@ -29,6 +35,13 @@ class RegistroProduccionSerializer(serializers.ModelSerializer):
             "registrado_por",
             "fecha_registro",
         ]
+        expandable_fields = {
+            "producto": "backend.catalogos.serializers.ProductoSerializer",
+            "formula": "backend.catalogos.serializers.FormulaSerializer",
+            "maquina": "backend.catalogos.serializers.MaquinaSerializer",
+            "turno": "backend.catalogos.serializers.TurnoSerializer",
+            "registrado_por": "backend.core.user_serializers.BasicUserSerializer",
+        }
 
     def validate(self, data):
         producto = data.get("producto") or getattr(self.instance, "producto", None)
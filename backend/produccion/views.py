@@ -1,12 +1,21 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
+from backend.core.columnar import ColumnarMixin
+from backend.core.expansion import ExpansionViewSetMixin
+from backend.core.exportacion import ExportacionMixin
+from backend.core.idempotencia import IdempotenciaMixin
+
 from .models import RegistroProduccion
 from .serializers import RegistroProduccionSerializer
 
 
-class RegistroProduccionViewSet(ModelViewSet):
-    """API para registros de producción."""
+class RegistroProduccionViewSet(ColumnarMixin, ExpansionViewSetMixin, IdempotenciaMixin, ExportacionMixin, ModelViewSet):
+    """API para registros de producción.
+
+    ``export/`` entrega una fila por etapa registrada (o una sola fila si el
+    registro no tiene etapas).
+    """
     
     queryset = RegistroProduccion.objects.select_related(
         "producto",
@@ -17,7 +26,37 @@ class RegistroProduccionViewSet(ModelViewSet):
     ).all()
     serializer_class = RegistroProduccionSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scope = "produccion"
     filterset_fields = ["producto", "maquina", "turno", "registrado_por"]
     search_fields = ["producto__nombre", "observaciones"]
     ordering_fields = ["hora_inicio", "hora_fin", "cantidad_producida"]
-    ordering = ["-hora_inicio"]
\ No newline at end of file
+    ordering = ["-hora_inicio"]
+    export_filename = "produccion"
+    export_date_field = "hora_inicio"
+    export_columns = [
+        ("id", "id"),
+        ("estado", "estado"),
+        ("producto_codigo", "producto__codigo"),
+        ("producto", "producto__nombre"),
+        ("formula_codigo", "formula__codigo"),
+        ("formula_version", "formula__version"),
+        ("maquina_codigo", "maquina__codigo"),
+        ("turno", "turno__nombre"),
+        ("hora_inicio", "hora_inicio"),
+        ("hora_fin", "hora_fin"),
+        ("cantidad_producida", "cantidad_producida"),
+        ("unidad_medida", "unidad_medida"),
+        ("registrado_por", "registrado_por__username"),
+        ("observaciones", "observaciones"),
+        ("etapa_orden", "etapas__etapa__orden"),
+        ("etapa_codigo", "etapas__etapa__etapa__codigo"),
+        ("etapa", "etapas__etapa__etapa__nombre"),
+        ("etapa_maquina_codigo", "etapas__maquina__codigo"),
+        ("etapa_hora_inicio", "etapas__hora_inicio"),
+        ("etapa_hora_fin", "etapas__hora_fin"),
+        ("etapa_duracion_real", "etapas__duracion_real"),
+        ("etapa_cantidad", "etapas__cantidad"),
+        ("etapa_unidad", "etapas__unidad"),
+        ("etapa_completada", "etapas__completada"),
+        ("etapa_observaciones", "etapas__observaciones"),
+    ]
\ No newline at end of file
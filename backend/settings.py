@@ -4,6 +4,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,9 +38,13 @@ INSTALLED_APPS = [
     "backend.produccion",
     "backend.mantenimiento",
     "backend.incidentes",
+    "backend.tareas",
 ]
 
 MIDDLEWARE = [
+    "backend.core.middleware.PerformanceMetricsMiddleware",
+    "backend.core.middleware.CompressionMiddleware",
+    "backend.core.middleware.RateLimitHeadersMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -48,6 +53,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "backend.core.middleware.IdempotencyMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -70,6 +76,22 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "backend.wsgi.application"
 
+# Conexiones a Postgres. Por defecto se reutilizan durante DB_CONN_MAX_AGE
+# segundos y se verifican antes de cada petición (DB_CONN_HEALTH_CHECKS).
+# Con DB_POOL=true se usa el pool de psycopg 3 (requiere "psycopg[pool]");
+# su tamaño por proceso sale de los hilos por worker (WEB_THREADS) sin
+# superar la parte de DB_MAX_CONNECTIONS que le toca a cada uno de los
+# WEB_CONCURRENCY workers.
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+WEB_THREADS = int(os.getenv("WEB_THREADS", "1"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+DB_POOL_MAX_SIZE = int(
+    os.getenv("DB_POOL_MAX_SIZE")
+    or max(2, min(WEB_THREADS * 2, DB_MAX_CONNECTIONS // max(WEB_CONCURRENCY, 1)))
+)
+DB_POOL_MIN_SIZE = min(int(os.getenv("DB_POOL_MIN_SIZE", "1")), DB_POOL_MAX_SIZE)
+
 if os.getenv("DB_HOST") and os.getenv("DB_NAME"):
     DATABASES = {
         "default": {
@@ -79,14 +101,28 @@ if os.getenv("DB_HOST") and os.getenv("DB_NAME"):
             "PASSWORD": os.getenv("DB_PASSWORD"),
             "HOST": os.getenv("DB_HOST"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower() == "true",
+            "OPTIONS": {
+                "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+            },
         }
     }
+    if DB_POOL:
+        # El pool administra la vida de las conexiones: Django exige CONN_MAX_AGE=0.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_idle": int(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        }
 else:
-    # SQLite para desarrollo si no hay Postgres
+    # SQLite para desarrollo si no hay Postgres (``SQLITE_PATH`` cambia el archivo)
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH") or BASE_DIR / "db.sqlite3",
         }
     }
 
@@ -121,6 +157,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 CSRF_TRUSTED_ORIGINS = [
     origin.strip()
@@ -130,16 +168,31 @@ CSRF_TRUSTED_ORIGINS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "backend.core.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # orjson para JSON; la API navegable solo en desarrollo.
+    "DEFAULT_RENDERER_CLASSES": ("backend.core.renderers.ORJSONRenderer",)
+    + (("rest_framework.renderers.BrowsableAPIRenderer",) if DEBUG else ()),
+    "DEFAULT_PARSER_CLASSES": (
+        "backend.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "backend.pagination.DefaultPageNumberPagination",
     "PAGE_SIZE": 50,
+    "DEFAULT_THROTTLE_CLASSES": (
+        "backend.core.throttles.EscrituraRateThrottle",
+    ),
     "DEFAULT_THROTTLE_RATES": {
-        "login": "5/min",
-        "register": "3/min",
+        "login": os.getenv("LOGIN_THROTTLE_RATE", "5/min"),
+        "register": os.getenv("REGISTER_THROTTLE_RATE", "3/min"),
+        # Escrituras por usuario en las APIs de planta (``throttle_scope`` de cada ViewSet).
+        "produccion": os.getenv("THROTTLE_RATE_PRODUCCION", "120/min"),
+        "mantenimiento": os.getenv("THROTTLE_RATE_MANTENIMIENTO", "60/min"),
+        "incidentes": os.getenv("THROTTLE_RATE_INCIDENTES", "60/min"),
     },
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.openapi.AutoSchema",
 }
@@ -149,12 +202,20 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
-    "UPDATE_LAST_LOGIN": True,
+    # El login se anota en el buffer de ``backend.core.actividad``.
+    "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "backend.core.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "backend.core.tokens.RoleTokenRefreshSerializer",
 }
 
+# Autenticación sin estado: el usuario y sus grupos salen del access token
+# (sin consultas por petición). Requiere un CACHE_BACKEND compartido para
+# que las revocaciones lleguen a todos los workers (chequeo core.E001).
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "false").lower() == "true"
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "SIPROSA Backend API",
     "DESCRIPTION": "Esquema OpenAPI para el backend minimalista de SIPROSA.",
@@ -167,6 +228,160 @@ ALLOW_USER_SELF_REGISTRATION = (
     or ("true" if DEBUG else "false")
 ).lower() == "true"
 
+# Cola de tareas en segundo plano. TAREAS_COLAS acepta "cola:concurrencia"
+# separados por coma; la concurrencia se respeta entre todos los trabajadores.
+TAREAS_COLAS = {}
+for _definicion in os.getenv("TAREAS_COLAS", "default:4").split(","):
+    _cola, _, _limite = _definicion.strip().partition(":")
+    if _cola:
+        TAREAS_COLAS[_cola] = int(_limite) if _limite else None
+TAREAS_PROCESOS = int(os.getenv("TAREAS_PROCESOS", "1"))
+TAREAS_HILOS = int(os.getenv("TAREAS_HILOS", "4"))
+TAREAS_BLOQUEO_MAXIMO_SEGUNDOS = int(os.getenv("TAREAS_BLOQUEO_MAXIMO_SEGUNDOS", "1800"))
+TAREAS_RETENCION_DIAS = int(os.getenv("TAREAS_RETENCION_DIAS", "30"))
+
+# Filas que cada viaje a la base trae durante las exportaciones en streaming.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Máximo de elementos por petición en los endpoints ``bulk/`` de alta masiva.
+BULK_CREATE_MAX_ITEMS = int(os.getenv("BULK_CREATE_MAX_ITEMS", "500"))
+
+# Idempotency-Key: respuestas guardadas para los reintentos de los POST.
+# Necesita un CACHE_BACKEND compartido para reconocer reintentos entre workers.
+IDEMPOTENCY_METHODS = ("POST",)
+# Los ViewSets con IdempotenciaMixin rechazan las altas sin la cabecera.
+IDEMPOTENCY_REQUIRED = os.getenv("IDEMPOTENCY_REQUIRED", "false").lower() == "true"
+IDEMPOTENCY_CACHE_ALIAS = os.getenv("IDEMPOTENCY_CACHE_ALIAS", "default")
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 60 * 60)))
+# Vida máxima de la reserva si el proceso muere a mitad de la petición.
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+# Espera de un duplicado concurrente antes de responder 409.
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "5"))
+# Cuerpos mayores (adjuntos) se identifican solo por su tamaño.
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(1024 * 1024)))
+
+# /api/batch/: subpeticiones por lote e hilos por proceso para las lecturas
+# en paralelo (solo con DB_POOL; sin pool se ejecutan en orden).
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
+# ?expand=: niveles de relaciones anidadas que admite una petición.
+EXPAND_MAX_DEPTH = int(os.getenv("EXPAND_MAX_DEPTH", "3"))
+
+# ?format=columnar: tamaño máximo de página (el JSON por objeto sigue en PAGE_SIZE).
+COLUMNAR_MAX_PAGE_SIZE = int(os.getenv("COLUMNAR_MAX_PAGE_SIZE", "5000"))
+
+# Compresión de respuestas: tamaño mínimo y calidad de brotli (0-11, si está instalado).
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# ?ids= en los catálogos: ids por petición (responde sin paginar).
+CATALOG_IDS_MAX = int(os.getenv("CATALOG_IDS_MAX", "500"))
+
+# autocomplete/ de catálogos: resultados por defecto y máximos, y cada cuánto
+# se revisa la versión del índice en memoria.
+AUTOCOMPLETE_LIMIT = int(os.getenv("AUTOCOMPLETE_LIMIT", "10"))
+AUTOCOMPLETE_MAX_LIMIT = int(os.getenv("AUTOCOMPLETE_MAX_LIMIT", "50"))
+AUTOCOMPLETE_CHECK_SECONDS = float(os.getenv("AUTOCOMPLETE_CHECK_SECONDS", "1"))
+
+# FKs a catálogos resueltas en memoria: cada cuánto se revisa la versión
+# compartida (0 = en cada uso, una lectura de caché en vez de una consulta).
+# Con CACHE_BACKEND=locmem no se usa la memoria y se consulta la base.
+CATALOG_MEMORY_CHECK_SECONDS = float(os.getenv("CATALOG_MEMORY_CHECK_SECONDS", "0"))
+
+# Readiness (/api/health/ready/): los chequeos se reutilizan durante el TTL.
+HEALTH_CHECK_TTL_SECONDS = float(os.getenv("HEALTH_CHECK_TTL_SECONDS", "10"))
+HEALTH_MIN_FREE_DISK_MB = int(os.getenv("HEALTH_MIN_FREE_DISK_MB", "500"))
+HEALTH_MAX_TASK_BACKLOG = int(os.getenv("HEALTH_MAX_TASK_BACKLOG", "1000"))
+HEALTH_POOL_SATURATION = float(os.getenv("HEALTH_POOL_SATURATION", "0.9"))
+
+# Instrumentación por petición (Server-Timing y /api/metrics). Con varios
+# workers, METRICS_DIR debe apuntar a un directorio compartido y local al host.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# /api/metrics exige METRICS_TOKEN (Bearer) o una sesión de staff; con
+# METRICS_PUBLIC=true cualquiera puede leerlo.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+METRICS_SLOW_REQUEST_MS = int(os.getenv("METRICS_SLOW_REQUEST_MS", "1000"))
+
+# Caché compartida entre workers. CACHE_BACKEND elige el almacenamiento:
+#   redis  -> CACHE_URL (redis://host:6379/0); la expulsión la decide el
+#             servidor (maxmemory-policy), por eso no aplica CACHE_MAX_ENTRIES.
+#   file   -> CACHE_DIR, un subdirectorio por alias.
+#   db     -> una tabla por alias (``manage.py createcachetable``).
+#   locmem -> memoria del proceso; solo para desarrollo y pruebas. Lo que
+#             coordina workers con la caché degrada a la base o se apaga,
+#             y fuera de DEBUG el chequeo core.W001 lo advierte.
+# Cada alias tiene su propio prefijo, TTL (CACHE_TTL_<ALIAS>) y límite de
+# entradas (CACHE_MAX_ENTRIES_<ALIAS>).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem").lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://127.0.0.1:6379/0")
+CACHE_DIR = Path(os.getenv("CACHE_DIR", BASE_DIR / "cache"))
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "siprosa")
+
+_CACHE_ALIAS = {
+    # alias: (TTL en segundos, máximo de entradas)
+    "default": (300, 10_000),
+    "sessions": (60 * 60 * 8, 50_000),
+    "throttle": (60 * 60, 100_000),
+    "catalog": (60 * 15, 20_000),
+    "reports": (60 * 60, 2_000),
+}
+_CACHE_BACKENDS = {
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "db": "django.core.cache.backends.db.DatabaseCache",
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ValueError(f"CACHE_BACKEND inválido: {CACHE_BACKEND!r}")
+
+CACHES = {}
+for _alias, (_ttl, _maximo) in _CACHE_ALIAS.items():
+    _config = {
+        "BACKEND": _CACHE_BACKENDS[CACHE_BACKEND],
+        "TIMEOUT": int(os.getenv(f"CACHE_TTL_{_alias.upper()}", _ttl)),
+        "KEY_PREFIX": f"{CACHE_KEY_PREFIX}:{_alias}",
+    }
+    if CACHE_BACKEND == "redis":
+        _config["LOCATION"] = CACHE_URL
+    else:
+        _config["OPTIONS"] = {
+            "MAX_ENTRIES": int(os.getenv(f"CACHE_MAX_ENTRIES_{_alias.upper()}", _maximo)),
+            "CULL_FREQUENCY": 4,
+        }
+        _config["LOCATION"] = {
+            "file": str(CACHE_DIR / _alias),
+            "db": f"cache_{_alias}",
+            "locmem": f"siprosa-{_alias}",
+        }[CACHE_BACKEND]
+    CACHES[_alias] = _config
+
+# Caché de respuestas de catálogos (list/retrieve) en el alias ``catalog``.
+# Con locmem un worker no vería las invalidaciones de los demás y serviría
+# respuestas viejas: por defecto solo se activa con una caché compartida
+# (chequeo core.E004).
+RESPONSE_CACHE_ENABLED = (
+    os.getenv("RESPONSE_CACHE_ENABLED", "false" if CACHE_BACKEND == "locmem" else "true").lower() == "true"
+)
+
+# Los last_login se acumulan en la caché "sessions" y se vuelcan con un único
+# UPDATE como mucho una vez por intervalo; 0 los escribe en cada login. El
+# buffer necesita una caché compartida: con locmem el valor por defecto es 0.
+# Las anotaciones viven LOGIN_ACTIVITY_RETENTION_SECONDS, que debe superar al
+# intervalo para que el vaciado periódico las alcance (chequeo core.E003).
+LOGIN_ACTIVITY_FLUSH_SECONDS = int(
+    os.getenv("LOGIN_ACTIVITY_FLUSH_SECONDS", "0" if CACHE_BACKEND == "locmem" else "60")
+)
+LOGIN_ACTIVITY_RETENTION_SECONDS = int(
+    os.getenv("LOGIN_ACTIVITY_RETENTION_SECONDS", max(60 * 60, 10 * LOGIN_ACTIVITY_FLUSH_SECONDS))
+)
+
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+
 LOG_FILE_PATH = os.getenv("LOG_FILE_PATH")
 ENABLE_GLOBAL_SEARCH = os.getenv("ENABLE_GLOBAL_SEARCH", "false").lower() == "true"
 
@@ -182,6 +397,11 @@ LOGGING = {
         "handlers": ["console"],
         "level": "INFO",
     },
+    "loggers": {
+        "backend.core.middleware": {
+            "level": os.getenv("METRICS_LOG_LEVEL", "WARNING"),
+        },
+    },
 }
 
 if LOG_FILE_PATH:
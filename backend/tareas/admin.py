@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from .models import Tarea, TareaPeriodica
+
+
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    list_display = ["id", "nombre", "cola", "estado", "intentos", "creada", "finalizada"]
+    list_filter = ["estado", "cola"]
+    search_fields = ["nombre", "error"]
+    readonly_fields = ["creada", "iniciada", "finalizada", "bloqueada_por", "bloqueada_en"]
+
+
+@admin.register(TareaPeriodica)
+class TareaPeriodicaAdmin(admin.ModelAdmin):
+    list_display = ["nombre", "tarea", "cola", "intervalo_segundos", "activa", "proxima_ejecucion"]
+    list_filter = ["activa", "cola"]
+    search_fields = ["nombre", "tarea"]
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class TareasConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "backend.tareas"
+    verbose_name = "Tareas en segundo plano"
+
+    def ready(self):
+        """Registra las tareas declaradas en los módulos ``tareas.py`` de cada app."""
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules("tareas")
@@ -0,0 +1,97 @@
+"""Comando Django que ejecuta los trabajadores de la cola de tareas."""
+
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+def _proceso_trabajador(colas, hilos, intervalo, una_vez=False):
+    import django
+
+    # Con ``spawn`` el hijo importa este módulo antes de configurar Django:
+    # los modelos (vía ``Trabajador``) recién se importan después de ``setup``.
+    django.setup()
+    from backend.tareas.trabajador import Trabajador
+
+    trabajador = Trabajador(colas, hilos=hilos, intervalo=intervalo)
+    signal.signal(signal.SIGTERM, trabajador.detener)
+    signal.signal(signal.SIGINT, trabajador.detener)
+    trabajador.ejecutar(una_vez=una_vez)
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de tareas en segundo plano almacenada en la base de datos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=settings.TAREAS_PROCESOS,
+            help="Cantidad de procesos trabajadores",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=settings.TAREAS_HILOS,
+            help="Hilos de ejecución por proceso",
+        )
+        parser.add_argument(
+            "--queues",
+            default=",".join(settings.TAREAS_COLAS) or "default",
+            help="Colas a atender, separadas por coma (en orden de prioridad)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Segundos de espera cuando no hay tareas disponibles",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Realiza una sola pasada en el proceso actual y termina (útil para cron o pruebas)",
+        )
+
+    def handle(self, *args, **options):
+        from backend.tareas.trabajador import Trabajador
+
+        colas = [cola.strip() for cola in options["queues"].split(",") if cola.strip()]
+        if not colas:
+            raise CommandError("Debe indicar al menos una cola.")
+        procesos = options["processes"]
+        hilos = options["threads"]
+        intervalo = options["poll_interval"]
+
+        if options["once"] or procesos <= 1:
+            trabajador = Trabajador(colas, hilos=hilos, intervalo=intervalo)
+            if not options["once"]:
+                signal.signal(signal.SIGTERM, trabajador.detener)
+                signal.signal(signal.SIGINT, trabajador.detener)
+            trabajador.ejecutar(una_vez=options["once"])
+            return
+
+        # Las conexiones abiertas no deben heredarse entre procesos.
+        connections.close_all()
+        contexto = multiprocessing.get_context("spawn")
+        hijos = [
+            contexto.Process(target=_proceso_trabajador, args=(colas, hilos, intervalo), daemon=False)
+            for _ in range(procesos)
+        ]
+        for hijo in hijos:
+            hijo.start()
+        self.stdout.write(
+            self.style.SUCCESS(f"{procesos} procesos x {hilos} hilos atendiendo: {', '.join(colas)}")
+        )
+
+        def _reenviar(signum, frame):
+            for hijo in hijos:
+                if hijo.is_alive():
+                    hijo.terminate()
+
+        signal.signal(signal.SIGTERM, _reenviar)
+        signal.signal(signal.SIGINT, _reenviar)
+        for hijo in hijos:
+            hijo.join()
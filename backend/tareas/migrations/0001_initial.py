@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TareaPeriodica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(help_text='Identificador de la programación', max_length=100, unique=True)),
+                ('tarea', models.CharField(help_text='Nombre de la tarea registrada a ejecutar', max_length=150)),
+                ('cola', models.CharField(default='default', max_length=50)),
+                ('argumentos', models.JSONField(blank=True, default=dict)),
+                ('intervalo_segundos', models.PositiveIntegerField(help_text='Frecuencia de ejecución en segundos')),
+                ('activa', models.BooleanField(default=True)),
+                ('proxima_ejecucion', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ultima_ejecucion', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tarea periódica',
+                'verbose_name_plural': 'Tareas periódicas',
+                'ordering': ['nombre'],
+                'indexes': [models.Index(fields=['activa', 'proxima_ejecucion'], name='tareas_tare_activa_20b6be_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tarea',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(help_text='Nombre de la tarea registrada', max_length=150)),
+                ('cola', models.CharField(default='default', max_length=50)),
+                ('argumentos', models.JSONField(blank=True, default=dict)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_EJECUCION', 'En ejecución'), ('COMPLETADA', 'Completada'), ('FALLIDA', 'Fallida'), ('CANCELADA', 'Cancelada')], default='PENDIENTE', max_length=20)),
+                ('prioridad', models.SmallIntegerField(default=0, help_text='Mayor valor se ejecuta antes')),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('max_intentos', models.PositiveIntegerField(default=3)),
+                ('ejecutar_despues', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueada_por', models.CharField(blank=True, max_length=100)),
+                ('bloqueada_en', models.DateTimeField(blank=True, null=True)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('iniciada', models.DateTimeField(blank=True, null=True)),
+                ('finalizada', models.DateTimeField(blank=True, null=True)),
+                ('creada_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tareas', to=settings.AUTH_USER_MODEL)),
+                ('periodica', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ejecuciones', to='tareas.tareaperiodica')),
+            ],
+            options={
+                'verbose_name': 'Tarea',
+                'verbose_name_plural': 'Tareas',
+                'ordering': ['-creada'],
+                'indexes': [models.Index(fields=['estado', 'cola', 'ejecutar_despues'], name='tareas_tare_estado_0cf1d3_idx'), models.Index(fields=['estado', 'bloqueada_en'], name='tareas_tare_estado_aa132f_idx'), models.Index(fields=['creada_por', 'estado'], name='tareas_tare_creada__436064_idx')],
+            },
+        ),
+    ]
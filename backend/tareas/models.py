@@ -0,0 +1,95 @@
+"""Modelos de la cola de tareas en segundo plano respaldada por la base de datos."""
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class TareaPeriodica(models.Model):
+    """Programación recurrente que encola una tarea registrada cada cierto intervalo."""
+
+    nombre = models.CharField(max_length=100, unique=True, help_text="Identificador de la programación")
+    tarea = models.CharField(max_length=150, help_text="Nombre de la tarea registrada a ejecutar")
+    cola = models.CharField(max_length=50, default="default")
+    argumentos = models.JSONField(default=dict, blank=True)
+    intervalo_segundos = models.PositiveIntegerField(help_text="Frecuencia de ejecución en segundos")
+    activa = models.BooleanField(default=True)
+    proxima_ejecucion = models.DateTimeField(default=timezone.now)
+    ultima_ejecucion = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tarea periódica"
+        verbose_name_plural = "Tareas periódicas"
+        ordering = ["nombre"]
+        indexes = [
+            models.Index(fields=["activa", "proxima_ejecucion"]),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} (cada {self.intervalo_segundos}s)"
+
+
+class Tarea(models.Model):
+    """Trabajo encolado para ser procesado por ``manage.py run_workers``."""
+
+    PENDIENTE = "PENDIENTE"
+    EN_EJECUCION = "EN_EJECUCION"
+    COMPLETADA = "COMPLETADA"
+    FALLIDA = "FALLIDA"
+    CANCELADA = "CANCELADA"
+
+    ESTADO_CHOICES = [
+        (PENDIENTE, "Pendiente"),
+        (EN_EJECUCION, "En ejecución"),
+        (COMPLETADA, "Completada"),
+        (FALLIDA, "Fallida"),
+        (CANCELADA, "Cancelada"),
+    ]
+    ESTADOS_FINALES = (COMPLETADA, FALLIDA, CANCELADA)
+
+    nombre = models.CharField(max_length=150, help_text="Nombre de la tarea registrada")
+    cola = models.CharField(max_length=50, default="default")
+    argumentos = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default=PENDIENTE)
+    prioridad = models.SmallIntegerField(default=0, help_text="Mayor valor se ejecuta antes")
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=3)
+    ejecutar_despues = models.DateTimeField(default=timezone.now)
+    bloqueada_por = models.CharField(max_length=100, blank=True)
+    bloqueada_en = models.DateTimeField(null=True, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    creada = models.DateTimeField(auto_now_add=True)
+    iniciada = models.DateTimeField(null=True, blank=True)
+    finalizada = models.DateTimeField(null=True, blank=True)
+    creada_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="tareas",
+    )
+    periodica = models.ForeignKey(
+        TareaPeriodica,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="ejecuciones",
+    )
+
+    class Meta:
+        verbose_name = "Tarea"
+        verbose_name_plural = "Tareas"
+        ordering = ["-creada"]
+        indexes = [
+            models.Index(fields=["estado", "cola", "ejecutar_despues"]),
+            models.Index(fields=["estado", "bloqueada_en"]),
+            models.Index(fields=["creada_por", "estado"]),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} #{self.pk} ({self.get_estado_display()})"
+
+    @property
+    def finalizo(self):
+        return self.estado in self.ESTADOS_FINALES
@@ -0,0 +1,71 @@
+"""Registro de funciones ejecutables como tareas en segundo plano."""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set
+
+
+@dataclass(frozen=True)
+class DefinicionTarea:
+    """Metadatos de una función registrada como tarea."""
+
+    nombre: str
+    funcion: Callable
+    cola: str = "default"
+    max_intentos: int = 3
+    backoff_base: int = 10
+    backoff_max: int = 3600
+    cada: Optional[int] = None
+    publica: bool = False
+
+
+_REGISTRO: Dict[str, DefinicionTarea] = {}
+
+
+def tarea(
+    nombre: Optional[str] = None,
+    *,
+    cola: str = "default",
+    max_intentos: int = 3,
+    backoff_base: int = 10,
+    backoff_max: int = 3600,
+    cada: Optional[int] = None,
+    publica: bool = False,
+):
+    """Decorador que registra una función como tarea encolable.
+
+    ``cada`` (segundos) crea además una programación periódica que el
+    trabajador sincroniza al iniciar. ``publica`` permite que cualquier usuario
+    autenticado la encole desde la API; el resto queda reservado a
+    administradores.
+    """
+
+    def decorador(funcion):
+        definicion = DefinicionTarea(
+            nombre=nombre or f"{funcion.__module__}.{funcion.__name__}",
+            funcion=funcion,
+            cola=cola,
+            max_intentos=max_intentos,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+            cada=cada,
+            publica=publica,
+        )
+        _REGISTRO[definicion.nombre] = definicion
+        funcion.nombre_tarea = definicion.nombre
+        return funcion
+
+    return decorador
+
+
+def obtener(nombre: str) -> Optional[DefinicionTarea]:
+    return _REGISTRO.get(nombre)
+
+
+def registradas() -> Dict[str, DefinicionTarea]:
+    return dict(_REGISTRO)
+
+
+def colas() -> Set[str]:
+    """Colas declaradas por las tareas registradas."""
+
+    return {definicion.cola for definicion in _REGISTRO.values()}
@@ -0,0 +1,69 @@
+"""Serializadores de la API de tareas."""
+
+from rest_framework import serializers
+
+from backend.core.permissions import is_admin
+
+from . import registro
+from .models import Tarea
+
+
+class TareaSerializer(serializers.ModelSerializer):
+    """Estado de una tarea encolada."""
+
+    class Meta:
+        model = Tarea
+        fields = [
+            "id",
+            "nombre",
+            "cola",
+            "argumentos",
+            "estado",
+            "prioridad",
+            "intentos",
+            "max_intentos",
+            "ejecutar_despues",
+            "resultado",
+            "error",
+            "creada",
+            "iniciada",
+            "finalizada",
+            "creada_por",
+        ]
+        read_only_fields = fields
+
+
+class EncolarTareaSerializer(serializers.Serializer):
+    """Datos para encolar una tarea registrada."""
+
+    nombre = serializers.CharField()
+    argumentos = serializers.DictField(required=False, default=dict)
+    cola = serializers.CharField(required=False, allow_blank=True)
+    prioridad = serializers.IntegerField(required=False, default=0, min_value=-100, max_value=100)
+    retraso_segundos = serializers.IntegerField(required=False, default=0, min_value=0)
+
+    def _es_admin(self):
+        request = self.context.get("request")
+        return bool(request and is_admin(request.user))
+
+    def validate_nombre(self, value):
+        definicion = registro.obtener(value)
+        if definicion is None:
+            raise serializers.ValidationError("Tarea no registrada")
+        if not definicion.publica and not self._es_admin():
+            raise serializers.ValidationError("Solo administradores pueden encolar esta tarea")
+        return value
+
+    def validate(self, data):
+        # Sin validar la cola, una tarea podría quedar en una cola que ningún
+        # trabajador atiende o colarse en una reservada a otras tareas.
+        cola = data.get("cola")
+        if not cola:
+            return data
+        propia = registro.obtener(data["nombre"]).cola
+        if self._es_admin():
+            if cola not in registro.colas():
+                raise serializers.ValidationError({"cola": "Cola no declarada por ninguna tarea registrada"})
+        elif cola != propia:
+            raise serializers.ValidationError({"cola": f"Esta tarea solo puede encolarse en {propia!r}"})
+        return data
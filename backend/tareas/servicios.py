@@ -0,0 +1,256 @@
+"""Operaciones de la cola de tareas: encolado, reclamo, ejecución y reintentos.
+
+En PostgreSQL el reclamo usa ``SELECT ... FOR UPDATE SKIP LOCKED`` para que
+varios trabajadores compartan la cola sin bloquearse entre sí. En SQLite (sin
+``SKIP LOCKED``) el reclamo se resuelve con un ``UPDATE`` condicional sobre el
+estado, que la base serializa, de modo que cada tarea se entrega una sola vez.
+"""
+
+import logging
+import random
+import traceback
+import uuid
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import registro
+from .models import Tarea, TareaPeriodica
+
+logger = logging.getLogger(__name__)
+
+
+class TareaNoRegistrada(Exception):
+    """Se intentó encolar o ejecutar una tarea que no está en el registro."""
+
+
+def limite_concurrencia(cola):
+    """Máximo de tareas simultáneas de la cola entre todos los trabajadores."""
+
+    return settings.TAREAS_COLAS.get(cola)
+
+
+def encolar(nombre, argumentos=None, *, cola=None, retraso=None, prioridad=0, usuario=None):
+    """Crea una tarea pendiente para la función registrada ``nombre``."""
+
+    definicion = registro.obtener(nombre)
+    if definicion is None:
+        raise TareaNoRegistrada(nombre)
+
+    ejecutar_despues = timezone.now()
+    if retraso:
+        ejecutar_despues += retraso if isinstance(retraso, timedelta) else timedelta(seconds=retraso)
+
+    return Tarea.objects.create(
+        nombre=nombre,
+        cola=cola or definicion.cola,
+        argumentos=argumentos or {},
+        prioridad=prioridad,
+        max_intentos=definicion.max_intentos,
+        ejecutar_despues=ejecutar_despues,
+        creada_por=usuario if getattr(usuario, "is_authenticated", False) else None,
+    )
+
+
+def _bloquear_cola(cola):
+    """Serializa los reclamos de una cola para respetar su límite global."""
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [zlib.crc32(cola.encode())])
+
+
+def reclamar(cola, cantidad, trabajador):
+    """Marca hasta ``cantidad`` tareas vencidas de ``cola`` como en ejecución."""
+
+    if cantidad <= 0:
+        return []
+
+    ahora = timezone.now()
+    token = f"{trabajador}/{uuid.uuid4().hex[:8]}"
+
+    with transaction.atomic():
+        limite = limite_concurrencia(cola)
+        if limite:
+            _bloquear_cola(cola)
+            en_curso = Tarea.objects.filter(cola=cola, estado=Tarea.EN_EJECUCION).count()
+            cantidad = min(cantidad, limite - en_curso)
+            if cantidad <= 0:
+                return []
+
+        candidatas = Tarea.objects.filter(
+            cola=cola,
+            estado=Tarea.PENDIENTE,
+            ejecutar_despues__lte=ahora,
+        ).order_by("-prioridad", "ejecutar_despues", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            candidatas = candidatas.select_for_update(skip_locked=True)
+        ids = list(candidatas.values_list("id", flat=True)[:cantidad])
+        if not ids:
+            return []
+
+        Tarea.objects.filter(id__in=ids, estado=Tarea.PENDIENTE).update(
+            estado=Tarea.EN_EJECUCION,
+            bloqueada_por=token,
+            bloqueada_en=ahora,
+            iniciada=ahora,
+            intentos=F("intentos") + 1,
+        )
+
+    return list(Tarea.objects.filter(bloqueada_por=token, estado=Tarea.EN_EJECUCION))
+
+
+def _backoff(definicion, intentos):
+    espera = min(definicion.backoff_base * (2 ** max(intentos - 1, 0)), definicion.backoff_max)
+    return timedelta(seconds=espera + random.uniform(0, espera * 0.1))
+
+
+def _propia(tarea):
+    """La fila de ``tarea`` mientras siga reclamada por quien la ejecuta.
+
+    Si el bloqueo venció y la tarea se liberó, el resultado tardío del
+    trabajador original no pisa el estado del reintento.
+    """
+
+    return Tarea.objects.filter(pk=tarea.pk, estado=Tarea.EN_EJECUCION, bloqueada_por=tarea.bloqueada_por)
+
+
+def _registrar_resultado(tarea, **campos):
+    if not _propia(tarea).update(**campos):
+        logger.warning("Tarea %s #%s terminó con el bloqueo vencido; se descarta su resultado", tarea.nombre, tarea.pk)
+
+
+def _registrar_fallo(tarea, definicion, error):
+    """Programa el reintento con backoff o marca la tarea FALLIDA si no quedan intentos."""
+
+    if tarea.intentos < tarea.max_intentos:
+        espera = _backoff(definicion, tarea.intentos) if definicion is not None else timedelta(0)
+        _registrar_resultado(
+            tarea,
+            estado=Tarea.PENDIENTE,
+            error=error,
+            ejecutar_despues=timezone.now() + espera,
+            bloqueada_por="",
+            bloqueada_en=None,
+        )
+    else:
+        _registrar_resultado(
+            tarea,
+            estado=Tarea.FALLIDA,
+            error=error,
+            finalizada=timezone.now(),
+            bloqueada_por="",
+        )
+
+
+def ejecutar(tarea):
+    """Ejecuta una tarea reclamada y registra su resultado o programa el reintento."""
+
+    definicion = registro.obtener(tarea.nombre)
+
+    if definicion is None:
+        _registrar_resultado(
+            tarea,
+            estado=Tarea.FALLIDA,
+            error=f"Tarea no registrada: {tarea.nombre}",
+            finalizada=timezone.now(),
+            bloqueada_por="",
+        )
+        return
+
+    try:
+        resultado = definicion.funcion(**(tarea.argumentos or {}))
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Tarea %s #%s falló (intento %s)", tarea.nombre, tarea.pk, tarea.intentos)
+        _registrar_fallo(tarea, definicion, error)
+        return
+
+    _registrar_resultado(
+        tarea,
+        estado=Tarea.COMPLETADA,
+        resultado=resultado,
+        error="",
+        finalizada=timezone.now(),
+        bloqueada_por="",
+    )
+
+
+def liberar_bloqueos_vencidos():
+    """Recupera las tareas cuyo trabajador murió o superó el bloqueo máximo.
+
+    El bloqueo vencido cuenta como un intento fallido (``intentos`` ya se
+    incrementó al reclamar): la tarea se reintenta con backoff o, si agotó
+    sus intentos, queda FALLIDA. Así una tarea que siempre tumba a su
+    trabajador o que dura más que el bloqueo no se reintenta para siempre.
+    Devuelve la cantidad de tareas recuperadas.
+    """
+
+    segundos = settings.TAREAS_BLOQUEO_MAXIMO_SEGUNDOS
+    limite = timezone.now() - timedelta(seconds=segundos)
+    error = f"Bloqueo vencido: el trabajador no terminó la tarea en {segundos} segundos"
+    vencidas = Tarea.objects.filter(estado=Tarea.EN_EJECUCION, bloqueada_en__lt=limite).only(
+        "pk", "nombre", "intentos", "max_intentos", "bloqueada_por"
+    )
+    recuperadas = 0
+    for tarea in vencidas:
+        logger.warning("Tarea %s #%s con bloqueo vencido (intento %s)", tarea.nombre, tarea.pk, tarea.intentos)
+        _registrar_fallo(tarea, registro.obtener(tarea.nombre), error)
+        recuperadas += 1
+    return recuperadas
+
+
+def sincronizar_periodicas():
+    """Crea las programaciones declaradas con ``@tarea(cada=...)`` que aún no existen."""
+
+    for definicion in registro.registradas().values():
+        if not definicion.cada:
+            continue
+        TareaPeriodica.objects.get_or_create(
+            nombre=definicion.nombre,
+            defaults={
+                "tarea": definicion.nombre,
+                "cola": definicion.cola,
+                "intervalo_segundos": definicion.cada,
+            },
+        )
+
+
+def programar_periodicas():
+    """Encola una ejecución por cada programación vencida y calcula la siguiente."""
+
+    ahora = timezone.now()
+    encoladas = 0
+    with transaction.atomic():
+        vencidas = TareaPeriodica.objects.filter(activa=True, proxima_ejecucion__lte=ahora)
+        if connection.features.has_select_for_update_skip_locked:
+            vencidas = vencidas.select_for_update(skip_locked=True)
+        for periodica in vencidas:
+            definicion = registro.obtener(periodica.tarea)
+            if definicion is None:
+                logger.warning("Programación %s apunta a tarea inexistente", periodica.nombre)
+                # Se posterga un intervalo: avisa una vez por período, no en cada pasada.
+                periodica.proxima_ejecucion = ahora + timedelta(seconds=periodica.intervalo_segundos)
+                periodica.save(update_fields=["proxima_ejecucion"])
+                continue
+            # Si la cola quedó detenida no se acumulan ejecuciones atrasadas.
+            pendiente = periodica.ejecuciones.filter(
+                estado__in=(Tarea.PENDIENTE, Tarea.EN_EJECUCION)
+            ).exists()
+            if not pendiente:
+                Tarea.objects.create(
+                    nombre=periodica.tarea,
+                    cola=periodica.cola,
+                    argumentos=periodica.argumentos,
+                    max_intentos=definicion.max_intentos,
+                    periodica=periodica,
+                )
+                encoladas += 1
+            periodica.ultima_ejecucion = ahora
+            periodica.proxima_ejecucion = ahora + timedelta(seconds=periodica.intervalo_segundos)
+            periodica.save(update_fields=["ultima_ejecucion", "proxima_ejecucion"])
+    return encoladas
@@ -0,0 +1,21 @@
+"""Tareas de mantenimiento de la propia cola."""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Tarea
+from .registro import tarea
+
+
+@tarea("tareas.purgar_finalizadas", cada=24 * 60 * 60)
+def purgar_finalizadas():
+    """Elimina tareas finalizadas más antiguas que la retención configurada."""
+
+    limite = timezone.now() - timedelta(days=settings.TAREAS_RETENCION_DIAS)
+    eliminadas, _ = Tarea.objects.filter(
+        estado__in=Tarea.ESTADOS_FINALES,
+        finalizada__lt=limite,
+    ).delete()
+    return {"eliminadas": eliminadas}
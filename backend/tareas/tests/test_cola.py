@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from backend.tareas import servicios
+from backend.tareas.management.commands.run_workers import _proceso_trabajador
+from backend.tareas.models import Tarea, TareaPeriodica
+from backend.tareas.registro import tarea
+
+UserModel = apps.get_model(settings.AUTH_USER_MODEL)
+
+LLAMADAS = []
+
+
+@tarea("pruebas.sumar", publica=True)
+def sumar(a, b):
+    LLAMADAS.append((a, b))
+    return {"total": a + b}
+
+
+@tarea("pruebas.fallar", max_intentos=2, backoff_base=60)
+def fallar():
+    raise RuntimeError("falla controlada")
+
+
+@tarea("pruebas.periodica", cada=300)
+def periodica():
+    return "ok"
+
+
+class ColaTareasTests(TestCase):
+    def setUp(self):
+        LLAMADAS.clear()
+
+    def test_reclamar_y_ejecutar(self):
+        pendiente = servicios.encolar("pruebas.sumar", {"a": 2, "b": 3})
+
+        reclamadas = servicios.reclamar("default", 10, "prueba")
+        self.assertEqual([t.pk for t in reclamadas], [pendiente.pk])
+        self.assertEqual(servicios.reclamar("default", 10, "otro"), [])
+
+        servicios.ejecutar(reclamadas[0])
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.COMPLETADA)
+        self.assertEqual(pendiente.resultado, {"total": 5})
+        self.assertEqual(pendiente.intentos, 1)
+
+    def test_reintento_con_backoff_y_fallo_definitivo(self):
+        pendiente = servicios.encolar("pruebas.fallar")
+
+        servicios.ejecutar(servicios.reclamar("default", 1, "prueba")[0])
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.PENDIENTE)
+        self.assertGreater(pendiente.ejecutar_despues, timezone.now() + timedelta(seconds=50))
+        self.assertIn("falla controlada", pendiente.error)
+
+        Tarea.objects.filter(pk=pendiente.pk).update(ejecutar_despues=timezone.now())
+        servicios.ejecutar(servicios.reclamar("default", 1, "prueba")[0])
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.FALLIDA)
+        self.assertEqual(pendiente.intentos, 2)
+
+    def _vencer_bloqueo(self, tarea):
+        Tarea.objects.filter(pk=tarea.pk).update(bloqueada_en=timezone.now() - timedelta(hours=2))
+
+    @override_settings(TAREAS_BLOQUEO_MAXIMO_SEGUNDOS=60)
+    def test_bloqueo_vencido_cuenta_como_intento(self):
+        pendiente = servicios.encolar("pruebas.fallar")
+
+        self._vencer_bloqueo(servicios.reclamar("default", 1, "prueba")[0])
+        self.assertEqual(servicios.liberar_bloqueos_vencidos(), 1)
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.PENDIENTE)
+        self.assertGreater(pendiente.ejecutar_despues, timezone.now() + timedelta(seconds=50))
+        self.assertIn("Bloqueo vencido", pendiente.error)
+
+        Tarea.objects.filter(pk=pendiente.pk).update(ejecutar_despues=timezone.now())
+        self._vencer_bloqueo(servicios.reclamar("default", 1, "prueba")[0])
+        servicios.liberar_bloqueos_vencidos()
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.FALLIDA)
+        self.assertEqual(pendiente.intentos, 2)
+        self.assertEqual(servicios.reclamar("default", 1, "prueba"), [])
+
+    @override_settings(TAREAS_BLOQUEO_MAXIMO_SEGUNDOS=60)
+    def test_resultado_tardio_no_pisa_el_reintento(self):
+        pendiente = servicios.encolar("pruebas.sumar", {"a": 1, "b": 1})
+        original = servicios.reclamar("default", 1, "lento")[0]
+        self._vencer_bloqueo(original)
+        servicios.liberar_bloqueos_vencidos()
+
+        servicios.ejecutar(original)
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.PENDIENTE)
+        self.assertIsNone(pendiente.resultado)
+
+    @override_settings(TAREAS_COLAS={"default": 1})
+    def test_limite_de_concurrencia_por_cola(self):
+        servicios.encolar("pruebas.sumar", {"a": 1, "b": 1})
+        servicios.encolar("pruebas.sumar", {"a": 1, "b": 2})
+
+        self.assertEqual(len(servicios.reclamar("default", 5, "a")), 1)
+        self.assertEqual(servicios.reclamar("default", 5, "b"), [])
+
+    def test_programaciones_periodicas(self):
+        servicios.sincronizar_periodicas()
+        programacion = TareaPeriodica.objects.get(nombre="pruebas.periodica")
+
+        self.assertGreaterEqual(servicios.programar_periodicas(), 1)
+        # La siguiente ejecución queda a futuro y no se duplica.
+        self.assertEqual(servicios.programar_periodicas(), 0)
+        programacion.refresh_from_db()
+        self.assertGreater(programacion.proxima_ejecucion, timezone.now())
+        self.assertEqual(programacion.ejecuciones.count(), 1)
+
+    def test_programacion_de_tarea_inexistente_se_posterga(self):
+        huerfana = TareaPeriodica.objects.create(nombre="huerfana", tarea="pruebas.retirada", intervalo_segundos=300)
+
+        with self.assertLogs("backend.tareas.servicios", "WARNING") as registros:
+            servicios.programar_periodicas()
+        self.assertEqual(len(registros.output), 1)
+        huerfana.refresh_from_db()
+        self.assertGreater(huerfana.proxima_ejecucion, timezone.now())
+        self.assertIsNone(huerfana.ultima_ejecucion)
+        self.assertFalse(huerfana.ejecuciones.exists())
+
+    def test_comando_run_workers_una_pasada(self):
+        pendiente = servicios.encolar("pruebas.sumar", {"a": 4, "b": 4})
+
+        call_command("run_workers", "--once", "--threads", "1")
+
+        pendiente.refresh_from_db()
+        self.assertEqual(pendiente.estado, Tarea.COMPLETADA)
+        self.assertEqual(LLAMADAS, [(4, 4)])
+
+
+class ProcesoTrabajadorTests(SimpleTestCase):
+    def test_proceso_spawn_arranca(self):
+        # El hijo importa el comando antes de ``django.setup()`` y usa su propia
+        # base: una SQLite temporal migrada para la prueba.
+        with tempfile.TemporaryDirectory() as directorio:
+            entorno = {"SQLITE_PATH": str(Path(directorio) / "db.sqlite3"), "DB_HOST": "", "DB_NAME": ""}
+            with mock.patch.dict(os.environ, entorno):
+                subprocess.run(
+                    [sys.executable, str(Path(settings.BASE_DIR) / "manage.py"), "migrate", "--noinput"],
+                    check=True,
+                    capture_output=True,
+                )
+                hijo = multiprocessing.get_context("spawn").Process(
+                    target=_proceso_trabajador, args=(["default"], 1, 0.1, True)
+                )
+                hijo.start()
+                hijo.join(timeout=60)
+        self.assertEqual(hijo.exitcode, 0)
+
+
+class TareaApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.usuario = UserModel.objects.create_user("operario", password="pass1234")
+        self.otro = UserModel.objects.create_user("otro", password="pass1234")
+        self.client.force_authenticate(self.usuario)
+
+    def test_encolar_y_consultar_estado(self):
+        response = self.client.post(
+            reverse("tarea-list"),
+            {"nombre": "pruebas.sumar", "argumentos": {"a": 1, "b": 2}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        tarea_id = response.json()["id"]
+
+        detalle = self.client.get(reverse("tarea-detail", args=[tarea_id]))
+        self.assertEqual(detalle.status_code, 200)
+        self.assertEqual(detalle.json()["estado"], Tarea.PENDIENTE)
+
+        self.client.force_authenticate(self.otro)
+        ajena = self.client.get(reverse("tarea-detail", args=[tarea_id]))
+        self.assertEqual(ajena.status_code, 404)
+
+    def test_tarea_no_publica_requiere_admin(self):
+        response = self.client.post(
+            reverse("tarea-list"), {"nombre": "pruebas.fallar"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("nombre", response.json())
+
+    def test_cola_validada_contra_el_registro(self):
+        url = reverse("tarea-list")
+        propia = self.client.post(url, {"nombre": "pruebas.sumar", "cola": "default"}, format="json")
+        self.assertEqual(propia.status_code, 202, propia.content)
+        ajena = self.client.post(url, {"nombre": "pruebas.sumar", "cola": "reportes"}, format="json")
+        self.assertEqual(ajena.status_code, 400)
+        self.assertIn("cola", ajena.json())
+
+        self.client.force_authenticate(UserModel.objects.create_superuser("admin", password="pass1234"))
+        inexistente = self.client.post(url, {"nombre": "pruebas.sumar", "cola": "sin-trabajador"}, format="json")
+        self.assertEqual(inexistente.status_code, 400)
+        self.assertIn("cola", inexistente.json())
+
+    def test_cancelar_tarea_pendiente(self):
+        pendiente = servicios.encolar("pruebas.sumar", {"a": 1, "b": 1}, usuario=self.usuario)
+
+        response = self.client.post(reverse("tarea-cancelar", args=[pendiente.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["estado"], Tarea.CANCELADA)
@@ -0,0 +1,80 @@
+"""Bucle de trabajo que consume la cola de tareas con un pool de hilos."""
+
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection
+
+from . import servicios
+
+logger = logging.getLogger(__name__)
+
+
+class Trabajador:
+    """Reclama tareas de las colas indicadas y las ejecuta en ``hilos`` hilos."""
+
+    def __init__(self, colas, hilos=4, intervalo=1.0):
+        self.colas = list(colas)
+        self.hilos = max(1, hilos)
+        self.intervalo = intervalo
+        self.identificador = f"{socket.gethostname()}:{os.getpid()}"
+        self._detener = threading.Event()
+        self._en_curso = 0
+        self._lock = threading.Lock()
+
+    def detener(self, *args):
+        self._detener.set()
+
+    def _ejecutar(self, tarea, en_hilo=True):
+        try:
+            servicios.ejecutar(tarea)
+        except Exception:
+            logger.exception("Error inesperado procesando la tarea #%s", tarea.pk)
+        finally:
+            if en_hilo:
+                # Cada hilo del pool abre su propia conexión; se libera al terminar.
+                connection.close()
+            with self._lock:
+                self._en_curso -= 1
+
+    def ciclo(self, pool=None):
+        """Realiza una pasada de mantenimiento y reclamo. Devuelve las tareas lanzadas.
+
+        Sin ``pool`` las tareas reclamadas se ejecutan en el hilo actual.
+        """
+
+        close_old_connections()
+        servicios.liberar_bloqueos_vencidos()
+        servicios.programar_periodicas()
+
+        lanzadas = 0
+        for cola in self.colas:
+            with self._lock:
+                libres = self.hilos - self._en_curso
+            if libres <= 0:
+                break
+            for tarea in servicios.reclamar(cola, libres, self.identificador):
+                with self._lock:
+                    self._en_curso += 1
+                if pool is None:
+                    self._ejecutar(tarea, en_hilo=False)
+                else:
+                    pool.submit(self._ejecutar, tarea)
+                lanzadas += 1
+        return lanzadas
+
+    def ejecutar(self, una_vez=False):
+        servicios.sincronizar_periodicas()
+        if una_vez:
+            return self.ciclo()
+
+        logger.info("Trabajador %s atendiendo colas %s", self.identificador, ", ".join(self.colas))
+        with ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix="tarea") as pool:
+            while not self._detener.is_set():
+                lanzadas = self.ciclo(pool)
+                if not lanzadas:
+                    self._detener.wait(self.intervalo)
+        logger.info("Trabajador %s detenido", self.identificador)
@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import TareaViewSet
+
+router = DefaultRouter()
+router.register(r"", TareaViewSet, basename="tarea")
+
+urlpatterns = router.urls
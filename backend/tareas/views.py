@@ -0,0 +1,76 @@
+"""API para encolar tareas en segundo plano y consultar su estado."""
+
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from backend.core.permissions import is_admin
+
+from . import servicios
+from .models import Tarea
+from .serializers import EncolarTareaSerializer, TareaSerializer
+
+
+class TareaViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Encola tareas y permite consultar su avance.
+
+    Los administradores ven todas las tareas; el resto solo las propias.
+    """
+
+    queryset = Tarea.objects.all()
+    serializer_class = TareaSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not is_admin(self.request.user):
+            queryset = queryset.filter(creada_por=self.request.user)
+
+        estado = self.request.query_params.get("estado")
+        if estado:
+            queryset = queryset.filter(estado=estado.upper())
+
+        cola = self.request.query_params.get("cola")
+        if cola:
+            queryset = queryset.filter(cola=cola)
+
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return EncolarTareaSerializer
+        return TareaSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        tarea = servicios.encolar(
+            datos["nombre"],
+            datos.get("argumentos"),
+            cola=datos.get("cola") or None,
+            retraso=datos.get("retraso_segundos"),
+            prioridad=datos.get("prioridad", 0),
+            usuario=request.user,
+        )
+        return Response(TareaSerializer(tarea).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"])
+    def cancelar(self, request, pk=None):
+        tarea = self.get_object()
+        actualizadas = Tarea.objects.filter(pk=tarea.pk, estado=Tarea.PENDIENTE).update(
+            estado=Tarea.CANCELADA
+        )
+        if not actualizadas:
+            return Response(
+                {"error": "Solo se pueden cancelar tareas pendientes"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        tarea.refresh_from_db()
+        return Response(TareaSerializer(tarea).data)
@@ -6,14 +6,15 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from backend.core.idempotencia import idempotencia_exenta
 from backend.core.views import health_check, home
 
 urlpatterns = [
     path('', home, name='home'),
     path('admin/', admin.site.urls),
     path('api/', include('backend.core.urls')),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/', idempotencia_exenta(TokenObtainPairView.as_view()), name='token_obtain_pair'),
+    path('api/token/refresh/', idempotencia_exenta(TokenRefreshView.as_view()), name='token_refresh'),
     path('api/health/', health_check, name='api_health'),
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='api-schema'), name='api-docs'),
@@ -37,5 +38,8 @@ if apps.is_installed('backend.mantenimiento'):
 if apps.is_installed('backend.incidentes'):
     urlpatterns.append(path('api/incidentes/', include('backend.incidentes.urls')))
 
+if apps.is_installed('backend.tareas'):
+    urlpatterns.append(path('api/tareas/', include('backend.tareas.urls')))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import migrations
+
+from backend.core.busqueda import borrar_indices, crear_indices
+
+USUARIO = ("username", "first_name", "last_name", "email")
+PERFIL = ("legajo", "dni")
+
+
+def _modelo_usuario(apps):
+    return apps.get_model(settings.AUTH_USER_MODEL)
+
+
+def crear(apps, schema_editor):
+    crear_indices(schema_editor, _modelo_usuario(apps), USUARIO)
+    crear_indices(schema_editor, apps.get_model("usuarios", "UserProfile"), PERFIL)
+
+
+def borrar(apps, schema_editor):
+    borrar_indices(schema_editor, _modelo_usuario(apps), USUARIO)
+    borrar_indices(schema_editor, apps.get_model("usuarios", "UserProfile"), PERFIL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # ``sin_acentos`` y las extensiones se crean en catálogos.
+        ("catalogos", "0005_busqueda_trigramas"),
+        ("usuarios", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear, borrar),
+    ]
@@ -6,6 +6,8 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 
+from backend.catalogos.memoria import CatalogoRelatedField
+
 from .models import UserProfile
 
 
@@ -75,14 +77,16 @@ class UsuarioDetalleSerializer(serializers.ModelSerializer):
     # Campos del perfil para facilitar edición
     legajo = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     dni = serializers.CharField(required=False, allow_blank=True, allow_null=True)
-    funcion_id = serializers.PrimaryKeyRelatedField(
-        queryset=Funcion.objects.filter(activa=True),
+    funcion_id = CatalogoRelatedField(
+        queryset=Funcion.objects.all(),
+        filtros={"activa": True},
         source="funcion",
         required=False,
         allow_null=True,
     )
-    turno_id = serializers.PrimaryKeyRelatedField(
-        queryset=Turno.objects.filter(activo=True),
+    turno_id = CatalogoRelatedField(
+        queryset=Turno.objects.all(),
+        filtros={"activo": True},
         source="turno_habitual",
         required=False,
         allow_null=True,
@@ -282,14 +286,16 @@ class UsuarioPerfilSerializer(serializers.ModelSerializer):
 
     legajo = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     dni = serializers.CharField(required=False, allow_blank=True, allow_null=True)
-    funcion_id = serializers.PrimaryKeyRelatedField(
-        queryset=Funcion.objects.filter(activa=True),
+    funcion_id = CatalogoRelatedField(
+        queryset=Funcion.objects.all(),
+        filtros={"activa": True},
         source="funcion",
         required=False,
         allow_null=True,
     )
-    turno_id = serializers.PrimaryKeyRelatedField(
-        queryset=Turno.objects.filter(activo=True),
+    turno_id = CatalogoRelatedField(
+        queryset=Turno.objects.all(),
+        filtros={"activo": True},
         source="turno_habitual",
         required=False,
         allow_null=True,
@@ -412,14 +418,16 @@ class CrearUsuarioSerializer(serializers.ModelSerializer):
 
     legajo = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     dni = serializers.CharField(required=False, allow_blank=True, allow_null=True)
-    funcion_id = serializers.PrimaryKeyRelatedField(
-        queryset=Funcion.objects.filter(activa=True),
+    funcion_id = CatalogoRelatedField(
+        queryset=Funcion.objects.all(),
+        filtros={"activa": True},
         source="funcion",
         required=False,
         allow_null=True,
     )
-    turno_id = serializers.PrimaryKeyRelatedField(
-        queryset=Turno.objects.filter(activo=True),
+    turno_id = CatalogoRelatedField(
+        queryset=Turno.objects.all(),
+        filtros={"activo": True},
         source="turno_habitual",
         required=False,
         allow_null=True,
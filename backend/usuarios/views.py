@@ -11,6 +11,7 @@ from backend.usuarios.serializers import (
     UsuarioDetalleSerializer,
     UsuarioPerfilSerializer,
 )
+from backend.core.busqueda import BusquedaFilter
 from backend.core.permissions import IsAdmin
 
 
@@ -21,11 +22,17 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     """ViewSet para gestión de usuarios (solo admin/superuser)."""
 
     queryset = (
-        UserModel.objects.all().select_related("user_profile").order_by("username")
+        UserModel.objects.all()
+        .select_related(
+            "user_profile",
+            "user_profile__funcion",
+            "user_profile__turno_habitual",
+        )
+        .order_by("username")
     )
     serializer_class = UsuarioDetalleSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [BusquedaFilter, filters.OrderingFilter]
     search_fields = [
         "username",
         "first_name",
@@ -63,6 +70,12 @@ class UsuarioViewSet(viewsets.ModelViewSet):
             return UsuarioDetalleSerializer
         return UsuarioDetalleSerializer
 
+    @staticmethod
+    def _usuario_actual(request):
+        # ``request.user`` puede venir de los claims del token; para escribir
+        # se usa la fila vigente y no valores que el token trae vencidos.
+        return UserModel.objects.get(pk=request.user.pk)
+
     @action(detail=False, methods=["get"])
     def me(self, request):
         serializer = self.get_serializer(request.user)
@@ -70,7 +83,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["put", "patch"])
     def update_me(self, request):
-        serializer = self.get_serializer(request.user, data=request.data, partial=True)
+        serializer = self.get_serializer(self._usuario_actual(request), data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data)
@@ -80,7 +93,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = request.user
+        user = self._usuario_actual(request)
         password_actual = serializer.validated_data.get("password_actual")
 
         if password_actual and not user.check_password(password_actual):